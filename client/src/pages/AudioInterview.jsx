@@ -189,6 +189,18 @@ export function AudioInterview() {
       setTimeout(() => setIsInterviewerSpeaking(false), 3000);
     });
 
+    socket.on("interview-question-delta", (deltaData) => {
+      // Streamed text of the next question; "interview-question" follows with the final version
+      setCurrentQuestion((prev) => ({
+        ...prev,
+        questionNumber: deltaData.questionNumber,
+        totalQuestions: deltaData.totalQuestions,
+        questionText: deltaData.questionText,
+        category: deltaData.category,
+        questionId: deltaData.questionId,
+      }));
+    });
+
     socket.on("interview-feedback", (feedbackData) => {
       console.log("📊 Feedback:", feedbackData);
       if (feedbackData.insights) {
@@ -350,6 +362,7 @@ export function AudioInterview() {
       socket.off("connected");
       socket.off("live-warning");
       socket.off("interview-question");
+      socket.off("interview-question-delta");
       socket.off("interview-feedback");
       socket.off("interview-session-started");
       socket.off("interview-complete");
@@ -1,392 +1,154 @@
-import os
-import time
 import random
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    from groq import Groq
-    groq_client = Groq() if os.getenv('GROQ_API_KEY') else None
-except ImportError:
-    groq_client = None
+from llm_gateway import llm_gateway
+from interview_plan import parse_plan
+from singleflight import question_singleflight
+from question_bank import get_question_bank
+
+DEFAULT_FALLBACK_QUESTIONS = (
+    "Can you tell me about your experience with programming?",
+    "What challenges have you faced in your development work?",
+    "How do you approach learning new technologies?"
+)
+
+if not llm_gateway.available:
     logger.warning("Groq not available, using fallback questions")
 
 class InterviewQuestionGenerator: 
     def __init__(self):
-        self.fallback_questions = {
-            "Easy": {
-                "javascript": {
-                    "introduction": [
-                        "Tell me about your experience with JavaScript programming.",
-                        "What got you interested in JavaScript development?",
-                        "Can you walk me through a JavaScript project you've worked on?"
-                    ],
-                    "technical": [
-                        "What's the difference between 'let', 'const', and 'var' in JavaScript?",
-                        "How do you handle asynchronous operations in JavaScript?",
-                        "What are JavaScript closures and can you give an example?",
-                        "Explain the concept of hoisting in JavaScript.",
-                        "What's the difference between '==' and '===' in JavaScript?"
-                    ],
-                    "practical": [
-                        "How would you debug a JavaScript error in the browser?",
-                        "What tools do you use for JavaScript development?",
-                        "How do you handle form validation in JavaScript?",
-                        "Explain how you would make an API call in JavaScript."
-                    ]
-                },
-                "python": {
-                    "introduction": [
-                        "Tell me about your Python programming experience.",
-                        "What Python projects have you worked on recently?",
-                        "Why do you prefer Python for certain tasks?"
-                    ],
-                    "technical": [
-                        "What's the difference between a list and a tuple in Python?",
-                        "How do you handle exceptions in Python?",
-                        "What are Python decorators and how do you use them?",
-                        "Explain the concept of list comprehensions.",
-                        "What's the difference between 'is' and '==' in Python?"
-                    ],
-                    "practical": [
-                        "How would you read and process a CSV file in Python?",
-                        "What Python frameworks have you used for web development?",
-                        "How do you debug Python code?",
-                        "Explain how you would connect to a database in Python."
-                    ]
-                },
-                "general": {
-                    "introduction": [
-                        "Tell me about your programming background and experience.",
-                        "What programming languages are you most comfortable with?",
-                        "Can you describe a challenging problem you solved recently?"
-                    ],
-                    "technical": [
-                        "What's the difference between frontend and backend development?",
-                        "How do you approach debugging when something isn't working?",
-                        "What version control systems have you used?",
-                        "Explain what an API is and how it works.",
-                        "What's the difference between HTTP and HTTPS?"
-                    ],
-                    "practical": [
-                        "How do you stay updated with new technologies?",
-                        "What development tools do you use regularly?",
-                        "How do you test your code?",
-                        "Describe your typical development workflow."
-                    ]
-                },
-                "backend": {
-                    "introduction": [
-                        "Tell me about your backend development experience.",
-                        "What backend technologies and frameworks have you worked with?",
-                        "Can you describe a backend system you've built or contributed to?"
-                    ],
-                    "technical": [
-                        "What's the difference between GET and POST HTTP methods?",
-                        "How do you handle database connections in backend applications?",
-                        "What is REST and how do you design RESTful APIs?",
-                        "Explain the concept of middleware in backend frameworks.",
-                        "How do you handle authentication and authorization?"
-                    ],
-                    "practical": [
-                        "How would you structure a simple API endpoint?",
-                        "What tools do you use for API testing and debugging?",
-                        "How do you handle errors and exceptions in backend code?",
-                        "Explain how you would implement logging in a backend service."
-                    ]
-                },
-                "frontend": {
-                    "introduction": [
-                        "Tell me about your frontend development experience.",
-                        "What frontend frameworks and libraries have you used?",
-                        "Can you describe a user interface you've built recently?"
-                    ],
-                    "technical": [
-                        "What's the difference between HTML, CSS, and JavaScript?",
-                        "How do you make web pages responsive for different devices?",
-                        "What are CSS preprocessors and why use them?",
-                        "Explain the DOM and how to manipulate it.",
-                        "What's the difference between client-side and server-side rendering?"
-                    ],
-                },
-                "system_design": {
-                    "introduction": [
-                        "Tell me about your experience with system design.",
-                        "What large-scale systems have you worked on or studied?",
-                        "How do you approach designing scalable applications?"
-                    ],
-                    "technical": [
-                        "What's the difference between horizontal and vertical scaling?",
-                        "How do caching strategies improve system performance?",
-                        "What are the trade-offs between SQL and NoSQL databases?",
-                        "Explain the concept of load balancing.",
-                        "What is eventual consistency in distributed systems?"
-                    ],
-                    "practical": [
-                        "How would you design a simple URL shortener service?",
-                        "What factors do you consider when choosing a database?",
-                        "How would you handle high traffic spikes in a web application?",
-                        "Explain how you would implement basic monitoring for a service."
-                    ]
-                },
-                "dsa": {
-                    "introduction": [
-                        "Tell me about your experience with data structures and algorithms.",
-                        "What got you interested in competitive programming or DSA?",
-                        "Can you walk me through a challenging DSA problem you solved recently?"
-                    ],
-                    "technical": [
-                        "What's the difference between an array and a linked list?",
-                        "Explain how a stack data structure works with an example.",
-                        "What is the time complexity of searching in a binary search tree?",
-                        "How does a hash table handle collisions?",
-                        "What's the difference between BFS and DFS traversal?"
-                    ],
-                    "practical": [
-                        "How would you find the middle element of a linked list?",
-                        "Implement a function to check if a string is a palindrome.",
-                        "How would you detect a cycle in a linked list?",
-                        "Explain how you would reverse an array in-place."
-                    ]
-                }
-            },
-            "Medium": {
-                "javascript": {
-                    "technical": [
-                        "Explain the JavaScript event loop and how it works.",
-                        "What are promises and how do they differ from callbacks?",
-                        "How does prototypal inheritance work in JavaScript?",
-                        "What's the difference between function declarations and expressions?",
-                        "Explain how 'this' binding works in JavaScript."
-                    ],
-                    "problem_solving": [
-                        "How would you implement a debounce function?",
-                        "Design a simple JavaScript module system.",
-                        "How would you optimize a slow-running JavaScript function?",
-                        "Implement a basic pub-sub pattern in JavaScript."
-                    ],
-                    "architectural": [
-                        "How would you structure a large JavaScript application?",
-                        "What design patterns do you use in JavaScript development?",
-                        "How do you handle state management in complex applications?",
-                        "Explain your approach to error handling in JavaScript apps."
-                    ]
-                },
-                "python": {
-                    "technical": [
-                        "Explain the Global Interpreter Lock (GIL) in Python.",
-                        "What are generators and when would you use them?",
-                        "How does Python's garbage collection work?",
-                        "What's the difference between deep and shallow copying?",
-                        "Explain metaclasses in Python."
-                    ],
-                    "problem_solving": [
-                        "How would you implement a caching mechanism in Python?",
-                        "Design a Python class for managing database connections.",
-                        "How would you handle large file processing in Python?",
-                        "Implement a retry mechanism for API calls."
-                    ],
-                    "architectural": [
-                        "How would you design a scalable Python web application?",
-                        "What design patterns do you use in Python development?",
-                        "How do you handle configuration management in Python apps?",
-                        "Explain your approach to testing Python applications."
-                    ]
-                },
-                "dsa": {
-                    "technical": [
-                        "Explain the difference between a min-heap and max-heap.",
-                        "What are the advantages of using a balanced binary search tree?",
-                        "How does quicksort work and what's its average time complexity?",
-                        "Explain the concept of dynamic programming with an example.",
-                        "What's the difference between merge sort and heap sort?"
-                    ],
-                    "problem_solving": [
-                        "How would you find the kth largest element in an array?",
-                        "Implement an algorithm to find the longest common subsequence.",
-                        "How would you detect if two strings are anagrams?",
-                        "Design an algorithm to find all paths in a binary tree."
-                    ],
-                    "architectural": [
-                        "How would you design a data structure for LRU cache?",
-                        "Explain your approach to solving graph traversal problems.",
-                        "How do you optimize recursive algorithms using memoization?",
-                        "Design an efficient algorithm for finding shortest paths."
-                    ]
-                },
-                "backend": {
-                    "technical": [
-                        "Explain the difference between synchronous and asynchronous programming.",
-                        "How do you implement caching strategies in backend applications?",
-                        "What are database transactions and why are they important?",
-                        "How do you handle API rate limiting and throttling?",
-                        "Explain the concept of microservices vs monolithic architecture."
-                    ],
-                    "problem_solving": [
-                        "How would you design a user authentication system?",
-                        "Design an API for a simple e-commerce application.",
-                        "How would you handle file uploads in a backend service?",
-                        "Implement a basic job queue system for background tasks."
-                    ],
-                    "architectural": [
-                        "How would you design a scalable backend API?",
-                        "What patterns do you use for error handling in APIs?",
-                        "How do you ensure data consistency across multiple services?",
-                        "Explain your approach to API versioning and backwards compatibility."
-                    ]
-                },
-                "frontend": {
-                    "technical": [
-                        "Explain the virtual DOM and how it improves performance.",
-                        "How do you manage state in complex frontend applications?",
-                        "What are the differences between various CSS methodologies (BEM, CSS-in-JS)?",
-                        "How do you implement responsive design across different devices?",
-                        "Explain browser rendering pipeline and performance optimization."
-                    ],
-                    "problem_solving": [
-                        "How would you implement infinite scrolling?",
-                        "Design a reusable component library architecture.",
-                        "How would you handle real-time data updates in a frontend app?",
-                        "Implement a client-side routing solution."
-                    ],
-                    "architectural": [
-                        "How would you structure a large-scale frontend application?",
-                        "What strategies do you use for code splitting and lazy loading?",
-                        "How do you handle cross-browser compatibility issues?",
-                        "Explain your approach to frontend testing strategies."
-                    ]
-                },
-                "system_design": {
-                    "technical": [
-                        "Explain the CAP theorem and its implications.",
-                        "How do you design for fault tolerance and high availability?",
-                        "What are the trade-offs between different consistency models?",
-                        "How do you implement distributed caching systems?",
-                        "Explain the concept of database sharding and partitioning."
-                    ],
-                    "problem_solving": [
-                        "Design a chat application for millions of users.",
-                        "How would you build a notification system?",
-                        "Design a content delivery network (CDN).",
-                        "How would you implement a distributed logging system?"
-                    ],
-                    "architectural": [
-                        "How would you design a microservices architecture?",
-                        "What patterns do you use for inter-service communication?",
-                        "How do you handle data synchronization across services?",
-                        "Explain your approach to monitoring and observability."
-                    ]
-                },
-                "general": {
-                    "technical": [
-                        "Explain the principles of object-oriented programming.",
-                        "What are microservices and their advantages?",
-                        "How do you approach database design?",
-                        "What's the difference between SQL and NoSQL databases?",
-                        "Explain the concept of RESTful APIs."
-                    ],
-                    "problem_solving": [
-                        "How would you design a scalable web application?",
-                        "Describe how you would approach performance optimization.",
-                        "How do you handle security in web applications?",
-                        "Design a system for handling user authentication."
-                    ],
-                    "architectural": [
-                        "What architectural patterns have you worked with?",
-                        "How do you approach code organization in large projects?",
-                        "Explain your strategy for handling technical debt.",
-                        "How do you ensure code quality in a team environment?"
-                    ]
-                }
-            },
-            "Hard": {
-                "javascript": {
-                    "advanced_technical": [
-                        "Explain the intricacies of JavaScript's memory management.",
-                        "How would you implement a custom JavaScript framework?",
-                        "Design a JavaScript engine optimization strategy.",
-                        "Explain advanced concepts in functional programming with JavaScript."
-                    ],
-                    "system_design": [
-                        "Design a real-time collaborative editing system using JavaScript.",
-                        "How would you build a JavaScript-based microservice architecture?",
-                        "Design a client-side routing system from scratch.",
-                        "Create a JavaScript-based state management library."
-                    ],
-                },
-                "python": {
-                    "advanced_technical": [
-                        "Explain Python's import system and how to optimize it.",
-                        "How would you implement a custom Python decorator with arguments?",
-                        "Design a Python-based distributed computing system.",
-                        "Explain advanced concepts in Python asyncio."
-                    ],
-                    "system_design": [
-                        "Design a Python-based microservices architecture.",
-                        "How would you build a high-performance Python API?",
-                        "Design a Python-based data processing pipeline.",
-                        "Create a Python framework for machine learning workflows."
-                    ],
-                },
-                "dsa": {
-                    "advanced_technical": [
-                        "Explain advanced tree algorithms like AVL or Red-Black trees.",
-                        "How would you implement a suffix tree for string matching?",
-                        "Design an algorithm for finding strongly connected components.",
-                        "Explain advanced graph algorithms like Dijkstra's or Floyd-Warshall."
-                    ],
-                    "system_design": [
-                        "Design a distributed hash table using consistent hashing.",
-                        "How would you implement a load balancer using data structures?",
-                        "Design an efficient search engine indexing system.",
-                        "Create an algorithm for real-time data stream processing."
-                    ],
-                },
-            }
-        }
+        # Static fallback bank, shared and lazily indexed (data/question_banks.json)
+        self._bank = None
+
+    @property
+    def bank(self):
+        if self._bank is None:
+            self._bank = get_question_bank('interview')
+        return self._bank
 
     def generate_question(self, difficulty: str, subject: str, persona: str, 
                          question_number: int, previous_answers: Optional[List[str]] = None,
-                         performance_metrics: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+                         performance_metrics: Optional[Dict[str, float]] = None,
+                         on_delta: Optional[Callable[[str], None]] = None,
+                         session_id: Optional[str] = None) -> Dict[str, Any]:
         
         original_subject = subject  
-        if groq_client:
+        # An open circuit means the provider is failing or slow: serve the static bank without waiting
+        if llm_gateway.available and not llm_gateway.circuit_open:
             try:
-                dynamic_question = self._generate_groq_question(
-                    difficulty, original_subject, persona, question_number, previous_answers, performance_metrics
-                )
+                if previous_answers or performance_metrics:
+                    dynamic_question = self._generate_groq_question(
+                        difficulty, original_subject, persona, question_number, previous_answers, performance_metrics,
+                        on_delta
+                    )
+                else:
+                    # Context-free prompts are identical across a cohort: share one in-flight call
+                    dynamic_question = question_singleflight.do(
+                        ('question', difficulty, original_subject, question_number),
+                        self._generate_groq_question,
+                        difficulty, original_subject, persona, question_number
+                    )
                 if dynamic_question:
                     return dynamic_question
             except Exception as e:
                 logger.warning(f"Groq generation failed for {original_subject}, using fallback: {e}")
         
         
-        known_subjects = ['dsa', 'backend', 'frontend', 'system_design', 'javascript', 'python']
-        subject_lower = original_subject.lower()
+        return self._get_fallback_question(difficulty, self._fallback_subject(original_subject), question_number,
+                                           previous_answers, performance_metrics, session_id)
+    
+    def fallback_question(self, difficulty: str, subject: str, question_number: int,
+                          session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Static-bank question only (no LLM), e.g. to replace a repeated question without waiting"""
+        return self._get_fallback_question(difficulty, self._fallback_subject(subject), question_number,
+                                           session_id=session_id)
+    
+    def _fallback_subject(self, subject: str) -> str:
+        subject_lower = subject.lower()
         
         if 'data structures' in subject_lower or 'dsa' in subject_lower or 'algorithm' in subject_lower:
-            fallback_subject = 'dsa'
+            return 'dsa'
         elif 'backend' in subject_lower or 'server' in subject_lower or 'api' in subject_lower:
-            fallback_subject = 'backend'
+            return 'backend'
         elif 'frontend' in subject_lower or 'ui' in subject_lower or 'react' in subject_lower:
-            fallback_subject = 'frontend'
+            return 'frontend'
         elif 'system' in subject_lower and 'design' in subject_lower:
-            fallback_subject = 'system_design'
+            return 'system_design'
         elif 'javascript' in subject_lower or 'js' in subject_lower:
-            fallback_subject = 'javascript'
+            return 'javascript'
         elif 'python' in subject_lower:
-            fallback_subject = 'python'
-        else:
-            fallback_subject = 'general'
-        
-        return self._get_fallback_question(difficulty, fallback_subject, question_number, previous_answers, performance_metrics)
+            return 'python'
+        return 'general'
     
+    def _question_phase(self, subject_focus: str, question_number: int):
+        if question_number <= 2:
+            return ("introduction and experience",
+                    f"Ask about their background and experience with {subject_focus}")
+        if question_number <= 5:
+            return ("core technical concepts",
+                    f"Focus on fundamental concepts, technologies, and principles in {subject_focus}")
+        if question_number <= 7:
+            return ("practical application and problem-solving",
+                    f"Ask about real-world scenarios, challenges, and problem-solving in {subject_focus}")
+        return ("advanced topics and architecture",
+                f"Explore advanced concepts, best practices, and system design in {subject_focus}")
+
+    def generate_interview_plan(self, difficulty: str, subject: str, persona: str,
+                                first_question: int = 1, total_questions: int = 10) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Whole phased question plan in a single LLM call; None when the LLM is unavailable"""
+        if not llm_gateway.available or llm_gateway.circuit_open or first_question > total_questions:
+            return None
+        
+        outline = "\n".join(
+            f"{n}. {phase}: {focus}"
+            for n in range(first_question, total_questions + 1)
+            for phase, focus in [self._question_phase(subject, n)]
+        )
+        prompt = f"""Plan a {difficulty} level {subject} interview, questions {first_question} to {total_questions} of {total_questions}.
+
+Phase and focus for each question:
+{outline}
+
+- Make questions specific to {subject} domain
+- Adjust complexity based on {difficulty} level
+- Progress naturally from one question to the next without repeating topics
+Only asks such question which doesnt require code execution or mathematical calculations.Ask  theory related or interview-speicific questions.
+Keep each question concise and professional.
+
+Respond with ONLY a JSON array: [{{"number": <question number>, "question": "<question text>"}}, ...]"""
+
+        try:
+            system_message = f"You are a senior technical expert and interviewer specializing in {subject}. You conduct professional technical interviews with deep knowledge of {subject} concepts, technologies, best practices, and industry standards."
+            
+            # Sessions starting the same module together share one planning call
+            reply = question_singleflight.do(
+                ('plan', difficulty, subject, first_question, total_questions),
+                llm_gateway.chat,
+                [
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt}
+                ],
+                model="llama-3.1-8b-instant",
+                max_tokens=90 * (total_questions - first_question + 1),
+                temperature=0.7,
+                deadline=20
+            )
+        except Exception as e:
+            logger.warning(f"Interview plan generation failed: {e}")
+            return None
+        
+        planned = parse_plan(reply, first_question, total_questions)
+        logger.info(f"🗺️ Planned {len(planned)} questions for {subject} ({difficulty}) in one call")
+        return {n: self._format_question_response(text, difficulty, n) for n, text in planned.items()} or None
+
     def _generate_groq_question(self, difficulty: str, subject: str, persona: str,
                                question_number: int, previous_answers: Optional[List[str]] = None,
-                               performance_metrics: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+                               performance_metrics: Optional[Dict[str, float]] = None,
+                               on_delta: Optional[Callable[[str], None]] = None) -> Optional[Dict[str, Any]]:
         
         context = ""
         if previous_answers:
@@ -405,18 +167,7 @@ class InterviewQuestionGenerator:
         subject_focus = subject  
         logger.info(f"🎯 Generating dynamic question for subject: '{subject_focus}' (Question {question_number})")
         
-        if question_number <= 2:
-            phase = "introduction and experience"
-            focus = f"Ask about their background and experience with {subject_focus}"
-        elif question_number <= 5:
-            phase = "core technical concepts"
-            focus = f"Focus on fundamental concepts, technologies, and principles in {subject_focus}"
-        elif question_number <= 7:
-            phase = "practical application and problem-solving" 
-            focus = f"Ask about real-world scenarios, challenges, and problem-solving in {subject_focus}"
-        else:
-            phase = "advanced topics and architecture"
-            focus = f"Explore advanced concepts, best practices, and system design in {subject_focus}"
+        phase, focus = self._question_phase(subject_focus, question_number)
         
         requirements = f"""Current Phase: {phase}
 - {focus}
@@ -441,29 +192,29 @@ Generate ONLY the question text, nothing else."""
         try:
             system_message = f"You are a senior technical expert and interviewer specializing in {subject_focus}. You conduct professional technical interviews with deep knowledge of {subject_focus} concepts, technologies, best practices, and industry standards."
             
-            response = groq_client.chat.completions.create( # pyright: ignore[reportOptionalMemberAccess]
-                model="llama-3.1-8b-instant",
-                messages=[
+            question_text = llm_gateway.chat(
+                [
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": prompt}
                 ],
+                model="llama-3.1-8b-instant",
                 max_tokens=150,
-                temperature=0.7
+                temperature=0.7,
+                # Streams through the provider when the caller wants fragments as they arrive
+                on_delta=on_delta
             )
-            
-            question_text = response.choices[0].message.content.strip()
             if len(question_text) > 10:
                 return self._format_question_response(question_text, difficulty, question_number)
         
         except Exception as e:
             logger.warning(f"Groq API call failed: {e}")
-            time.sleep(1)
         
         return None
     
     def _get_fallback_question(self, difficulty: str, subject: str, question_number: int,
                               previous_answers: Optional[List[str]] = None,
-                              performance_metrics: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+                              performance_metrics: Optional[Dict[str, float]] = None,
+                              session_id: Optional[str] = None) -> Dict[str, Any]:
         if question_number <= 2:
             category = "introduction"
         elif question_number <= 5:
@@ -472,17 +223,14 @@ Generate ONLY the question text, nothing else."""
             category = "problem_solving" if difficulty != "Easy" else "practical"
         else:
             category = "advanced_technical" if difficulty == "Hard" else "architectural"
-        questions = self.fallback_questions.get(difficulty, {}).get(subject, {}).get(category, [])
+        key = (subject, difficulty, category)
+        if not self.bank.has(*key):
+            key = ("general", difficulty, "technical")
         
-        if not questions:
-            questions = self.fallback_questions.get(difficulty, {}).get("general", {}).get("technical", [
-                "Can you tell me about your experience with programming?",
-                "What challenges have you faced in your development work?",
-                "How do you approach learning new technologies?"
-            ])
-        
-        question_index = (question_number - 1) % len(questions)
-        question_text = questions[question_index]
+        # Same rotation by question number as before, but never repeating within a session
+        question_text = self.bank.pick([key], session_id=session_id, start=question_number - 1)
+        if question_text is None:
+            question_text = DEFAULT_FALLBACK_QUESTIONS[(question_number - 1) % len(DEFAULT_FALLBACK_QUESTIONS)]
         
         if performance_metrics:
             confidence = performance_metrics.get('confidence_score', 30)
@@ -491,9 +239,11 @@ Generate ONLY the question text, nothing else."""
             elif confidence > 85 and question_number > 5:
                 question_text = f"Building on your strong responses: {question_text}"
         
-        return self._format_question_response(question_text, difficulty, question_number)
+        return self._format_question_response(question_text, difficulty, question_number, source='bank')
     
-    def _format_question_response(self, question_text: str, difficulty: str, question_number: int) -> Dict[str, Any]:
+    def _format_question_response(self, question_text: str, difficulty: str, question_number: int,
+                                  source: str = 'llm') -> Dict[str, Any]:
+        """`source` is 'llm' or 'bank' (static fallback), so caches can keep bank questions out"""
         if question_number <= 2:
             category = "introduction"
             base_duration = 60
@@ -516,6 +266,7 @@ Generate ONLY the question text, nothing else."""
             "difficulty_level": difficulty,
             "expected_duration": expected_duration,
             "question_type": "generated",
+            "source": source,
             "follow_up_potential": question_number < 8
         }
 
@@ -674,9 +425,23 @@ class InterviewAISystem:
         logger.info("✅ Simplified AI system initialized (no CrewAI dependency)")
     
     def generate_question(self, difficulty: str, subject: str, persona: str,
-                         question_number: int, previous_answers: Optional[List[str]] = None) -> Dict[str, Any]:
+                         question_number: int, previous_answers: Optional[List[str]] = None,
+                         performance_metrics: Optional[Dict[str, float]] = None,
+                         on_delta: Optional[Callable[[str], None]] = None,
+                         session_id: Optional[str] = None) -> Dict[str, Any]:
         return self.question_generator.generate_question(
-            difficulty, subject, persona, question_number, previous_answers
+            difficulty, subject, persona, question_number, previous_answers, performance_metrics, on_delta,
+            session_id
+        )
+    
+    def fallback_question(self, difficulty: str, subject: str, question_number: int,
+                          session_id: Optional[str] = None) -> Dict[str, Any]:
+        return self.question_generator.fallback_question(difficulty, subject, question_number, session_id)
+    
+    def plan_interview(self, difficulty: str, subject: str, persona: str,
+                       first_question: int = 1, total_questions: int = 10) -> Optional[Dict[int, Dict[str, Any]]]:
+        return self.question_generator.generate_interview_plan(
+            difficulty, subject, persona, first_question, total_questions
         )
     
     def analyze_response(self, transcript: str, duration: float,
@@ -11,6 +11,9 @@ import random
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from keyword_matcher import get_vocabulary_matcher
+from question_bank import get_question_bank
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -20,206 +23,10 @@ class SimpleQuestionGenerator:
     def __init__(self):
         self.groq_api_key = os.getenv('GROQ_API_KEY')
         self.use_ai = bool(self.groq_api_key)
+        self.followup_vocabulary = get_vocabulary_matcher('followup_keywords.json')
         
-        # Comprehensive question banks organized by subject and difficulty
-        self.question_banks = {
-            "frontend": {
-                "Easy": {
-                    "introduction": [
-                        "Tell me about your experience with HTML, CSS, and JavaScript.",
-                        "What got you interested in frontend development?",
-                        "Which frontend frameworks or libraries have you worked with?",
-                        "How do you stay updated with frontend technologies?"
-                    ],
-                    "technical": [
-                        "What's the difference between HTML and HTML5?",
-                        "How do you make a website responsive?",
-                        "Explain the box model in CSS.",
-                        "What are CSS selectors and how do they work?",
-                        "How do you include JavaScript in an HTML page?",
-                        "What's the difference between margin and padding?",
-                        "How do you center a div horizontally and vertically?"
-                    ],
-                    "practical": [
-                        "How would you optimize a website's loading speed?",
-                        "What tools do you use for frontend development?",
-                        "How do you debug CSS issues?",
-                        "Explain semantic HTML and why it's important."
-                    ]
-                },
-                "Medium": {
-                    "technical": [
-                        "Explain event delegation in JavaScript.",
-                        "What's the difference between var, let, and const?",
-                        "How does the CSS flexbox layout work?",
-                        "What are promises in JavaScript and how do you use them?",
-                        "Explain the concept of closures in JavaScript.",
-                        "What's the difference between == and === in JavaScript?",
-                        "How do you handle asynchronous operations in JavaScript?"
-                    ],
-                    "framework": [
-                        "Explain the component lifecycle in React.",
-                        "What's the difference between state and props in React?",
-                        "How do you manage state in a React application?",
-                        "What are React hooks and how do they work?",
-                        "Explain virtual DOM in React."
-                    ],
-                    "problem_solving": [
-                        "How would you implement infinite scrolling?",
-                        "Design a simple autocomplete feature.",
-                        "How would you handle form validation in a large application?",
-                        "Explain how you'd optimize rendering performance."
-                    ]
-                },
-                "Hard": {
-                    "advanced": [
-                        "Explain micro-frontends architecture and its benefits.",
-                        "How would you implement server-side rendering?",
-                        "Design a scalable frontend state management solution.",
-                        "Explain progressive web apps and service workers.",
-                        "How would you handle real-time data updates in a React app?"
-                    ],
-                    "system_design": [
-                        "Design the frontend architecture for a large e-commerce site.",
-                        "How would you implement a real-time collaborative editor?",
-                        "Design a component library for multiple applications.",
-                        "Explain how you'd handle internationalization in a large app."
-                    ]
-                }
-            },
-            "backend": {
-                "Easy": {
-                    "introduction": [
-                        "What interests you about backend development?",
-                        "Which programming languages have you used for backend work?",
-                        "Tell me about a backend project you've worked on.",
-                        "What databases have you worked with?"
-                    ],
-                    "technical": [
-                        "What is an API and how does it work?",
-                        "Explain the difference between GET and POST requests.",
-                        "What is a database and why do we need them?",
-                        "What's the difference between SQL and NoSQL databases?",
-                        "How do servers handle multiple requests?",
-                        "What is REST and what are RESTful APIs?"
-                    ],
-                    "practical": [
-                        "How do you handle errors in API responses?",
-                        "What tools do you use for backend development?",
-                        "How do you test backend APIs?",
-                        "Explain basic authentication methods."
-                    ]
-                },
-                "Medium": {
-                    "technical": [
-                        "Explain database indexing and its importance.",
-                        "What are database transactions and ACID properties?",
-                        "How do you handle authentication and authorization?",
-                        "Explain caching strategies in backend systems.",
-                        "What's the difference between synchronous and asynchronous processing?",
-                        "How do you design a RESTful API?",
-                        "Explain middleware in web frameworks."
-                    ],
-                    "database": [
-                        "How would you optimize a slow database query?",
-                        "Explain database normalization.",
-                        "What are database migrations?",
-                        "How do you handle database connections in production?"
-                    ],
-                    "problem_solving": [
-                        "How would you implement pagination for large datasets?",
-                        "Design an API rate limiting system.",
-                        "How would you handle file uploads in a web application?",
-                        "Explain how you'd implement background job processing."
-                    ]
-                },
-                "Hard": {
-                    "advanced": [
-                        "Design a microservices architecture for a large application.",
-                        "How would you implement distributed transactions?",
-                        "Explain event-driven architecture and its benefits.",
-                        "How would you handle data consistency in a distributed system?",
-                        "Design a scalable notification system."
-                    ],
-                    "system_design": [
-                        "Design the backend for a chat application with millions of users.",
-                        "How would you build a real-time analytics system?",
-                        "Design a content delivery network (CDN).",
-                        "Explain how you'd implement a distributed cache."
-                    ]
-                }
-            },
-            "fullstack": {
-                "Easy": {
-                    "introduction": [
-                        "What does full-stack development mean to you?",
-                        "Which technologies do you prefer for frontend and backend?",
-                        "Tell me about a full-stack project you've built.",
-                        "How do you decide between different technology stacks?"
-                    ],
-                    "technical": [
-                        "How do frontend and backend communicate?",
-                        "What is the difference between client-side and server-side rendering?",
-                        "Explain the role of a database in a web application.",
-                        "What are the main components of a web application?"
-                    ]
-                },
-                "Medium": {
-                    "integration": [
-                        "How do you handle state management across frontend and backend?",
-                        "Explain how you'd implement real-time features in a web app.",
-                        "How do you handle authentication in a full-stack application?",
-                        "What's your approach to API design and integration?"
-                    ],
-                    "deployment": [
-                        "How do you deploy a full-stack application?",
-                        "Explain CI/CD pipelines for web applications.",
-                        "How do you handle environment variables and configurations?",
-                        "What's your approach to monitoring and logging?"
-                    ]
-                },
-                "Hard": {
-                    "architecture": [
-                        "Design the complete architecture for a social media platform.",
-                        "How would you build a scalable e-commerce system?",
-                        "Explain your approach to building a real-time collaborative tool.",
-                        "Design a multi-tenant SaaS application architecture."
-                    ]
-                }
-            },
-            "general": {
-                "Easy": {
-                    "introduction": [
-                        "Tell me about yourself and your programming background.",
-                        "What programming languages are you most comfortable with?",
-                        "What type of projects do you enjoy working on?",
-                        "How do you approach learning new technologies?"
-                    ],
-                    "basic": [
-                        "What is object-oriented programming?",
-                        "Explain the difference between a compiler and an interpreter.",
-                        "What is version control and why is it important?",
-                        "What are the basic principles of good code?"
-                    ]
-                },
-                "Medium": {
-                    "concepts": [
-                        "Explain the difference between stack and heap memory.",
-                        "What are design patterns in software development?",
-                        "How do you handle errors and exceptions in your code?",
-                        "Explain the concept of algorithmic complexity."
-                    ]
-                },
-                "Hard": {
-                    "advanced": [
-                        "Explain different software architecture patterns.",
-                        "How do you design scalable systems?",
-                        "What are your thoughts on code review and best practices?",
-                        "How do you approach system optimization?"
-                    ]
-                }
-            }
-        }
+        # Question bank shared with the other generators (data/question_banks.json), indexed on first use
+        self._bank = None
         
         # Follow-up question templates
         self.follow_up_templates = [
@@ -232,10 +39,17 @@ class SimpleQuestionGenerator:
             "What best practices do you follow for {topic}?"
         ]
     
+    @property
+    def bank(self):
+        if self._bank is None:
+            self._bank = get_question_bank('standard')
+        return self._bank
+    
     def generate_question(self, difficulty: str = "Medium", subject: str = "general", 
                          persona: str = "professional_man", question_number: int = 1,
                          previous_answers: Optional[List[Dict]] = None,
-                         performance_metrics: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+                         performance_metrics: Optional[Dict[str, float]] = None,
+                         session_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate contextual interview question"""
         
         # Map subject if it's an ID
@@ -243,7 +57,7 @@ class SimpleQuestionGenerator:
         
         # For first few questions, use introduction
         if question_number <= 2:
-            return self._generate_introduction_question(difficulty, subject_mapped, question_number)
+            return self._generate_introduction_question(difficulty, subject_mapped, question_number, session_id)
         
         # For later questions, check if we should generate follow-up based on previous answers
         if previous_answers and len(previous_answers) > 0 and self.use_ai and question_number <= 6:
@@ -254,7 +68,7 @@ class SimpleQuestionGenerator:
                 return follow_up
         
         # Generate regular question from bank
-        return self._generate_from_bank(difficulty, subject_mapped, question_number, performance_metrics)
+        return self._generate_from_bank(difficulty, subject_mapped, question_number, performance_metrics, session_id)
     
     def _map_subject(self, subject: str) -> str:
         """Map subject IDs to readable names"""
@@ -273,16 +87,15 @@ class SimpleQuestionGenerator:
         }
         return subject_mapping.get(subject.lower(), "general")
     
-    def _generate_introduction_question(self, difficulty: str, subject: str, question_number: int) -> Dict[str, Any]:
+    def _generate_introduction_question(self, difficulty: str, subject: str, question_number: int,
+                                        session_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate introduction questions"""
         
-        questions = self.question_banks.get(subject, {}).get(difficulty, {}).get("introduction", [])
-        if not questions:
-            questions = self.question_banks.get(subject, {}).get("Easy", {}).get("introduction", [])
-        if not questions:
-            questions = self.question_banks["general"]["Easy"]["introduction"]
+        for key in ((subject, difficulty, "introduction"), (subject, "Easy", "introduction"), ("general", "Easy", "introduction")):
+            if self.bank.has(*key):
+                break
         
-        question_text = random.choice(questions)
+        question_text = self.bank.pick([key], session_id=session_id)
         
         return {
             "question_text": question_text,
@@ -333,29 +146,17 @@ class SimpleQuestionGenerator:
     def _extract_technical_keywords(self, text: str, subject: str) -> List[str]:
         """Extract technical keywords from text"""
         
-        keywords_by_subject = {
-            "frontend": ["React", "JavaScript", "CSS", "HTML", "component", "state", "props", "DOM", "responsive", "framework"],
-            "backend": ["API", "database", "server", "authentication", "REST", "SQL", "NoSQL", "microservices", "caching"],
-            "fullstack": ["frontend", "backend", "API", "database", "deployment", "architecture", "scalability"],
-            "general": ["algorithm", "data structure", "performance", "optimization", "design pattern", "testing"]
-        }
-        
-        subject_keywords = keywords_by_subject.get(subject, keywords_by_subject["general"])
-        
-        found_keywords = []
-        text_lower = text.lower()
-        
-        for keyword in subject_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
+        # Single scan over the precompiled subject vocabulary
+        found_keywords = self.followup_vocabulary.get(subject).find_terms(text).get("default", [])
         
         return found_keywords[:3]  # Return top 3 relevant keywords
     
     def _generate_from_bank(self, difficulty: str, subject: str, question_number: int,
-                           performance_metrics: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+                           performance_metrics: Optional[Dict[str, float]] = None,
+                           session_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate question from static bank with smart selection"""
         
-        subject_bank = self.question_banks.get(subject, self.question_banks["general"])
+        bank_subject = subject if self.bank.has(subject) else "general"
         
         # Adjust difficulty based on performance
         actual_difficulty = difficulty
@@ -377,22 +178,14 @@ class SimpleQuestionGenerator:
             categories = ["advanced", "system_design", "architecture"]
         
         # Find available questions
-        difficulty_bank = subject_bank.get(actual_difficulty, subject_bank.get("Easy", {}))
-        
-        available_questions = []
-        for category in categories:
-            if category in difficulty_bank:
-                available_questions.extend(difficulty_bank[category])
+        bank_difficulty = actual_difficulty if self.bank.has(bank_subject, actual_difficulty) else "Easy"
         
-        if not available_questions:
+        keys = [(bank_subject, bank_difficulty, c) for c in categories if self.bank.has(bank_subject, bank_difficulty, c)]
+        if not keys:
             # Fallback to any available questions
-            for cat_questions in difficulty_bank.values():
-                available_questions.extend(cat_questions)
+            keys = [(bank_subject, bank_difficulty, c) for c in self.bank.categories(bank_subject, bank_difficulty)]
         
-        if not available_questions:
-            available_questions = ["Tell me about your experience with programming."]
-        
-        question_text = random.choice(available_questions)
+        question_text = self.bank.pick(keys, session_id=session_id) or "Tell me about your experience with programming."
         
         # Determine category
         category = "technical"
@@ -570,24 +363,8 @@ class SimpleTechnicalEvaluator:
     """Evaluate technical content without AI agents"""
     
     def __init__(self):
-        # Technical keywords by subject
-        self.technical_keywords = {
-            "frontend": {
-                "basic": ["html", "css", "javascript", "dom", "responsive", "bootstrap"],
-                "intermediate": ["react", "vue", "angular", "component", "state", "props", "hooks"],
-                "advanced": ["webpack", "redux", "ssr", "pwa", "optimization", "accessibility"]
-            },
-            "backend": {
-                "basic": ["api", "rest", "database", "sql", "server", "http"],
-                "intermediate": ["authentication", "authorization", "middleware", "orm", "caching"],
-                "advanced": ["microservices", "scalability", "distributed", "performance", "security"]
-            },
-            "general": {
-                "basic": ["algorithm", "function", "variable", "loop", "condition"],
-                "intermediate": ["class", "object", "inheritance", "polymorphism", "abstraction"],
-                "advanced": ["design pattern", "architecture", "optimization", "complexity"]
-            }
-        }
+        # Technical keywords by subject, compiled once from vocab/technical_keywords.json
+        self.technical_keywords = get_vocabulary_matcher('technical_keywords.json')
     
     def evaluate_answer(self, transcript: str, question_context: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate technical accuracy without AI"""
@@ -598,15 +375,12 @@ class SimpleTechnicalEvaluator:
         subject = question_context.get('subject', 'general')
         difficulty = question_context.get('difficulty', 'Medium')
         
-        # Get relevant keywords
-        subject_keywords = self.technical_keywords.get(subject, self.technical_keywords["general"])
-        
-        # Count technical terms mentioned
-        transcript_lower = transcript.lower()
+        # Count technical terms mentioned (one pass over the transcript for all tiers)
+        tier_counts = self.technical_keywords.get(subject).tier_counts(transcript)
         
-        basic_count = sum(1 for keyword in subject_keywords["basic"] if keyword in transcript_lower)
-        intermediate_count = sum(1 for keyword in subject_keywords["intermediate"] if keyword in transcript_lower)
-        advanced_count = sum(1 for keyword in subject_keywords["advanced"] if keyword in transcript_lower)
+        basic_count = tier_counts.get("basic", 0)
+        intermediate_count = tier_counts.get("intermediate", 0)
+        advanced_count = tier_counts.get("advanced", 0)
         
         # Calculate technical depth score
         total_technical_terms = basic_count + intermediate_count + advanced_count
@@ -0,0 +1,84 @@
+"""
+Serialized analytics payloads for completed sessions
+A completed session's analytics only change when a late transcript update lands, so the
+serialized body is kept (LRU) with its ETag and served without touching the database; clients
+revalidating with If-None-Match get a 304. Each session has a generation counter so a payload
+computed before an invalidation can never be stored after it.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv('IQ_ANALYTICS_CACHE_MAX', '512'))
+ANALYTICS_CACHE_MAX_BYTES = int(os.getenv('IQ_ANALYTICS_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+
+
+def body_etag(body: bytes) -> str:
+    """Strong validator (unquoted) derived from the exact response bytes"""
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+class AnalyticsCache:
+    """LRU of session_id -> (etag, body), bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries: int = ANALYTICS_CACHE_MAX_ENTRIES, max_bytes: int = ANALYTICS_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'stale_puts': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, session_id: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.stats['hits'] += 1
+            return entry
+
+    def generation(self, session_id: str) -> int:
+        """Read before computing a payload and pass to put()"""
+        with self._lock:
+            return self._generations.get(session_id, 0)
+
+    def put(self, session_id: str, body: bytes, generation: int) -> str:
+        """Store a completed session's body; skipped if the session was invalidated since `generation`"""
+        etag = body_etag(body)
+        with self._lock:
+            if self._generations.get(session_id, 0) != generation:
+                self.stats['stale_puts'] += 1
+                return etag
+            previous = self._entries.pop(session_id, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[session_id] = (etag, body)
+            self._bytes += len(body)
+            self.stats['stored'] += 1
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                evicted_id, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._generations.pop(evicted_id, None)
+                self.stats['evictions'] += 1
+        return etag
+
+    def invalidate(self, session_id: str):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= len(entry[1])
+            self._generations[session_id] = self._generations.get(session_id, 0) + 1
+            self.stats['invalidations'] += 1
+            # Generations only matter while a computation may be in flight; keep the map bounded
+            while len(self._generations) > self.max_entries * 4:
+                self._generations.pop(next(iter(self._generations)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes)
@@ -2,16 +2,15 @@ import os
 import json
 import logging
 import asyncio
-from datetime import datetime
 from typing import Dict, List, Optional, Any
 import uuid
 import re
 import tempfile
 import base64
 import binascii
-import whisper
 import threading
 import time
+import atexit
 from collections import Counter
 
 from flask import Flask, request, jsonify
@@ -19,6 +18,26 @@ from flask_socketio import SocketIO, emit # pyright: ignore[reportMissingModuleS
 from flask_cors import CORS
 import sqlite3
 
+from speech_timeline import timeline_from_segments, speech_metric_values, aggregate_speech_metrics
+from question_prefetch import question_prefetcher, question_text_of, QUESTION_STREAMING, NEXT_QUESTION_DEADLINE_SEC, STREAM_QUESTION_DEADLINE_SEC
+from question_cache import QuestionStore, question_key, prewarm_keys_from_env
+from llm_gateway import llm_gateway
+from interview_plan import interview_planner
+from question_bank import forget_session as forget_bank_session, remember_session as remember_bank_session, preload as preload_question_banks
+from question_dedup import question_deduper
+from db_writer import SQLiteWriter, DB_WRITE_WAIT_SEC
+from db_reader import ReadPool
+from db_schema import migrate, tune_connection
+from session_summary import SessionSummary, SessionSummaryStore, answer_entry, SELECT_SUMMARY_SQL, MISSING_SCORE
+from analytics_cache import AnalyticsCache, body_etag
+from session_export import SessionExporter, ExportFilters
+from session_archive import SessionArchiver, fetch_fallthrough, SESSION_ROW_SQL
+from session_state import SessionState, TranscriptRecord, AnswerRecord, WarningTracker
+from session_registry import SessionRegistry
+from singleflight import question_singleflight
+from timer_scheduler import timer_scheduler
+from backends import backend_registry, timed_import, log_startup_report
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,12 +45,33 @@ logger = logging.getLogger(__name__)
 # Feature flags
 # When False, we disable all live coaching (no interim processing, no live warnings)
 LIVE_COACHING = False
+# How long answer-complete waits for the answer's own complete-audio transcript
+ANSWER_WAIT_SEC = float(os.getenv('IQ_ANSWER_WAIT_SEC', '2.0'))
+
+
+DB_PATH = 'interview_iq.db'
 
 
 def get_db_connection(timeout=10.0):
-    conn = sqlite3.connect('interview_iq.db', timeout=timeout, check_same_thread=False)
-    conn.execute('PRAGMA journal_mode=WAL') 
-    return conn
+    conn = sqlite3.connect(DB_PATH, timeout=timeout, check_same_thread=False)
+    return tune_connection(conn)
+
+# All writes go through one writer thread; reads check out a connection from the bounded ReadPool (db_reader)
+db_writer = SQLiteWriter(get_db_connection)
+atexit.register(db_writer.close)
+db_reader = ReadPool(DB_PATH)
+
+
+def _load_session_summary_row(session_id: str):
+    db_writer.flush()
+    with db_reader.timed('session_summary') as conn:
+        return fetch_fallthrough(conn, SELECT_SUMMARY_SQL, (session_id,))[1]
+
+session_summaries = SessionSummaryStore(db_writer, _load_session_summary_row)
+analytics_cache = AnalyticsCache()
+session_exporter = SessionExporter(DB_PATH)
+session_archiver = SessionArchiver(db_writer)
+atexit.register(session_archiver.stop)
 
 try:
     from ai_agents_simple import interview_ai
@@ -49,119 +89,228 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 CORS(app)
 
 
-active_interviews = {}
-pause_monitors = {}
+active_interviews: Dict[str, SessionState] = {}
+
+# Long-pause coaching: silence before warning, and minimum gap between two warnings
+PAUSE_MONITOR_SILENCE_SEC = 8.0
+PAUSE_MONITOR_COOLDOWN_SEC = 5.0
+
 
-def _pause_monitor(client_id: str):
+def _arm_pause_timer(client_id: str, sess: SessionState):
+    """(Re)arm the session's silence deadline: re-armed on speech, fires after a silence long enough to warn about"""
     if not LIVE_COACHING:
         return
-    try:
-        while True:
-            sess = active_interviews.get(client_id)
-            if not sess:
-                break
-            if not sess.get('is_recording'):
-                break
-            tracker = (sess or {}).get('warning_tracker', {})
-            last_speech = tracker.get('last_speech_time') or sess.get('recording_start_time') or time.time()
-            last_warn = tracker.get('last_pause_warning', 0)
-            now = time.time()
-            if (now - last_speech) >= 8 and (now - last_warn) > 5 and (tracker.get('consecutive_empty', 0) >= 3):
-                try:
-                    socketio.emit('live-warning', {'message': 'Long pause detected - keep speaking', 'type': 'long_pause'}, to=client_id)
-                except Exception:
-                    pass
-                tracker['last_pause_warning'] = now
-                tracker['pause_events'] = tracker.get('pause_events', 0) + 1
-                sess['warning_tracker'] = tracker
-                active_interviews[client_id] = sess
-            time.sleep(0.4)
-    except Exception as mon_err:
-        logger.warning(f"Pause monitor ended for {client_id}: {mon_err}")
-
-sessions_by_id: Dict[str, Dict[str, Any]] = {}
+    with sess.lock:
+        tracker = sess.warning_tracker
+        last_speech = tracker.last_speech_time or sess.recording_start_time or time.time()
+        deadline = max(last_speech + PAUSE_MONITOR_SILENCE_SEC, tracker.last_pause_warning + PAUSE_MONITOR_COOLDOWN_SEC)
+    timer_scheduler.arm_at((sess.session_id, 'silence'), deadline, lambda: _pause_deadline(client_id, sess))
+
+
+def _pause_deadline(client_id: str, sess: SessionState):
+    if active_interviews.get(client_id) is not sess or not sess.is_recording:
+        return
+    now = time.time()
+    with sess.lock:
+        tracker = sess.warning_tracker
+        last_speech = tracker.last_speech_time or sess.recording_start_time or now
+        due = (now - last_speech) >= PAUSE_MONITOR_SILENCE_SEC and (now - tracker.last_pause_warning) > PAUSE_MONITOR_COOLDOWN_SEC
+        if due and tracker.consecutive_empty < 3:
+            # Not confirmed by empty interim chunks yet: the next empty one re-arms the timer
+            return
+        if due:
+            tracker.last_pause_warning = now
+            tracker.pause_events += 1
+    if due:
+        try:
+            socketio.emit('live-warning', {'message': 'Long pause detected - keep speaking', 'type': 'long_pause'}, to=client_id)
+        except Exception:
+            pass
+    # Next deadline: the rest of the silence window, or the cooldown after this warning
+    _arm_pause_timer(client_id, sess)
+
+def _release_session(session_id: str, sess: Optional[SessionState]):
+    """Per-session state held outside SessionState, dropped when a session leaves memory"""
+    question_prefetcher.discard_session(session_id)
+    interview_planner.discard_session(session_id)
+    forget_bank_session(session_id)
+    question_deduper.forget(session_id)
+    session_summaries.forget(session_id)
+
+
+sessions_by_id = SessionRegistry(lambda sess: sess.nbytes(), on_evict=_release_session)
 interview_sessions = {}
 
 
-try:
-    logger.info("Loading Whisper model...")
-    whisper_model = whisper.load_model("base")
-    whisper_lock = threading.Lock()
-    logger.info("✅ Whisper model loaded successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to load Whisper model: {str(e)}")
-    whisper_model = None
-    whisper_lock = threading.Lock()
+def _bind_client(client_id: str, sess: SessionState):
+    active_interviews[client_id] = sess
+    sess.client_id = client_id
+    sessions_by_id.attach(sess.session_id, sess)
+
+
+def _session_for(client_id: str, session_id: Optional[str], label: str) -> Optional[SessionState]:
+    """The client's session: already bound, still resident, or rebuilt from the DB; bound to the client"""
+    sess = active_interviews.get(client_id)
+    if sess is not None:
+        return sess
+    if not session_id:
+        return None
+    sess = sessions_by_id.get(session_id)
+    if sess is None:
+        try:
+            sess = _rehydrate_session(session_id, label)
+        except Exception as recon_err:
+            logger.error(f"❌ Failed to reconstruct session {session_id}: {recon_err}")
+            return None
+        if sess is None:
+            return None
+        sessions_by_id.attach(session_id, sess, rehydrated=True)
+        logger.info(f"🧩 Reconstructed session {session_id} from DB (answered={sess.current_question - 1})")
+    _bind_client(client_id, sess)
+    logger.info(f"🔗 Bound session {session_id} to client {client_id}")
+    return sess
+
+
+def _generate_for_key(key):
+    """Context-free question for a cache key (subject, difficulty, phase, question_number)."""
+    subject_name, difficulty, _phase, question_number = key
+    return interview_ai.generate_question(  # pyright: ignore[reportOptionalMemberAccess]
+        difficulty=difficulty,
+        subject=subject_name,
+        persona='professional_man',
+        question_number=question_number,
+        previous_answers=[]
+    )
+
+# No pool filling while the LLM circuit is open: generation would only return bank fallbacks
+question_store = QuestionStore(_generate_for_key, paused=lambda: llm_gateway.circuit_open)
+
+
+def _performance_metrics(sess: SessionState) -> Optional[Dict[str, float]]:
+    """Latest answer analysis, used to decide whether the session still follows its plan."""
+    record = sess.latest_analysis()
+    latest = record.analysis if record else None
+    if not latest or latest.get('confidence_score') is None:
+        return None
+    return {'confidence_score': latest['confidence_score']}
+
+
+def _start_interview_plan(sess: SessionState):
+    """Generate the remaining (non-cached) questions in one call while the candidate answers Q1."""
+    if not (AI_AVAILABLE and interview_ai) or not sess or not sess.session_id:
+        return
+    try:
+        interview_planner.start(
+            sess.session_id,
+            interview_ai.plan_interview,  # pyright: ignore[reportOptionalMemberAccess]
+            difficulty=sess.difficulty or 'Medium',
+            subject=map_subject_id_to_name(sess.module_name or 'general'),
+            persona='professional_man',
+            first_question=question_store.max_question_number + 1,
+            total_questions=int(sess.max_questions or 10)
+        )
+    except Exception as e:
+        logger.warning(f"Could not start interview plan: {e}")
+
+
+def _unique_question(sess: SessionState, question_number: int, text: str) -> str:
+    """Swap a near-duplicate of an earlier question for a pooled or static-bank one (never a new LLM call)."""
+    session_id = sess.session_id
+    alternatives = []
+    if AI_AVAILABLE and interview_ai:
+        subject_name = map_subject_id_to_name(sess.module_name or 'general')
+        difficulty = sess.difficulty or 'Medium'
+        if question_store.cacheable(question_number):
+            alternatives.append(lambda: question_text_of(
+                question_store.get(question_key(subject_name, difficulty, question_number), sess.asked_questions())
+            ))
+        # The bank never hands a session the same question twice, so each attempt is a new candidate
+        alternatives.extend([lambda: question_text_of(interview_ai.fallback_question(  # pyright: ignore[reportOptionalMemberAccess]
+            difficulty, subject_name, question_number, session_id
+        ))] * 3)
+    return question_deduper.choose(session_id, text, alternatives) or text
+
+
+def _schedule_question(sess: SessionState, question_number: int):
+    """Speculatively generate `question_number` from the answers given so far (idempotent per question)."""
+    if not (AI_AVAILABLE and interview_ai) or not sess or not sess.session_id:
+        return
+    if question_number > int(sess.max_questions or 10):
+        return
+    try:
+        subject_name = map_subject_id_to_name(sess.subject)
+        difficulty = sess.difficulty or 'Medium'
+        if question_store.cacheable(question_number):
+            question_prefetcher.schedule(
+                sess.session_id,
+                question_number,
+                question_store.get_or_generate,
+                question_key(subject_name, difficulty, question_number),
+                sess.asked_questions()
+            )
+            return
+        # Served from the session plan unless performance has drifted from it
+        question_prefetcher.schedule(
+            sess.session_id,
+            question_number,
+            interview_planner.next_question,
+            sess.session_id,
+            question_number,
+            _performance_metrics(sess),
+            interview_ai.generate_question,  # pyright: ignore[reportOptionalMemberAccess]
+            difficulty=difficulty,
+            subject=subject_name,
+            persona='professional_man',
+            question_number=question_number,
+            previous_answers=sess.transcripts(),
+            session_id=sess.session_id,
+            streaming=QUESTION_STREAMING
+        )
+    except Exception as e:
+        logger.warning(f"Could not schedule question {question_number}: {e}")
+
+
+# ASR engine; whisper (and torch with it) is only imported when this engine is selected
+ASR_ENGINE = os.getenv('IQ_ASR_ENGINE', 'whisper')
+WHISPER_MODEL_NAME = os.getenv('IQ_WHISPER_MODEL', 'base')
+whisper_lock = threading.Lock()
+
+
+def _load_whisper_model():
+    logger.info(f"Loading Whisper model ({WHISPER_MODEL_NAME})...")
+    whisper = timed_import('whisper')
+    return whisper.load_model(WHISPER_MODEL_NAME)
+
+backend_registry.register('whisper', _load_whisper_model)
+
+
+def get_whisper_model():
+    """Whisper model for the configured ASR engine (waits for the background warm-up if still loading)."""
+    if ASR_ENGINE != 'whisper':
+        return None
+    return backend_registry.get('whisper')
+
+
+if ASR_ENGINE == 'whisper':
+    backend_registry.warm('whisper')
+
+# Columns are guaranteed by the schema migrations, so inserts no longer introspect the table
+INSERT_QUESTION_SQL = '''
+    INSERT INTO interview_questions
+    (id, session_id, question_number, question_text, question_category, difficulty_level, expected_duration)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def _expected_duration(difficulty: Optional[str]) -> int:
+    diff = (difficulty or '').lower()
+    return 90 if diff == 'easy' else 120 if diff == 'medium' else 150
 
 def init_database():
     conn = get_db_connection()
     try:
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interview_sessions (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                difficulty TEXT NOT NULL,
-                llm TEXT NOT NULL,
-                interview_type TEXT NOT NULL,
-                persona TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                module_id TEXT NOT NULL,
-                path_id TEXT NOT NULL,
-                start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                end_time TIMESTAMP,
-                total_questions INTEGER DEFAULT 0,
-                completed_questions INTEGER DEFAULT 0,
-                overall_score REAL,
-                status TEXT DEFAULT 'active'
-            )
-        ''')
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interview_questions (
-                id TEXT PRIMARY KEY,
-                session_id TEXT NOT NULL,
-                question_number INTEGER NOT NULL,
-                question_text TEXT NOT NULL,
-                answer_text TEXT,
-                transcription_result TEXT,
-                analysis_result TEXT,
-                quality_score REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
-            )
-        ''')
-      
-        try:
-            cursor.execute("PRAGMA table_info('interview_questions')")
-            cols = {row[1] for row in cursor.fetchall()} 
-           
-            if 'question_category' not in cols:
-                cursor.execute("ALTER TABLE interview_questions ADD COLUMN question_category TEXT DEFAULT 'general'")
-            if 'difficulty_level' not in cols:
-                cursor.execute("ALTER TABLE interview_questions ADD COLUMN difficulty_level TEXT DEFAULT 'Medium'")
-            if 'expected_duration' not in cols:
-                cursor.execute("ALTER TABLE interview_questions ADD COLUMN expected_duration INTEGER DEFAULT 120")
-        except Exception as alter_err:
-            logger.warning(f"⚠️ Could not ensure interview_questions columns: {alter_err}")
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interview_answers (
-                id TEXT PRIMARY KEY,
-                session_id TEXT NOT NULL,
-                question_id TEXT,
-                audio_transcript TEXT,
-                answer_duration REAL,
-                filler_words_count INTEGER,
-                confidence_score REAL,
-                clarity_score REAL,
-                technical_accuracy REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
-            )
-        ''')
-        
-        conn.commit()
-        logger.info("✅ Database initialized successfully")
+        version = migrate(conn)
+        logger.info(f"✅ Database initialized successfully (schema v{version})")
     finally:
         conn.close()
 
@@ -294,6 +443,12 @@ def analyze_speech(transcript):
     }
 
 init_database()
+session_archiver.start()
+# Built before a forking server starts workers, so they share one copy
+preload_question_banks()
+
+if AI_AVAILABLE:
+    question_store.prewarm(prewarm_keys_from_env(map_subject_id_to_name))
 
 
 @socketio.on('connect')
@@ -308,17 +463,14 @@ def _send_current_question(client_id: str, session_id: str):
         if client_id not in active_interviews:
             return
         sess = active_interviews[client_id]
-        current_q = int(sess.get('current_question') or 1)
-        total = int(sess.get('max_questions') or 10)
-        question_text = None
+        current_q = int(sess.current_question or 1)
+        total = int(sess.max_questions or 10)
+        question_text = sess.question_text(current_q)
         
-        if isinstance(sess.get('questions'), dict) and current_q in sess['questions']:
-            question_text = sess['questions'][current_q]
-        else:
+        if not question_text:
            
             try:
-                conn = get_db_connection()
-                try:
+                with db_reader.timed('current_question') as conn:
                     cursor = conn.cursor()
                     cursor.execute('''
                         SELECT question_text FROM interview_questions
@@ -327,8 +479,6 @@ def _send_current_question(client_id: str, session_id: str):
                     row = cursor.fetchone()
                     if row:
                         question_text = row[0]
-                finally:
-                    conn.close()
             except Exception as db_err:
                 logger.error(f"❌ Failed to fetch current question from DB: {db_err}")
         if question_text:
@@ -336,7 +486,7 @@ def _send_current_question(client_id: str, session_id: str):
                 'questionText': question_text,
                 'questionNumber': current_q,
                 'totalQuestions': total,
-                'category': sess.get('module_name') or sess.get('config', {}).get('subject') or 'General',
+                'category': sess.module_name or sess.config.get('subject') or 'General',
                 'questionId': f"{session_id}_q{current_q}"
             })
     except Exception as e:
@@ -350,7 +500,7 @@ def handle_get_current_question(data):
         if not session_id:
           
             sess = active_interviews.get(client_id)
-            session_id = sess.get('session_id') if sess else None
+            session_id = sess.session_id if sess else None
         if not session_id:
             emit('error', {'message': 'No session to fetch current question'})
             return
@@ -367,11 +517,15 @@ def handle_disconnect():
     
     
     if client_id in active_interviews:
-        session_id = active_interviews[client_id].get('session_id')
+        sess = active_interviews[client_id]
+        session_id = sess.session_id
         if session_id:
-           
-            sessions_by_id[session_id] = active_interviews[client_id]
-            sessions_by_id[session_id]['last_client_id'] = client_id
+            timer_scheduler.cancel((session_id, 'silence'))
+            with sess.lock:
+                sess.last_client_id = client_id
+                # Audio of an answer that can no longer be completed
+                sess.chunk_buffer = None
+            sessions_by_id.detach(session_id, sess)
             logger.info(f"🧹 Detached client {client_id} from session {session_id} (session preserved for resume)")
         del active_interviews[client_id]
 
@@ -385,20 +539,17 @@ def handle_audio_chunk(data):
         
         if not audio_data:
             return
-        if client_id not in active_interviews:
+        sess = active_interviews.get(client_id)
+        if sess is None:
             logger.warning(f"⚠️ Client {client_id} not in active_interviews, skipping chunk")
             return
 
 
-        if 'chunk_buffer' not in active_interviews[client_id]:
-            active_interviews[client_id]['chunk_buffer'] = []
-            active_interviews[client_id]['buffer_start_time'] = time.time()
-            active_interviews[client_id]['warning_tracker'] = {
-                'last_filler_warning': 0,
-                'last_pause_warning': 0,
-                'last_speech_time': time.time(),
-                'filler_count_session': 0
-            }
+        with sess.lock:
+            if sess.chunk_buffer is None:
+                sess.chunk_buffer = []
+                sess.buffer_start_time = time.time()
+                sess.warning_tracker = WarningTracker(sess.buffer_start_time)
 
         try:
             clean_audio_data = audio_data.strip()
@@ -406,17 +557,20 @@ def handle_audio_chunk(data):
                 clean_audio_data = clean_audio_data.split(',')[1]
             
             audio_bytes = base64.b64decode(clean_audio_data)
-            active_interviews[client_id]['chunk_buffer'].append(audio_bytes)
-            
-            current_time = time.time()
-            buffer_duration = current_time - active_interviews[client_id]['buffer_start_time']
-            
-            if buffer_duration >= 3.0:  
-               
-                combined_audio = b''.join(active_interviews[client_id]['chunk_buffer'])
+            combined_audio = None
+            with sess.lock:
+                sess.chunk_buffer.append(audio_bytes)
+                
+                current_time = time.time()
+                buffer_duration = current_time - sess.buffer_start_time
+                
+                if buffer_duration >= 3.0:  
+                   
+                    combined_audio = b''.join(sess.chunk_buffer)
+                    sess.chunk_buffer = []
+                    sess.buffer_start_time = current_time
+            if combined_audio is not None:
                 logger.info(f"🎤 Processed 3s buffer: {len(combined_audio)} bytes (no heuristic warnings)")
-                active_interviews[client_id]['chunk_buffer'] = []
-                active_interviews[client_id]['buffer_start_time'] = current_time
                 
         except Exception as decode_error:
             logger.error(f"❌ Chunk decode failed: {decode_error}")
@@ -447,6 +601,7 @@ def handle_process_interim_audio(data):
 
         transcript = ""
         try:
+            whisper_model = get_whisper_model()
             if whisper_model:
                 with whisper_lock:
                     result = whisper_model.transcribe(
@@ -468,102 +623,98 @@ def handle_process_interim_audio(data):
             except Exception:
                 pass
 
-        sess = active_interviews.get(client_id, {})
-        tracker = sess.get('warning_tracker', {
-            'last_filler_warning': 0,
-            'last_pause_warning': 0,
-            'last_speech_time': time.time(),
-            'last_length_warning': 0,
-            'last_repeat_warning': 0,
-            'filler_count_session': 0,
-            'consecutive_empty': 0,
-            'pause_events': 0
-        })
-        now = time.time()
-        if not transcript:
-            tracker['consecutive_empty'] = tracker.get('consecutive_empty', 0) + 1
-            last_speech = tracker.get('last_speech_time') or now
-           
-            if (now - last_speech) >= 6 and (now - tracker.get('last_pause_warning', 0)) > 5:
-                emit('live-warning', {'message': 'Long pause detected - keep speaking', 'type': 'long_pause'})
-                tracker['last_pause_warning'] = now
-                tracker['pause_events'] = tracker.get('pause_events', 0) + 1
-            sess['warning_tracker'] = tracker
-            active_interviews[client_id] = sess
+        sess = active_interviews.get(client_id)
+        if sess is None:
             return
-        else:
-            tracker['consecutive_empty'] = 0
-
-        lower = transcript.lower()
-        words = lower.split()
-        word_count = len(words)
-        fillers = re.findall(r"\b(um+|uh+|uhm+|umm+|hmm+|er+|ah+|yeah|so|well|like|you know|i mean|actually|basically|literally|sort of|kind of)\b", lower)
-        tracker['filler_count_session'] = tracker.get('filler_count_session', 0) + len(fillers)
-        if word_count >= 1:
-            tracker['last_speech_time'] = now
-       
-        bigrams = list(zip(words, words[1:]))
-        from collections import Counter as _Ctr
-        bc = _Ctr(bigrams)
-        top_bg = max(bc.values()) if bc else 0
-        consec = sum(1 for i in range(1, len(words)) if words[i] == words[i-1])
-        repetition_hits = (sum(1 for c in bc.values() if c >= 2)) + consec
-        tracker['repetition_count_session'] = tracker.get('repetition_count_session', 0) + repetition_hits
-        
-        token_runs = 0
-        run_len = 1
-        for i in range(1, len(words)):
-            if words[i] == words[i-1]:
-                run_len += 1
+        # Decided under the session lock, emitted after releasing it
+        warnings = []
+        now = time.time()
+        with sess.lock:
+            tracker = sess.warning_tracker
+            if not transcript:
+                tracker.consecutive_empty += 1
+                last_speech = tracker.last_speech_time or now
+               
+                if (now - last_speech) >= 6 and (now - tracker.last_pause_warning) > 5:
+                    warnings.append({'message': 'Long pause detected - keep speaking', 'type': 'long_pause'})
+                    tracker.last_pause_warning = now
+                    tracker.pause_events += 1
             else:
+                tracker.consecutive_empty = 0
+
+                lower = transcript.lower()
+                words = lower.split()
+                word_count = len(words)
+                fillers = re.findall(r"\b(um+|uh+|uhm+|umm+|hmm+|er+|ah+|yeah|so|well|like|you know|i mean|actually|basically|literally|sort of|kind of)\b", lower)
+                tracker.filler_count_session += len(fillers)
+                if word_count >= 1:
+                    tracker.last_speech_time = now
+               
+                bigrams = list(zip(words, words[1:]))
+                bc = Counter(bigrams)
+                top_bg = max(bc.values()) if bc else 0
+                consec = sum(1 for i in range(1, len(words)) if words[i] == words[i-1])
+                repetition_hits = (sum(1 for c in bc.values() if c >= 2)) + consec
+                tracker.repetition_count_session += repetition_hits
+                
+                token_runs = 0
+                run_len = 1
+                for i in range(1, len(words)):
+                    if words[i] == words[i-1]:
+                        run_len += 1
+                    else:
+                        if run_len >= 3:
+                            token_runs += (run_len - 2)
+                        run_len = 1
                 if run_len >= 3:
                     token_runs += (run_len - 2)
-                run_len = 1
-        if run_len >= 3:
-            token_runs += (run_len - 2)
-        if token_runs:
-            tracker['filler_count_session'] = tracker.get('filler_count_session', 0) + token_runs
+                if token_runs:
+                    tracker.filler_count_session += token_runs
 
-        
-        filler_density = (len(fillers) / max(word_count, 1)) if word_count else 0
-        if (now - tracker.get('last_filler_warning', 0)) > 3:
-            if (len(fillers) >= 1) or (filler_density >= 0.12) or (consec >= 2):
-                emit('live-warning', {'message': 'Too many filler words detected', 'type': 'filler_words'})
-                tracker['last_filler_warning'] = now
+                
+                filler_density = (len(fillers) / max(word_count, 1)) if word_count else 0
+                if (now - tracker.last_filler_warning) > 3:
+                    if (len(fillers) >= 1) or (filler_density >= 0.12) or (consec >= 2):
+                        warnings.append({'message': 'Too many filler words detected', 'type': 'filler_words'})
+                        tracker.last_filler_warning = now
 
-        
-        if word_count <= 2:
-            
-            last_speech = tracker.get('last_speech_time') or now
-            if (now - tracker.get('last_pause_warning', 0)) > 5 and (now - last_speech) >= 6:
-                emit('live-warning', {'message': 'Long pause detected - keep speaking', 'type': 'long_pause'})
-                tracker['last_pause_warning'] = now
-                tracker['pause_events'] = tracker.get('pause_events', 0) + 1
+                
+                if word_count <= 2:
+                    
+                    last_speech = tracker.last_speech_time or now
+                    if (now - tracker.last_pause_warning) > 5 and (now - last_speech) >= 6:
+                        warnings.append({'message': 'Long pause detected - keep speaking', 'type': 'long_pause'})
+                        tracker.last_pause_warning = now
+                        tracker.pause_events += 1
 
-       
-        if (top_bg >= 3 or consec >= 2) and (now - tracker.get('last_repeat_warning', 0)) > 8:
-            emit('live-warning', {'message': 'You seem to be repeating—try rephrasing', 'type': 'repetition'})
-            tracker['last_repeat_warning'] = now
-
-        start_ts = sess.get('recording_start_time')
-        if start_ts and (now - start_ts) > 40 and (now - tracker.get('last_length_warning', 0)) > 20:
-            emit('live-warning', {'message': 'Answer is getting long, start wrapping up', 'type': 'length'})
-            tracker['last_length_warning'] = now
-
-        # Repetition heuristic: many repeated tokens (cooldown 10s)
-        unique_ratio = len(set(words)) / max(word_count, 1)
-        if word_count >= 10 and unique_ratio < 0.5 and (now - tracker.get('last_repeat_warning', 0)) > 10:
-            emit('live-warning', {'message': 'You seem to be repeating words—try rephrasing', 'type': 'repetition'})
-            tracker['last_repeat_warning'] = now
-
-        sess['warning_tracker'] = tracker
-        active_interviews[client_id] = sess
+               
+                if (top_bg >= 3 or consec >= 2) and (now - tracker.last_repeat_warning) > 8:
+                    warnings.append({'message': 'You seem to be repeating—try rephrasing', 'type': 'repetition'})
+                    tracker.last_repeat_warning = now
+
+                start_ts = sess.recording_start_time
+                if start_ts and (now - start_ts) > 40 and (now - tracker.last_length_warning) > 20:
+                    warnings.append({'message': 'Answer is getting long, start wrapping up', 'type': 'length'})
+                    tracker.last_length_warning = now
+
+                # Repetition heuristic: many repeated tokens (cooldown 10s)
+                unique_ratio = len(set(words)) / max(word_count, 1)
+                if word_count >= 10 and unique_ratio < 0.5 and (now - tracker.last_repeat_warning) > 10:
+                    warnings.append({'message': 'You seem to be repeating words—try rephrasing', 'type': 'repetition'})
+                    tracker.last_repeat_warning = now
+
+        for warning in warnings:
+            emit('live-warning', warning)
+        if sess.is_recording:
+            # Speech pushes the silence deadline back; an empty chunk may confirm a pause already due
+            _arm_pause_timer(client_id, sess)
     except Exception as e:
         logger.error(f"❌ Process interim audio failed: {e}")
 
 @socketio.on('process-complete-audio')
 def handle_complete_audio(data):
     """Process a single complete audio blob sent by the client for the latest answer."""
+    audio_sess = None
     try:
         client_id = request.sid  # pyright: ignore[reportAttributeAccessIssue]
         audio_data = (data or {}).get('audioData')
@@ -573,18 +724,15 @@ def handle_complete_audio(data):
         try:
             session_id_check = provided_session_id
             if not session_id_check and client_id in active_interviews:
-                session_id_check = active_interviews[client_id].get('session_id')
+                session_id_check = active_interviews[client_id].session_id
             if session_id_check:
-                conn = get_db_connection()
-                try:
+                with db_reader.timed('session_status') as conn:
                     cur = conn.cursor()
                     cur.execute("SELECT status FROM interview_sessions WHERE id = ?", (session_id_check,))
                     row = cur.fetchone()
                     if row and str(row[0]).lower() == 'completed':
                         logger.info(f"🛑 Ignoring complete-audio: session {session_id_check} already completed")
                         return
-                finally:
-                    conn.close()
         except Exception as _guard_err:
             logger.warning(f"Guard check failed: {_guard_err}")
 
@@ -593,6 +741,10 @@ def handle_complete_audio(data):
             return
 
         logger.info(f"🎤 Processing complete audio from {client_id}: {len(audio_data)} chars")
+        # Counted until its transcript is stored: answer-complete waits on exactly this
+        audio_sess = active_interviews.get(client_id) or sessions_by_id.get(provided_session_id)
+        if audio_sess is not None:
+            audio_sess.begin_audio()
 
         # Clean base64 payload
         clean_audio_data = audio_data.strip()
@@ -608,7 +760,9 @@ def handle_complete_audio(data):
             temp_file_path = temp_file.name
 
         transcript = ""
+        speech_metrics = {}
         try:
+            whisper_model = get_whisper_model()
             if whisper_model:
                 audio_size = os.path.getsize(temp_file_path)
                 logger.info(f"🎤 Audio file size: {audio_size} bytes")
@@ -635,6 +789,8 @@ def handle_complete_audio(data):
                         transcript = (raw_text or '').strip()
                     
                     logger.info(f"🎤 Transcript length: {len(transcript)} chars")
+                    # Pauses / speaking time from the segment bounds whisper already returned
+                    speech_metrics = timeline_from_segments(result.get('segments')).metrics(len(transcript.split()))
                     print(f"🗣️ TRANSCRIBED TEXT: '{transcript}'")
                     logger.info(f"🗣️ Complete transcript: '{transcript}'")
                     
@@ -667,29 +823,18 @@ def handle_complete_audio(data):
 
         
         try:
-            if client_id in active_interviews:
-                active_interviews[client_id].setdefault('transcripts', []).append(transcript)
-                if insights or analysis:
-                    active_interviews[client_id].setdefault('analyses', []).append({
-                        'transcript': transcript,
-                        'analysis': analysis,
-                        'insights': insights
-                    })
-                logger.info("📝 Stored transcript for active session")
-            elif provided_session_id and provided_session_id in sessions_by_id:
-                sess = sessions_by_id[provided_session_id]
-                sess.setdefault('transcripts', []).append(transcript)
-                if insights or analysis:
-                    sess.setdefault('analyses', []).append({
-                        'transcript': transcript,
-                        'analysis': analysis,
-                        'insights': insights
-                    })
-                logger.info(f"📝 Stored transcript for resumed session {provided_session_id}")
+            record = TranscriptRecord(transcript, speech_metrics, analysis, insights)
+            if audio_sess is not None:
+                audio_sess.add_transcript(record)
+                logger.info(f"📝 Stored transcript for session {audio_sess.session_id}")
             else:
                 logger.warning(f"⚠️ No session found for client {client_id} during transcript storage (sessionId={provided_session_id})")
         except Exception as store_err:
             logger.error(f"❌ Failed to store transcript: {store_err}")
+        finally:
+            if audio_sess is not None:
+                audio_sess.end_audio()
+                audio_sess = None
 
        
         simple_analysis = analyze_speech(transcript)
@@ -701,16 +846,17 @@ def handle_complete_audio(data):
 
        
         try:
-            sess = active_interviews.get(client_id) or (sessions_by_id.get(provided_session_id) if provided_session_id else None)
+            sess = active_interviews.get(client_id) or sessions_by_id.get(provided_session_id)
             if sess:
-                qid = sess.get('last_saved_question_id')
-                if not qid:
-                 
-                    try:
-                        cq = int(sess.get('current_question') or 1)
-                        qid = f"q{max(1, cq-1)}_{sess.get('session_id')}"
-                    except Exception:
-                        qid = None
+                with sess.lock:
+                    qid = sess.last_saved_question_id
+                    if not qid:
+                     
+                        try:
+                            cq = int(sess.current_question or 1)
+                            qid = f"q{max(1, cq-1)}_{sess.session_id}"
+                        except Exception:
+                            qid = None
                 if qid:
                     fillers = int(simple_analysis.get('fillerWords', 0) or 0)
                     
@@ -722,18 +868,33 @@ def handle_complete_audio(data):
                             qnum = int(m.group(1))
                     except Exception:
                         qnum = None
-                    with get_db_connection() as conn:
-                        cur = conn.cursor()
-                        cur.execute(
-                            """
-                            UPDATE interview_answers
-                            SET audio_transcript = ?, filler_words_count = COALESCE(?, filler_words_count)
-                            WHERE session_id = ? AND question_id = ?
-                            """,
-                            (transcript, fillers, sess.get('session_id'), qid)
+                    update_answer = (
+                        """
+                        UPDATE interview_answers
+                        SET audio_transcript = ?, filler_words_count = COALESCE(?, filler_words_count),
+                            speaking_time = COALESCE(?, speaking_time), pause_count = COALESCE(?, pause_count),
+                            pause_duration = COALESCE(?, pause_duration), longest_pause = COALESCE(?, longest_pause)
+                        WHERE session_id = ? AND question_id = ?
+                        """,
+                        (transcript, fillers, *speech_metric_values(speech_metrics), sess.session_id, qid)
+                    )
+
+                    def _amend_entry(previous, _transcript=transcript, _fillers=fillers, _speech=speech_metrics):
+                        # Mirrors the UPDATE: new transcript and filler count, speech metrics only if measured
+                        speech = _speech if (_speech or {}).get('speaking_time') else previous
+                        return answer_entry(
+                            confidence=previous['confidence'], clarity=previous['clarity'], technical=previous['technical'],
+                            words=len((_transcript or '').split()), filler_terms=count_filler_terms(_transcript),
+                            filler_count=_fillers, duration=previous['duration'], speech=speech
                         )
-                        conn.commit()
-                        logger.info(f"📝 Updated answer row with final transcript (qid={qid}, fillers={fillers})")
+
+                    # Queued behind the answer INSERT on the same writer, so it never races it
+                    if qnum is not None:
+                        session_summaries.amend(sess.session_id, qnum, _amend_entry, [update_answer], label='answer.transcript')
+                    else:
+                        db_writer.execute(*update_answer, label='answer.transcript')
+                    analytics_cache.invalidate(sess.session_id)
+                    logger.info(f"📝 Queued final transcript update for answer row (qid={qid}, fillers={fillers})")
                    
                     try:
                         
@@ -750,7 +911,7 @@ def handle_complete_audio(data):
                             insights_list.append(f"Q{qnum}: repetition detected ({repetition})")
                         payload = {
                             'isUpdate': True,
-                            'questionNumber': qnum or max(1, int(sess.get('current_question') or 1) - 1),
+                            'questionNumber': qnum or max(1, int(sess.current_question or 1) - 1),
                             'scores': {
                                 'filler_words_count': fillers,
                                 'repetition_count': repetition,
@@ -772,6 +933,10 @@ def handle_complete_audio(data):
     except Exception as e:
         logger.error(f"Error in complete audio processing: {str(e)}")
         emit('audio-error', {'message': f'Server error: {str(e)}'})
+    finally:
+        # Failed before storing anything: don't leave answer-complete waiting on it
+        if audio_sess is not None:
+            audio_sess.end_audio()
 
 @socketio.on('start-interview')
 def handle_start_interview(data):
@@ -785,16 +950,7 @@ def handle_start_interview(data):
         
         session_id = str(uuid.uuid4())
         
-        active_interviews[client_id] = {
-            'session_id': session_id,
-            'module_name': module_name,
-            'difficulty': difficulty,
-            'start_time': datetime.utcnow(),
-            'current_question': 0,
-            'questions': [],
-            'answers': [],
-            'is_recording': False
-        }
+        active_interviews[client_id] = SessionState(session_id, module_name, difficulty, current_question=0, questions=[])
         
         emit('interview-started', {
             'sessionId': session_id,
@@ -818,12 +974,15 @@ def handle_next_question(data):
             return
         
         interview_data = active_interviews[client_id]
-        current_q = interview_data['current_question']
-        questions = interview_data['questions']
-        next_q = current_q + 1
-        
-        if next_q < len(questions):
-            interview_data['current_question'] = next_q
+        with interview_data.lock:
+            current_q = interview_data.current_question
+            questions = interview_data.questions
+            next_q = current_q + 1
+            advance = next_q < len(questions)
+            if advance:
+                interview_data.current_question = next_q
+        
+        if advance:
             emit('next-question', {
                 'questionText': questions[next_q],
                 'questionNumber': next_q + 1,
@@ -832,7 +991,7 @@ def handle_next_question(data):
         else:
             emit('interview-complete', {
                 'message': 'Interview completed successfully!',
-                'sessionId': interview_data['session_id']
+                'sessionId': interview_data.session_id
             })
             
     except Exception as e:
@@ -844,37 +1003,14 @@ def handle_recording_start(data):
     try:
         client_id = request.sid  # pyright: ignore[reportAttributeAccessIssue]
         session_id = (data or {}).get('sessionId') or (data or {}).get('session_id')
-        sess = None
-        if client_id in active_interviews:
-            sess = active_interviews[client_id]
-        elif session_id and session_id in sessions_by_id:
-            sess = sessions_by_id[session_id]
-            active_interviews[client_id] = sess
+        sess = _session_for(client_id, session_id, 'bind_session')
         if sess is not None:
-            sess['is_recording'] = True
-            sess['recording_start_time'] = time.time()
-           
-            sess['warning_tracker'] = {
-                'last_filler_warning': 0,
-                'last_pause_warning': 0,
-                'last_speech_time': time.time(),
-                'last_length_warning': 0,
-                'last_repeat_warning': 0,
-                'filler_count_session': 0,
-                'consecutive_empty': 0,
-                'pause_events': 0
-            }
-            logger.info(f"🎤 Recording started for client {client_id} (session {sess.get('session_id')})")
+            sess.start_recording()
+            logger.info(f"🎤 Recording started for client {client_id} (session {sess.session_id})")
             emit('recording-started', {'status': 'Recording started'})
-            # start pause monitor thread
-            if LIVE_COACHING:
-                try:
-                    if client_id not in pause_monitors or not pause_monitors[client_id].is_alive():
-                        t = threading.Thread(target=_pause_monitor, args=(client_id,), daemon=True)
-                        pause_monitors[client_id] = t
-                        t.start()
-                except Exception as mon_err:
-                    logger.warning(f"Could not start pause monitor: {mon_err}")
+            # Generate the following question while the candidate answers this one
+            _schedule_question(sess, int(sess.current_question or 1) + 1)
+            _arm_pause_timer(client_id, sess)
     except Exception as e:
         logger.error(f"Error starting recording: {str(e)}")
 
@@ -883,24 +1019,47 @@ def handle_recording_stop(data):
     try:
         client_id = request.sid  # pyright: ignore[reportAttributeAccessIssue]
         session_id = (data or {}).get('sessionId') or (data or {}).get('session_id')
-        sess = None
-        if client_id in active_interviews:
-            sess = active_interviews[client_id]
-        elif session_id and session_id in sessions_by_id:
-            sess = sessions_by_id[session_id]
-            active_interviews[client_id] = sess
+        sess = _session_for(client_id, session_id, 'bind_session')
         if sess is not None:
-            sess['is_recording'] = False
-            try:
-                sess['last_recording_stop_time'] = time.time()
-            except Exception:
-                pass
-            logger.info(f"🎤 Recording stopped for client {client_id} (session {sess.get('session_id')})")
+            sess.stop_recording()
+            timer_scheduler.cancel((sess.session_id, 'silence'))
+            logger.info(f"🎤 Recording stopped for client {client_id} (session {sess.session_id})")
             emit('recording-stopped', {'status': 'Recording stopped'})
            
     except Exception as e:
         logger.error(f"Error stopping recording: {str(e)}")
 
+def _rehydrate_session(session_id: str, label: str) -> Optional[SessionState]:
+    """Minimal session state rebuilt from the DB for a session no longer (or never) held in memory"""
+    db_writer.flush()
+    with db_reader.timed(label) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, difficulty, subject, status FROM interview_sessions WHERE id = ?', (session_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+       
+        cursor.execute('SELECT COUNT(1) FROM interview_answers WHERE session_id = ?', (session_id,))
+        count_row = cursor.fetchone()
+        cursor.execute(
+            'SELECT question_number, question_text FROM interview_questions WHERE session_id = ? ORDER BY question_number',
+            (session_id,)
+        )
+        questions = {int(number): text for number, text in cursor.fetchall() if text}
+    answered = count_row[0] if count_row else 0
+    sess = SessionState(session_id, row[2] or 'General', row[1] or 'Medium', current_question=max(1, answered + 1),
+                        questions=questions)
+    sess.status = row[3] or 'active'
+    # Eviction dropped the per-session dedup and bank no-repeat state: rebuild both from what was asked
+    question_deduper.forget(session_id)
+    for text in questions.values():
+        question_deduper.add(session_id, text)
+    try:
+        remember_bank_session(session_id, questions.values())
+    except Exception as e:
+        logger.warning(f"⚠️ Could not restore question bank state for {session_id}: {e}")
+    return sess
+
 @socketio.on('resume-interview-session')
 def handle_resume_interview_session(data):
     try:
@@ -910,47 +1069,25 @@ def handle_resume_interview_session(data):
             emit('error', {'message': 'Missing sessionId for resume'})
             return
        
-        if session_id not in sessions_by_id:
+        sess = sessions_by_id.get(session_id)
+        rehydrated = False
+        if sess is None:
             try:
-                conn = get_db_connection()
-                try:
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT id, difficulty, subject FROM interview_sessions WHERE id = ?', (session_id,))
-                    row = cursor.fetchone()
-                    if row:
-                       
-                        cursor.execute('SELECT COUNT(1) FROM interview_answers WHERE session_id = ?', (session_id,))
-                        count_row = cursor.fetchone()
-                        answered = count_row[0] if count_row else 0
-                        reconstructed = {
-                            'session_id': session_id,
-                            'difficulty': row[1] or 'Medium',
-                            'module_name': row[2] or 'General',
-                            'current_question': max(1, answered + 1),
-                            'max_questions': 10,
-                            'answers': [],
-                            'transcripts': [],
-                            'is_recording': False
-                        }
-                        sessions_by_id[session_id] = reconstructed
-                        logger.info(f"🧩 Reconstructed session {session_id} from DB for resume (answered={answered})")
-                finally:
-                    conn.close()
+                sess = _rehydrate_session(session_id, 'resume_session')
+                rehydrated = sess is not None
             except Exception as recon_err:
                 logger.error(f"❌ Resume reconstruction failed for {session_id}: {recon_err}")
-        if session_id not in sessions_by_id:
+        if sess is None:
             emit('error', {'message': 'Session not found for resume'})
             return
         # Block resuming completed sessions
-        try:
-            meta = sessions_by_id.get(session_id) or {}
-            if (meta.get('status') or '').lower() == 'completed':
-                emit('error', {'message': 'Cannot resume a completed session'})
-                return
-        except Exception:
-            pass
-        active_interviews[client_id] = sessions_by_id[session_id]
-        active_interviews[client_id]['client_id'] = client_id
+        if (sess.status or '').lower() == 'completed':
+            emit('error', {'message': 'Cannot resume a completed session'})
+            return
+        if rehydrated:
+            sessions_by_id.attach(session_id, sess, rehydrated=True)
+            logger.info(f"🧩 Reconstructed session {session_id} from DB for resume (answered={sess.current_question - 1})")
+        _bind_client(client_id, sess)
         logger.info(f"🔗 Session {session_id} resumed for client {client_id}")
         emit('interview-session-started', {'sessionId': session_id, 'status': 'Session resumed successfully'})
        
@@ -974,48 +1111,36 @@ def handle_start_interview_session(data):
 
         
         # If there's an existing active session, mark it complete & detach so new session starts clean
-        if client_id in active_interviews and active_interviews[client_id].get('session_id'):
-            prev_sid = active_interviews[client_id].get('session_id')
+        if client_id in active_interviews and active_interviews[client_id].session_id:
+            prev_sid = active_interviews[client_id].session_id
+            active_interviews[client_id].status = 'completed'
             logger.info(f"♻️ Completing previous session {prev_sid} for client {client_id} before new start")
-            try:
-                conn_prev = get_db_connection()
-                try:
-                    cur_prev = conn_prev.cursor()
-                    cur_prev.execute('''UPDATE interview_sessions SET end_time = CURRENT_TIMESTAMP, status = 'completed' WHERE id = ?''', (prev_sid,))
-                    conn_prev.commit()
-                finally:
-                    conn_prev.close()
-            except Exception as end_prev_err:
-                logger.warning(f"Could not finalize previous session {prev_sid}: {end_prev_err}")
+            db_writer.execute('''UPDATE interview_sessions SET end_time = CURRENT_TIMESTAMP, status = 'completed' WHERE id = ?''',
+                              (prev_sid,), label='session.complete')
             try:
                 del active_interviews[client_id]
             except Exception:
                 pass
+            sessions_by_id.evict(prev_sid)
         
         
         session_id = str(uuid.uuid4())
         
         
-        conn = get_db_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO interview_sessions 
-                (id, difficulty, llm, interview_type, persona, subject, module_id, path_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                session_id,
-                config.get('difficulty', 'Medium'),
-                config.get('llm', 'ChatGPT'),
-                config.get('interviewType', 'general'),
-                config.get('persona', 'professional_man'),
-                config.get('subject', 'general'),
-                config.get('moduleId', 'default'),
-                config.get('pathId', 'default')
-            ))
-            conn.commit()
-        finally:
-            conn.close()
+        db_writer.execute('''
+            INSERT INTO interview_sessions 
+            (id, difficulty, llm, interview_type, persona, subject, module_id, path_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            session_id,
+            config.get('difficulty', 'Medium'),
+            config.get('llm', 'ChatGPT'),
+            config.get('interviewType', 'general'),
+            config.get('persona', 'professional_man'),
+            config.get('subject', 'general'),
+            config.get('moduleId', 'default'),
+            config.get('pathId', 'default')
+        ), label='session.insert')
         
       
         module_name = config.get('subject', 'General Interview')
@@ -1026,13 +1151,8 @@ def handle_start_interview_session(data):
         if AI_AVAILABLE and interview_ai:
             try:
                 subject_name = map_subject_id_to_name(module_name)
-                question_result = interview_ai.generate_question(
-                    difficulty=difficulty,
-                    subject=subject_name,
-                    persona='professional_man',
-                    question_number=1,
-                    previous_answers=[]
-                )
+                # Opening questions are shared across candidates, usually a pool hit
+                question_result = question_store.get_or_generate(question_key(subject_name, difficulty, 1))
                 if question_result and (question_result.get('question') or question_result.get('question_text')):
                     first_question = question_result.get('question') or question_result.get('question_text')
                 
@@ -1047,21 +1167,8 @@ def handle_start_interview_session(data):
             logger.info(f"✅ Using fallback first question for {module_name}")
         
        
-        active_interviews[client_id] = {
-            'session_id': session_id,
-            'config': config,
-            'metadata': metadata,
-            'start_time': datetime.utcnow(),
-            'current_question': 1,
-            'max_questions': 10,
-            'answers': [],
-            'transcripts': [],
-            'is_recording': False,
-            'module_name': module_name,
-            'difficulty': difficulty,
-            'client_id': client_id
-        }
-        sessions_by_id[session_id] = active_interviews[client_id]
+        sess = SessionState(session_id, module_name, difficulty, config=config, metadata=metadata, client_id=client_id)
+        _bind_client(client_id, sess)
         
       
         logger.info(f"🔍 DEBUG: Created session for client_id: {client_id}")
@@ -1076,42 +1183,19 @@ def handle_start_interview_session(data):
         
         if first_question:
             
-            try:
-                qid = str(uuid.uuid4())
-                conn = get_db_connection()
-                try:
-                    cursor = conn.cursor()
-                 
-                    cursor.execute("PRAGMA table_info('interview_questions')")
-                    cols = {row[1] for row in cursor.fetchall()}
-                    base_values = [
-                        ('id', qid),
-                        ('session_id', session_id),
-                        ('question_number', 1),
-                        ('question_text', first_question)
-                    ]
-                    if 'question_category' in cols:
-                        base_values.append(('question_category', module_name or config.get('subject', 'general')))
-                    if 'difficulty_level' in cols:
-                        base_values.append(('difficulty_level', difficulty or config.get('difficulty', 'Medium')))
-                    if 'expected_duration' in cols:
-                      
-                        exp = (data.get('config', {}).get('expectedDuration') if isinstance(data, dict) else None)
-                        if not isinstance(exp, (int, float)):
-                            exp = 90 if (difficulty or '').lower() == 'easy' else 120 if (difficulty or '').lower() == 'medium' else 150
-                        base_values.append(('expected_duration', int(exp)))
-                    col_names = ", ".join(name for name, _ in base_values)
-                    placeholders = ", ".join(['?'] * len(base_values))
-                    values = [val for _, val in base_values]
-                    cursor.execute(f"INSERT INTO interview_questions ({col_names}) VALUES ({placeholders})", values)
-                    conn.commit()
-                finally:
-                    conn.close()
-            except Exception as dbq_err:
-                logger.error(f"❌ Failed to persist first question: {dbq_err}")
+            exp = (data.get('config', {}).get('expectedDuration') if isinstance(data, dict) else None)
+            if not isinstance(exp, (int, float)):
+                exp = _expected_duration(difficulty)
+            db_writer.execute(INSERT_QUESTION_SQL, (
+                str(uuid.uuid4()), session_id, 1, first_question,
+                module_name or config.get('subject', 'general'),
+                difficulty or config.get('difficulty', 'Medium'),
+                int(exp)
+            ), label='question.insert')
 
            
-            active_interviews[client_id]['questions'] = {1: first_question}
+            sess.set_question(1, first_question)
+            question_deduper.add(session_id, first_question)
 
             emit('interview-question', {
                 'questionText': first_question,
@@ -1122,29 +1206,9 @@ def handle_start_interview_session(data):
             })
             logger.info(f"🎯 Sent first question: {first_question[:50]}...")
 
-           
-            try:
-                if AI_AVAILABLE and interview_ai:
-                    subject_name = map_subject_id_to_name(module_name)
-                    def _prefetch_first(sess_key: str, subject: str, diff: str):
-                        try:
-                            prefetch = interview_ai.generate_question(  # pyright: ignore[reportOptionalMemberAccess]
-                                difficulty=diff,
-                                subject=subject,
-                                persona='professional_man',
-                                question_number=2,
-                                previous_answers=[]
-                            )
-                            if prefetch and (prefetch.get('question') or prefetch.get('question_text')):
-                                ai = active_interviews.get(sess_key)
-                                if ai:
-                                    ai.setdefault('prefetch', {})[2] = prefetch.get('question') or prefetch.get('question_text')
-                                    logger.info("⚡ Prefetched question 2")
-                        except Exception as e:
-                            logger.warning(f"Prefetch failed: {e}")
-                    threading.Thread(target=_prefetch_first, args=(client_id, subject_name, difficulty), daemon=True).start()
-            except Exception as pre_err:
-                logger.warning(f"Prefetch setup failed: {pre_err}")
+
+            _start_interview_plan(sess)
+            _schedule_question(sess, 2)
         
         logger.info(f"✅ Interview session {session_id} created and first question sent to client {client_id}")
         
@@ -1197,16 +1261,18 @@ def handle_initialize_interview(data):
             ]
         
       
-        active_interviews[client_id]['questions'] = questions
-        active_interviews[client_id]['module_name'] = module_name
-        active_interviews[client_id]['difficulty'] = difficulty
+        sess = active_interviews[client_id]
+        with sess.lock:
+            sess.questions = questions
+            sess.module_name = module_name
+            sess.difficulty = difficulty
         
         emit('interview-question', {
             'questionText': questions[0],
             'questionNumber': 1,
             'totalQuestions': len(questions),
             'category': module_name,
-            'questionId': f"{active_interviews[client_id]['session_id']}_q1"
+            'questionId': f"{sess.session_id}_q1"
         })
         
         logger.info(f"✅ Interview initialized with {len(questions)} questions")
@@ -1225,74 +1291,32 @@ def handle_answer_complete(data):
         logger.info(f"🔍 DEBUG: answer-complete called by client_id: {client_id}, sessionId={provided_session_id}")
         logger.info(f"🔍 DEBUG: active_interviews keys: {list(active_interviews.keys())}")
 
-        interview_data = None
-        if client_id in active_interviews:
-            interview_data = active_interviews[client_id]
-        elif provided_session_id and provided_session_id in sessions_by_id:
-            interview_data = sessions_by_id[provided_session_id]
-            active_interviews[client_id] = interview_data
-            logger.info(f"🔗 Bound existing session {provided_session_id} to client {client_id}")
-        elif provided_session_id:
-           
-            try:
-                conn = get_db_connection()
-                try:
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT id, difficulty, subject FROM interview_sessions WHERE id = ?', (provided_session_id,))
-                    row = cursor.fetchone()
-                    if row:
-                       
-                        cursor.execute('SELECT COUNT(1) FROM interview_answers WHERE session_id = ?', (provided_session_id,))
-                        count_row = cursor.fetchone()
-                        answered = count_row[0] if count_row else 0
-                        interview_data = {
-                            'session_id': provided_session_id,
-                            'difficulty': row[1] or 'Medium',
-                            'module_name': row[2] or 'General',
-                            'current_question': max(1, answered + 1),
-                            'max_questions': 10,
-                            'answers': [],
-                            'transcripts': [],
-                            'is_recording': False
-                        }
-                        sessions_by_id[provided_session_id] = interview_data
-                        active_interviews[client_id] = interview_data
-                        logger.info(f"🧩 Reconstructed minimal session state for {provided_session_id} (answered={answered})")
-                finally:
-                    conn.close()
-            except Exception as recon_err:
-                logger.error(f"❌ Failed to reconstruct session {provided_session_id}: {recon_err}")
+        interview_data = _session_for(client_id, provided_session_id, 'bind_session')
 
         if interview_data is None:
             logger.error(f"❌ Session not found for client {client_id} (sessionId={provided_session_id})")
             emit('error', {'message': 'No active interview session'})
             return
-        current_q = interview_data['current_question']
-        max_questions = interview_data['max_questions']
+        with interview_data.lock:
+            current_q = interview_data.current_question
+            max_questions = interview_data.max_questions
         
         logger.info(f"📝 Answer completed for question {current_q}")
 
-        try:
-            pre_len = len(interview_data.get('transcripts', []))
-            deadline = time.time() + 2.0
-            while time.time() < deadline:
-                now_len = len(interview_data.get('transcripts', []))
-                if now_len > pre_len:
-                    break
-                time.sleep(0.05)
-        except Exception:
-            pass
+        # Woken as soon as this session's own complete-audio upload has been transcribed
+        if not interview_data.wait_for_audio(ANSWER_WAIT_SEC):
+            logger.info(f"⏱️ No transcript for question {current_q} within {ANSWER_WAIT_SEC:g}s; scoring what is stored")
         
       
-        transcripts = interview_data.get('transcripts', [])
-        analyses = interview_data.get('analyses', [])
+        latest = interview_data.latest_record()
+        latest_analysis = interview_data.latest_analysis()
         
-        latest_transcript = transcripts[-1] if transcripts else ""
-        latest_analysis = analyses[-1] if analyses else None
+        latest_transcript = latest.transcript if latest else ""
+        latest_speech_metrics = latest.speech if latest else {}
         
         
-        if latest_analysis and latest_analysis.get('analysis'):
-            analysis_data = latest_analysis['analysis']
+        if latest_analysis and latest_analysis.analysis:
+            analysis_data = latest_analysis.analysis
             confidence_score = analysis_data.get('confidence_score', 60)
             clarity_score = analysis_data.get('clarity_score', 60)
             technical_accuracy = analysis_data.get('technical_accuracy', 70)
@@ -1305,13 +1329,12 @@ def handle_answer_complete(data):
             filler_words_count = 0
 
         
-        tracker = interview_data.get('warning_tracker', {}) if isinstance(interview_data, dict) else {}
-        interim_fillers = int(tracker.get('filler_count_session', 0) or 0)
-        interim_pauses = int(tracker.get('pause_events', 0) or 0)
-        interim_repetition = int(tracker.get('repetition_count_session', 0) or 0)
+        # Read and reset together, so live counts arriving meanwhile go to the next answer
+        interim_fillers, interim_pauses, interim_repetition = interview_data.take_answer_counters()
         filler_words_count = max(int(filler_words_count or 0), interim_fillers)
-        start_ts = interview_data.get('recording_start_time') if isinstance(interview_data, dict) else None
-        stop_ts = interview_data.get('last_recording_stop_time') if isinstance(interview_data, dict) else None
+        with interview_data.lock:
+            start_ts = interview_data.recording_start_time
+            stop_ts = interview_data.last_recording_stop_time
         if not stop_ts:
             try:
                 stop_ts = time.time()
@@ -1340,61 +1363,46 @@ def handle_answer_complete(data):
         
         try:
             answer_id = str(uuid.uuid4())
-            conn = get_db_connection()
-            try:
-                cursor = conn.cursor()
-                
-               
-                question_id = f"q{current_q}_{interview_data['session_id']}"
-                
-                cursor.execute('''
-                    INSERT INTO interview_answers 
-                    (id, session_id, question_id, audio_transcript, answer_duration, 
-                     filler_words_count, confidence_score, clarity_score, technical_accuracy)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    answer_id,
-                    interview_data['session_id'],
-                    question_id,
-                    latest_transcript,
-                    float(answer_duration),
-                    filler_words_count,
-                    confidence_score,
-                    clarity_score,
-                    technical_accuracy
-                ))
-                conn.commit()
-                
-                logger.info(f"💾 Stored answer in database with scores: confidence={confidence_score}, clarity={clarity_score}")
-                try:
-                    
-                    interview_data['last_saved_question_id'] = question_id
-                except Exception:
-                    pass
-            finally:
-                conn.close()
+            question_id = f"q{current_q}_{interview_data.session_id}"
+            
+            entry = answer_entry(
+                confidence=confidence_score, clarity=clarity_score, technical=technical_accuracy,
+                words=len((latest_transcript or '').split()), filler_terms=count_filler_terms(latest_transcript),
+                filler_count=filler_words_count, duration=answer_duration, speech=latest_speech_metrics
+            )
+            # The answer row and the session's running analytics commit in one transaction
+            session_summaries.record(interview_data.session_id, current_q, entry, [('''
+                INSERT INTO interview_answers 
+                (id, session_id, question_id, audio_transcript, answer_duration, 
+                 filler_words_count, confidence_score, clarity_score, technical_accuracy,
+                 speaking_time, pause_count, pause_duration, longest_pause, answer_seq)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                answer_id,
+                interview_data.session_id,
+                question_id,
+                latest_transcript,
+                float(answer_duration),
+                filler_words_count,
+                confidence_score,
+                clarity_score,
+                technical_accuracy,
+                *speech_metric_values(latest_speech_metrics),
+                current_q
+            ))])
+            
+            logger.info(f"💾 Queued answer for storage with scores: confidence={confidence_score}, clarity={clarity_score}")
+            with interview_data.lock:
+                interview_data.last_saved_question_id = question_id
             
         except Exception as db_error:
             logger.error(f"❌ Database storage failed: {db_error}")
         
      
-        answer_data = {
-            'questionNumber': current_q,
-            'transcript': latest_transcript,
-            'timestamp': datetime.utcnow().isoformat(),
-            'analysis': {
-                'confidence_score': confidence_score,
-                'clarity_score': clarity_score,
-                'technical_accuracy': technical_accuracy,
-                'filler_words_count': filler_words_count
-            },
-            'duration': answer_duration,
-            'processed': True
-        }
-        
-        if 'answers' not in interview_data:
-            interview_data['answers'] = []
-        interview_data['answers'].append(answer_data)
+        answer_record = AnswerRecord(current_q, latest_transcript, confidence_score, clarity_score,
+                                     technical_accuracy, filler_words_count, answer_duration)
+        with interview_data.lock:
+            interview_data.answers.append(answer_record)
         
         
         feedback = {
@@ -1409,6 +1417,10 @@ def handle_answer_complete(data):
                 'pause_events': interim_pauses,
                 'repetition_count': interim_repetition,
                 'answer_duration': answer_duration,
+                'speaking_time': latest_speech_metrics.get('speaking_time', 0.0),
+                'pause_count': latest_speech_metrics.get('pause_count', 0),
+                'pause_duration': latest_speech_metrics.get('pause_duration', 0.0),
+                'words_per_minute': latest_speech_metrics.get('words_per_minute', 0.0),
                 'empty_answer': empty_answer
             },
             'suggestions': [
@@ -1421,20 +1433,7 @@ def handle_answer_complete(data):
             'emptyAnswer': empty_answer
         }
         emit('interview-feedback', feedback)
-        
-        try:
-            wt = interview_data.get('warning_tracker') or {}
-            wt['filler_count_session'] = 0
-            wt['pause_events'] = 0
-            wt['consecutive_empty'] = 0
-            wt['repetition_count_session'] = 0
-            interview_data['warning_tracker'] = wt
-        except Exception:
-            pass
         logger.info(f"📊 Sent feedback with scores: overall={confidence_score}, filler={filler_words_count}")
-        
-        
-        time.sleep(0.3)
 
         
         if current_q < max_questions:
@@ -1442,147 +1441,90 @@ def handle_answer_complete(data):
             next_question = None
             next_q_number = current_q + 1
             
-            if interview_data.get('prefetch') and interview_data['prefetch'].get(next_q_number):
-                next_question = interview_data['prefetch'][next_q_number]
-                logger.info(f"⚡ Using prefetched question {next_q_number}")
-            elif AI_AVAILABLE and interview_ai:
-                try:
-                    subject_name = map_subject_id_to_name(interview_data.get('module_name') or interview_data.get('config', {}).get('subject', 'general'))
-                    previous_transcripts = interview_data.get('transcripts', [])
-                    question_result = interview_ai.generate_question(
-                        difficulty=interview_data.get('difficulty', 'Medium'),
-                        subject=subject_name,
-                        persona='professional_man',
-                        question_number=next_q_number,
-                        previous_answers=previous_transcripts
-                    )
-                    logger.info(f"🎯 AI Result: {question_result}")
-                    if question_result and (question_result.get('question') or question_result.get('question_text')):
-                        next_question = question_result.get('question') or question_result.get('question_text')
-                        logger.info(f"✅ Generated AI question {next_q_number}: {(next_question or '')[:100]}...")
-                    else:
-                        logger.warning(f"⚠️ AI returned invalid result: {question_result}")
-                        next_question = None
-                except Exception as ai_error:
-                    logger.error(f"❌ AI question generation failed: {ai_error}")
-                    import traceback
-                    logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-                    next_question = None
+            if AI_AVAILABLE and interview_ai:
+                # Normally already generated at recording-start; only waits up to the deadline
+                _schedule_question(interview_data, next_q_number)
+                timeout = NEXT_QUESTION_DEADLINE_SEC
+                stream = question_prefetcher.stream(interview_data.session_id, next_q_number)
+                if stream is not None:
+                    def _emit_delta(delta, text_so_far, _q=next_q_number):
+                        socketio.emit('interview-question-delta', {
+                            'delta': delta,
+                            'questionText': text_so_far,
+                            'questionNumber': _q,
+                            'totalQuestions': max_questions,
+                            'category': interview_data.module_name,
+                            'questionId': f"{interview_data.session_id}_q{_q}"
+                        }, to=client_id)
+                    # Still generating: show the words as they arrive and give it longer to finish
+                    if stream.attach(_emit_delta):
+                        timeout = STREAM_QUESTION_DEADLINE_SEC
+                question_result = question_prefetcher.take(interview_data.session_id, next_q_number, timeout)
+                next_question = question_text_of(question_result)
+                if next_question:
+                    logger.info(f"✅ Using generated question {next_q_number}: {next_question[:100]}...")
+                else:
+                    logger.warning(f"⚠️ No generated question {next_q_number} in time, falling back")
             else:
                 logger.warning(f"⚠️ AI not available - AI_AVAILABLE: {AI_AVAILABLE}, interview_ai: {interview_ai}")
                 next_question = None
-            
           
             if not next_question:
+                module_name = interview_data.module_name
                 fallbacks = [
-                    f"Can you elaborate more on your experience with {interview_data['module_name']}?",
-                    f"What challenges have you faced when working with {interview_data['module_name']}?",
-                    f"How would you approach a complex problem in {interview_data['module_name']}?",
-                    f"What are some advanced concepts in {interview_data['module_name']} you're familiar with?",
-                    f"Describe a project where you successfully implemented {interview_data['module_name']} solutions."
+                    f"Can you elaborate more on your experience with {module_name}?",
+                    f"What challenges have you faced when working with {module_name}?",
+                    f"How would you approach a complex problem in {module_name}?",
+                    f"What are some advanced concepts in {module_name} you're familiar with?",
+                    f"Describe a project where you successfully implemented {module_name} solutions."
                 ]
                 next_question = fallbacks[(next_q_number - 2) % len(fallbacks)]
                 logger.info(f"✅ Using fallback question {next_q_number}")
             
+            next_question = _unique_question(interview_data, next_q_number, next_question)
             
-            interview_data['current_question'] = next_q_number
+            with interview_data.lock:
+                interview_data.current_question = next_q_number
+                interview_data.set_question(next_q_number, next_question)
 
             
-            try:
-                qid = str(uuid.uuid4())
-                conn = get_db_connection()
-                try:
-                    cursor = conn.cursor()
-                   
-                    cursor.execute("PRAGMA table_info('interview_questions')")
-                    cols = {row[1] for row in cursor.fetchall()}
-                    base_values = [
-                        ('id', qid),
-                        ('session_id', interview_data['session_id']),
-                        ('question_number', next_q_number),
-                        ('question_text', next_question)
-                    ]
-                    if 'question_category' in cols:
-                        base_values.append(('question_category', interview_data.get('module_name') or interview_data.get('config', {}).get('subject', 'general')))
-                    if 'difficulty_level' in cols:
-                        base_values.append(('difficulty_level', interview_data.get('difficulty', 'Medium')))
-                    if 'expected_duration' in cols:
-                       
-                        diff = (interview_data.get('difficulty') or '').lower()
-                        exp = 90 if diff == 'easy' else 120 if diff == 'medium' else 150
-                        base_values.append(('expected_duration', exp))
-                    col_names = ", ".join(name for name, _ in base_values)
-                    placeholders = ", ".join(['?'] * len(base_values))
-                    values = [val for _, val in base_values]
-                    cursor.execute(f"INSERT INTO interview_questions ({col_names}) VALUES ({placeholders})", values)
-                    conn.commit()
-                finally:
-                    conn.close()
-            except Exception as dbq_err:
-                logger.error(f"❌ Failed to persist question {next_q_number}: {dbq_err}")
-
-            try:
-                if 'questions' not in interview_data or not isinstance(interview_data['questions'], dict):
-                    interview_data['questions'] = {}
-                interview_data['questions'][next_q_number] = next_question
-            except Exception:
-                pass
+            db_writer.execute(INSERT_QUESTION_SQL, (
+                str(uuid.uuid4()), interview_data.session_id, next_q_number, next_question,
+                interview_data.subject,
+                interview_data.difficulty or 'Medium',
+                _expected_duration(interview_data.difficulty)
+            ), label='question.insert')
 
             emit('interview-question', {
                 'questionText': next_question,
                 'questionNumber': next_q_number,
                 'totalQuestions': max_questions,
-                'category': interview_data['module_name'],
-                'questionId': f"{interview_data['session_id']}_q{next_q_number}"
+                'category': interview_data.module_name,
+                'questionId': f"{interview_data.session_id}_q{next_q_number}"
             })
             logger.info(f"➡️ Sent question {next_q_number}: {next_question[:50]}...")
 
-           
-            try:
-                following_q = next_q_number + 1
-                if following_q <= max_questions and AI_AVAILABLE and interview_ai:
-                    subject_name = map_subject_id_to_name(interview_data['module_name'])
-                    def _prefetch_following(sess_id: str, subject: str, diff: str, qn: int, prev_answers: list):
-                        try:
-                            prefetch = interview_ai.generate_question(  # pyright: ignore[reportOptionalMemberAccess]
-                                difficulty=diff,
-                                subject=subject,
-                                persona='professional_man',
-                                question_number=qn,
-                                previous_answers=prev_answers
-                            )
-                            if prefetch and (prefetch.get('question') or prefetch.get('question_text')):
-                                sess = sessions_by_id.get(sess_id)
-                                if sess:
-                                    sess.setdefault('prefetch', {})[qn] = prefetch.get('question') or prefetch.get('question_text')
-                                    logger.info(f"⚡ Prefetched question {qn}")
-                        except Exception as e:
-                            logger.warning(f"Prefetch failed: {e}")
-                    threading.Thread(
-                        target=_prefetch_following,
-                        args=(
-                            interview_data['session_id'],
-                            subject_name,
-                            interview_data['difficulty'],
-                            following_q,
-                            interview_data.get('transcripts', [])
-                        ),
-                        daemon=True
-                    ).start()
-            except Exception as pre_err:
-                logger.warning(f"Prefetch setup failed: {pre_err}")
+
+            _schedule_question(interview_data, next_q_number + 1)
         else:
            
+            session_id = interview_data.session_id
+            with interview_data.lock:
+                answered = len(interview_data.answers)
             completion_data = {
                 'message': 'Interview completed successfully!',
-                'sessionId': interview_data['session_id'],
-                'session_id': interview_data['session_id'],  
+                'sessionId': session_id,
+                'session_id': session_id,  
                 'totalQuestions': max_questions,
-                'answeredQuestions': len(interview_data['answers']),
-                'completedQuestions': len(interview_data['answers'])
+                'answeredQuestions': answered,
+                'completedQuestions': answered
             }
             emit('interview-complete', completion_data)
-            logger.info(f"🎉 Interview completed for session {interview_data['session_id']} - {max_questions} questions asked")
+            question_prefetcher.discard_session(session_id)
+            interview_planner.discard_session(session_id)
+            forget_bank_session(session_id)
+            question_deduper.forget(session_id)
+            logger.info(f"🎉 Interview completed for session {session_id} - {max_questions} questions asked")
         
         try:
             if 'completion_data' in locals():
@@ -1604,31 +1546,28 @@ def handle_end_interview(data):
 
         session_id = None
         if client_id in active_interviews:
-            session_id = active_interviews[client_id].get('session_id')
+            session_id = active_interviews[client_id].session_id
         if not session_id and provided_session_id:
             session_id = provided_session_id
 
         if session_id:
             
             try:
-                conn = get_db_connection()
-                try:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        UPDATE interview_sessions 
-                        SET end_time = CURRENT_TIMESTAMP, status = 'completed'
-                        WHERE id = ?
-                    ''', (session_id,))
-                    conn.commit()
-                    logger.info(f"✅ Interview {session_id} ended by user")
-                finally:
-                    conn.close()
+                # Waited on: late complete-audio events check this status before storing anything
+                db_writer.execute('''
+                    UPDATE interview_sessions 
+                    SET end_time = CURRENT_TIMESTAMP, status = 'completed'
+                    WHERE id = ?
+                ''', (session_id,), label='session.complete').result(DB_WRITE_WAIT_SEC)
+                logger.info(f"✅ Interview {session_id} ended by user")
             except Exception as db_err:
                 logger.error(f"❌ Failed to update DB on end interview: {db_err}")
 
             
             if client_id in active_interviews:
                 del active_interviews[client_id]
+            if sessions_by_id.evict(session_id) is None:
+                _release_session(session_id, None)
 
             try:
                 completion_data = build_completion_payload(session_id)
@@ -1664,9 +1603,25 @@ def index():
 def health():
     return {
         'status': 'healthy',
-        'whisper_available': whisper_model is not None,
+        'whisper_available': backend_registry.is_loaded('whisper'),
         'ai_available': AI_AVAILABLE,
-        'active_interviews': len(active_interviews)
+        'active_interviews': len(active_interviews),
+        'sessions': sessions_by_id.snapshot(),
+        'question_prefetch': question_prefetcher.snapshot(),
+        'question_cache': question_store.snapshot(),
+        'interview_plan': interview_planner.snapshot(),
+        'question_singleflight': question_singleflight.snapshot(),
+        'question_dedup': question_deduper.snapshot(),
+        'db_writer': db_writer.snapshot(),
+        'db_reader': db_reader.snapshot(),
+        'session_summary': session_summaries.snapshot(),
+        'analytics_cache': analytics_cache.snapshot(),
+        'session_export': session_exporter.snapshot(),
+        'session_archive': session_archiver.snapshot(),
+        'timers': timer_scheduler.snapshot(),
+        'backends': backend_registry.report(),
+        'llm_gateway': llm_gateway.snapshot(),
+        'llm_circuit': llm_gateway.breaker.state
     }
 
 @app.route('/test-question')
@@ -1714,49 +1669,73 @@ def test_question():
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def _etag_response(etag: str, body: bytes):
+    """JSON body with a strong ETag, or a bare 304 when the client already holds this version"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/api/analytics/<session_id>', methods=['GET'])
 def get_analytics(session_id):
    
+    cached = analytics_cache.get(session_id)
+    if cached is not None:
+        return _etag_response(*cached)
+    generation = analytics_cache.generation(session_id)
+    db_writer.flush()
     try:
-        conn = get_db_connection()
-        try:
+        summary = session_summaries.get(session_id)
+        with db_reader.timed('analytics') as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT * FROM interview_sessions WHERE id = ?
-            ''', (session_id,))
-            session_data = cursor.fetchone()
+            # Old completed sessions may have moved to the archive database
+            schema, session_data = fetch_fallthrough(conn, SESSION_ROW_SQL, (session_id,))
             
             if not session_data:
                 logger.warning(f"Session {session_id} not found in database")
                 return jsonify({'error': 'Session not found'}), 404
             
        
-            cursor.execute('''
-                SELECT * FROM interview_questions WHERE session_id = ? ORDER BY question_number
+            cursor.execute(f'''
+                SELECT * FROM {schema}.interview_questions WHERE session_id = ? ORDER BY question_number
             ''', (session_id,))
             questions_data = cursor.fetchall()
             
-
-            cursor.execute('''
-                SELECT audio_transcript, confidence_score, clarity_score, technical_accuracy
-                FROM interview_answers WHERE session_id = ? ORDER BY id
-            ''', (session_id,))
-            answers_data = cursor.fetchall()
-        finally:
-            conn.close()
-        
-
-        answers = []
-        for answer in answers_data:
-            answers.append({
-                'transcript': answer[0] or '',
-                'analysis': {
-                    'confidence_score': answer[1] or 50,
-                    'clarity_score': answer[2] or 50,
-                    'technical_accuracy': answer[3] or 50
-                }
-            })
+            # Sessions recorded before session_summary existed still get the full scan
+            answers_data = []
+            if summary is None:
+                cursor.execute(f'''
+                    SELECT audio_transcript, confidence_score, clarity_score, technical_accuracy,
+                           answer_duration, speaking_time, pause_count, pause_duration, longest_pause
+                    FROM {schema}.interview_answers WHERE session_id = ? ORDER BY answer_seq, rowid
+                ''', (session_id,))
+                answers_data = cursor.fetchall()
+        
+        if summary is not None:
+            answer_metrics = _analytics_from_summary(summary)
+        else:
+            answers = []
+            for answer in answers_data:
+                answers.append({
+                    'transcript': answer[0] or '',
+                    'analysis': {
+                        'confidence_score': answer[1] or MISSING_SCORE,
+                        'clarity_score': answer[2] or MISSING_SCORE,
+                        'technical_accuracy': answer[3] or MISSING_SCORE
+                    },
+                    'duration': answer[4],
+                    'speech': {
+                        'speaking_time': answer[5],
+                        'pause_count': answer[6],
+                        'pause_duration': answer[7],
+                        'longest_pause': answer[8]
+                    }
+                })
+            answer_metrics = _analytics_from_answers(answers)
         
         start_time = session_data[9] if session_data[9] else None
         end_time = session_data[10] if session_data[10] else None
@@ -1778,38 +1757,13 @@ def get_analytics(session_id):
             'subject': session_data[6] or 'General',
             'duration': duration,
             'totalQuestions': session_data[11] or 10,
-            'completedQuestions': len(answers),
             'overallScore': session_data[13] or 75,
             'status': session_data[14] or 'completed',
             
-       
-            'fillerWords': analyze_filler_words(answers),
-            'speakingMetrics': calculate_speaking_metrics(answers),
-            'questionPerformance': build_question_performance(answers),
-            
-           
-            'scores': {
-                'confidence': round(sum(a.get('analysis', {}).get('confidence_score', 50) for a in answers) / max(len(answers), 1), 0),
-                'clarity': round(sum(a.get('analysis', {}).get('clarity_score', 50) for a in answers) / max(len(answers), 1), 0),
-                'technical_accuracy': round(sum(a.get('analysis', {}).get('technical_accuracy', 50) for a in answers) / max(len(answers), 1), 0),
-                # Provide a communication composite for the UI
-                'communication': round((
-                    (sum(a.get('analysis', {}).get('confidence_score', 50) for a in answers) / max(len(answers), 1)) +
-                    (sum(a.get('analysis', {}).get('clarity_score', 50) for a in answers) / max(len(answers), 1))
-                ) / 2, 0)
-            },
-            
-          
-            'feedback': {
-                'strengths': generate_strengths(answers),
-                'improvements': generate_improvements(answers),
-                'overall': generate_overall_feedback(answers),
-                'recommendations': build_recommendations(answers)
-            },
-            
             
             'questions': []
         }
+        analytics.update(answer_metrics)
         
         for q in questions_data:
             analytics['questions'].append({
@@ -1819,31 +1773,135 @@ def get_analytics(session_id):
                 'qualityScore': q[7] or 70
             })
         
-        return jsonify(analytics)
+        body = jsonify(analytics).get_data()
+        # Completed sessions only change through a late transcript update, which invalidates the entry
+        if session_data[14] == 'completed':
+            etag = analytics_cache.put(session_id, body, generation)
+        else:
+            etag = body_etag(body)
+        return _etag_response(etag, body)
         
     except Exception as e:
         logger.error(f"Error getting analytics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/export/sessions', methods=['GET'])
+def export_sessions():
+    """Bulk NDJSON export, streamed row by row; gzip when asked (?gzip=1) or accepted by the client"""
+    try:
+        filters = ExportFilters.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    use_gzip = request.args.get('gzip') == '1' or 'gzip' in request.accept_encodings
+    db_writer.flush()
+    response = app.response_class(session_exporter.stream(filters, gzip=use_gzip), mimetype='application/x-ndjson')
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def _analytics_from_answers(answers) -> Dict[str, Any]:
+    """Answer-derived analytics sections, computed by scanning every answer"""
+    n = max(len(answers), 1)
+    avg_confidence = sum(a.get('analysis', {}).get('confidence_score', MISSING_SCORE) for a in answers) / n
+    avg_clarity = sum(a.get('analysis', {}).get('clarity_score', MISSING_SCORE) for a in answers) / n
+    return {
+        'completedQuestions': len(answers),
+        'fillerWords': analyze_filler_words(answers),
+        'speakingMetrics': calculate_speaking_metrics(answers),
+        'questionPerformance': build_question_performance(answers),
+        'scores': {
+            'confidence': round(avg_confidence, 0),
+            'clarity': round(avg_clarity, 0),
+            'technical_accuracy': round(sum(a.get('analysis', {}).get('technical_accuracy', MISSING_SCORE) for a in answers) / n, 0),
+            # Provide a communication composite for the UI
+            'communication': round((avg_confidence + avg_clarity) / 2, 0)
+        },
+        'feedback': {
+            'strengths': generate_strengths(answers),
+            'improvements': generate_improvements(answers),
+            'overall': generate_overall_feedback(answers),
+            'recommendations': build_recommendations(answers)
+        }
+    }
+
+def _analytics_from_summary(summary: SessionSummary) -> Dict[str, Any]:
+    """Same sections as _analytics_from_answers, read off the session's running sums"""
+    stats = _summary_stats(summary)
+    total_words = int(summary.totals['words'])
+    pace_seconds = summary.totals['pace_seconds']
+    wpm = (total_words / (pace_seconds / 60)) if pace_seconds > 0 else 0
+    pauses = summary.speech_metrics()
+    avg_confidence = summary.average('confidence')
+    avg_clarity = summary.average('clarity')
+    return {
+        'completedQuestions': summary.answers,
+        'fillerWords': {
+            'total': int(summary.totals['fillers']),
+            'breakdown': [{'word': word, 'count': count} for word, count in summary.filler_breakdown()][:4],
+            'realtime_count': 0
+        },
+        'speakingMetrics': {
+            'wordsPerMinute': round(wpm, 1),
+            'totalWords': total_words,
+            'averagePauses': pauses.get('averagePauses', 0),
+            'averagePause': pauses.get('averagePause', 0),
+            'longestPause': pauses.get('longestPause', 0),
+            'pauseCount': pauses.get('pauseCount', 0),
+            'speakingTime': pauses.get('speakingTime', 0),
+            'speakingPace': 'optimal' if 120 <= wpm <= 160 else 'needs_improvement'
+        },
+        'questionPerformance': [{
+            'questionNumber': i + 1,
+            'score': entry['confidence'],
+            'wordCount': entry['words'],
+            'duration': round(entry['duration'], 1) if entry['duration'] else 0,
+            'speakingTime': entry['speaking_time'] or 0,
+            'pauseCount': entry['pause_count'] or 0
+        } for i, (_, entry) in enumerate(summary.ordered())],
+        'scores': {
+            'confidence': round(avg_confidence, 0),
+            'clarity': round(avg_clarity, 0),
+            'technical_accuracy': round(summary.average('technical'), 0),
+            'communication': round((avg_confidence + avg_clarity) / 2, 0)
+        },
+        'feedback': {
+            'strengths': generate_strengths(None, stats),
+            'improvements': generate_improvements(None, stats),
+            'overall': generate_overall_feedback(None, stats),
+            'recommendations': build_recommendations(None, stats)
+        }
+    }
+
+ANALYTICS_FILLER_WORDS = ['um', 'uh', 'like', 'you know', 'so', 'well', 'actually','yeah','ehh','aah','oh','Oh','ohh','uhm','And And','Om','on on','On on','on On',]
+
+def count_filler_terms(text: str) -> Dict[str, int]:
+    """Per-term filler counts for one answer, as the analytics report counts them"""
+    answer_text = (text or '').lower()
+    counts = {}
+    for filler in ANALYTICS_FILLER_WORDS:
+        count = answer_text.count(filler)
+        if count > 0:
+            counts[filler] = count
+    return counts
+
 def analyze_filler_words(answers, realtime_issues=None):
-    filler_words = ['um', 'uh', 'like', 'you know', 'so', 'well', 'actually','yeah','ehh','aah','oh','Oh','ohh','uhm','And And','Om','on on','On on','on On',]
     filler_count = {}
     total_fillers = 0
     
   
     for answer in answers:
         if isinstance(answer, dict):
-            answer_text = (answer.get('transcript', '') or '').lower()
+            answer_text = answer.get('transcript', '') or ''
         elif isinstance(answer, (list, tuple)) and len(answer) > 1:
-            answer_text = (answer[1] or '').lower()
+            answer_text = answer[1] or ''
         else:
-            answer_text = str(answer).lower()
+            answer_text = str(answer)
             
-        for filler in filler_words:
-            count = answer_text.count(filler)
-            if count > 0:
-                filler_count[filler] = filler_count.get(filler, 0) + count
-                total_fillers += count
+        for filler, count in count_filler_terms(answer_text).items():
+            filler_count[filler] = filler_count.get(filler, 0) + count
+            total_fillers += count
    
     if realtime_issues and 'filler_count' in realtime_issues:
         total_fillers += realtime_issues['filler_count']
@@ -1861,11 +1919,15 @@ def calculate_speaking_metrics(answers, realtime_issues=None):
     
     total_words = 0
     total_duration = 0
+    speech_rows = []
     
     for answer in answers:
         if isinstance(answer, dict):
             transcript = answer.get('transcript', '')
-            duration = answer.get('duration', 30)
+            speech = answer.get('speech') or {}
+            speech_rows.append(speech)
+            # Prefer voiced time from the speech timeline, then the recorded answer length
+            duration = speech.get('speaking_time') or answer.get('duration') or 30
         elif isinstance(answer, (list, tuple)) and len(answer) > 1:
             transcript = answer[1] or ''
             duration = 30  # Default duration
@@ -1879,12 +1941,17 @@ def calculate_speaking_metrics(answers, realtime_issues=None):
             total_duration += duration
     
 
-    wpm = (total_words / max(total_duration / 60, 1)) if total_duration > 0 else 0
+    wpm = (total_words / (total_duration / 60)) if total_duration > 0 else 0
+    pauses = aggregate_speech_metrics(speech_rows)
     
     return {
         'wordsPerMinute': round(wpm, 1),
         'totalWords': total_words,
-        'averagePauses': 2.3,  
+        'averagePauses': pauses.get('averagePauses', 0),
+        'averagePause': pauses.get('averagePause', 0),
+        'longestPause': pauses.get('longestPause', 0),
+        'pauseCount': pauses.get('pauseCount', 0),
+        'speakingTime': pauses.get('speakingTime', 0),
         'speakingPace': 'optimal' if 120 <= wpm <= 160 else 'needs_improvement'
     }
 
@@ -1893,9 +1960,13 @@ def build_question_performance(answers):
     performance = []
     
     for i, answer in enumerate(answers):
+        duration = None
+        speech = {}
         if isinstance(answer, dict):
             score = answer.get('analysis', {}).get('confidence_score', 70)
             transcript = answer.get('transcript', '')
+            duration = answer.get('duration')
+            speech = answer.get('speech') or {}
         elif isinstance(answer, (list, tuple)) and len(answer) > 2:
             score = answer[2] or 70
             transcript = answer[1] or ''
@@ -1907,22 +1978,50 @@ def build_question_performance(answers):
             'questionNumber': i + 1,
             'score': score,
             'wordCount': len(transcript.split()) if transcript else 0,
-            'duration': 30  # Placeholder
+            'duration': round(duration, 1) if duration else 0,
+            'speakingTime': speech.get('speaking_time') or 0,
+            'pauseCount': speech.get('pause_count') or 0
         })
     
     return performance
 
-def generate_strengths(answers):
+def _answer_stats(answers) -> Dict[str, Any]:
+    """Averages and totals the feedback generators work from, computed from answer dicts"""
+    if not answers:
+        return {'count': 0}
+    return {
+        'count': len(answers),
+        'avg_confidence': sum(a.get('analysis', {}).get('confidence_score', 70) for a in answers) / len(answers),
+        'avg_clarity': sum(a.get('analysis', {}).get('clarity_score', 70) for a in answers) / len(answers),
+        'avg_technical': sum(a.get('analysis', {}).get('technical_accuracy', 70) for a in answers) / len(answers),
+        'total_words': sum(len(a.get('transcript', '').split()) for a in answers),
+        'empty_answers': sum(1 for a in answers if not a.get('transcript', '').strip())
+    }
+
+def _summary_stats(summary: SessionSummary) -> Dict[str, Any]:
+    """Same as _answer_stats, from a session's running sums"""
+    if not summary.answers:
+        return {'count': 0}
+    return {
+        'count': summary.answers,
+        'avg_confidence': summary.average('confidence'),
+        'avg_clarity': summary.average('clarity'),
+        'avg_technical': summary.average('technical'),
+        'total_words': int(summary.totals['words']),
+        'empty_answers': int(summary.totals['empty'])
+    }
+
+def generate_strengths(answers, stats: Optional[Dict[str, Any]] = None):
     
     strengths = []
+    stats = stats or _answer_stats(answers)
     
-    if not answers:
+    if not stats['count']:
         return ["Completed the interview session"]
     
-    # Calculate averages
-    avg_confidence = sum(a.get('analysis', {}).get('confidence_score', 70) for a in answers) / len(answers)
-    avg_clarity = sum(a.get('analysis', {}).get('clarity_score', 70) for a in answers) / len(answers)
-    total_words = sum(len(a.get('transcript', '').split()) for a in answers)
+    avg_confidence = stats['avg_confidence']
+    avg_clarity = stats['avg_clarity']
+    total_words = stats['total_words']
     
     if avg_confidence >= 80:
         strengths.append("Demonstrated strong confidence in responses")
@@ -1930,7 +2029,7 @@ def generate_strengths(answers):
         strengths.append("Spoke with excellent clarity and articulation")
     if total_words > 200:
         strengths.append("Provided detailed and comprehensive answers")
-    if len(answers) >= 8:
+    if stats['count'] >= 8:
         strengths.append("Completed majority of interview questions")
  
     if not strengths:
@@ -1941,18 +2040,19 @@ def generate_strengths(answers):
     
     return strengths
 
-def generate_improvements(answers):
+def generate_improvements(answers, stats: Optional[Dict[str, Any]] = None):
    
     improvements = []
+    stats = stats or _answer_stats(answers)
     
-    if not answers:
+    if not stats['count']:
         return ["Try to provide more detailed responses"]
     
     
-    avg_confidence = sum(a.get('analysis', {}).get('confidence_score', 70) for a in answers) / len(answers)
-    avg_clarity = sum(a.get('analysis', {}).get('clarity_score', 70) for a in answers) / len(answers)
-    empty_answers = sum(1 for a in answers if not a.get('transcript', '').strip())
-    total_words = sum(len(a.get('transcript', '').split()) for a in answers)
+    avg_confidence = stats['avg_confidence']
+    avg_clarity = stats['avg_clarity']
+    empty_answers = stats['empty_answers']
+    total_words = stats['total_words']
     
     if avg_confidence < 60:
         improvements.append("Practice speaking with more confidence and conviction")
@@ -1972,12 +2072,13 @@ def generate_improvements(answers):
     
     return improvements
 
-def generate_overall_feedback(answers):
+def generate_overall_feedback(answers, stats: Optional[Dict[str, Any]] = None):
+    stats = stats or _answer_stats(answers)
  
-    if not answers:
+    if not stats['count']:
         return "Thank you for participating in the interview. Keep practicing!"
     
-    avg_score = sum(a.get('analysis', {}).get('confidence_score', 70) for a in answers) / len(answers)
+    avg_score = stats['avg_confidence']
     
     if avg_score >= 85:
         return "Excellent performance! You demonstrated strong technical knowledge and communication skills."
@@ -1988,20 +2089,21 @@ def generate_overall_feedback(answers):
     else:
         return "Keep practicing! Regular mock interviews will help improve your performance."
 
-def build_recommendations(answers: List[dict]) -> List[str]:
+def build_recommendations(answers: List[dict], stats: Optional[Dict[str, Any]] = None) -> List[str]:
     """Derive actionable recommendations for the client UI."""
     recs: List[str] = []
-    if not answers:
+    stats = stats or _answer_stats(answers)
+    if not stats['count']:
         return [
             "Practice a short 2-minute introduction and record it",
             "Review fundamentals of your chosen subject before retrying",
             "Ensure your microphone and environment are set up for clear audio"
         ]
 
-    avg_conf = sum(a.get('analysis', {}).get('confidence_score', 70) for a in answers) / len(answers)
-    avg_clarity = sum(a.get('analysis', {}).get('clarity_score', 70) for a in answers) / len(answers)
-    avg_tech = sum(a.get('analysis', {}).get('technical_accuracy', 70) for a in answers) / len(answers)
-    total_words = sum(len(a.get('transcript', '').split()) for a in answers)
+    avg_conf = stats['avg_confidence']
+    avg_clarity = stats['avg_clarity']
+    avg_tech = stats['avg_technical']
+    total_words = stats['total_words']
 
     if avg_conf < 70:
         recs.append("Practice speaking with steady pace and confident tone (mirror or record yourself)")
@@ -2022,21 +2124,18 @@ def build_recommendations(answers: List[dict]) -> List[str]:
     return recs[:4]
 
 def _fetch_session_detail(session_id: str):
+    db_writer.flush()
     try:
-        conn = get_db_connection()
-        try:
+        with db_reader.timed('session_detail') as conn:
             c = conn.cursor()
-            c.execute('SELECT * FROM interview_sessions WHERE id = ?', (session_id,))
-            session_row = c.fetchone()
+            schema, session_row = fetch_fallthrough(conn, SESSION_ROW_SQL, (session_id,))
             if not session_row:
                 return None
-            c.execute('''SELECT question_number, question_text FROM interview_questions WHERE session_id = ? ORDER BY question_number''', (session_id,))
+            c.execute(f'''SELECT question_number, question_text FROM {schema}.interview_questions WHERE session_id = ? ORDER BY question_number''', (session_id,))
             questions = c.fetchall()
-            c.execute('''SELECT question_id, audio_transcript, filler_words_count, confidence_score, clarity_score, technical_accuracy FROM interview_answers WHERE session_id = ? ORDER BY id''', (session_id,))
+            c.execute(f'''SELECT question_id, audio_transcript, filler_words_count, confidence_score, clarity_score, technical_accuracy FROM {schema}.interview_answers WHERE session_id = ? ORDER BY answer_seq, rowid''', (session_id,))
             answers = c.fetchall()
             return session_row, questions, answers
-        finally:
-            conn.close()
     except Exception as e:
         logger.error(f"❌ Failed fetching session detail {session_id}: {e}")
         return None
@@ -2085,9 +2184,15 @@ def build_completion_payload(session_id: str, interview_data: dict | None = None
             'technicalAccuracy': tech or 0
         })
 
-    overall_conf = round(sum(a['confidenceScore'] for a in answers_list) / max(len(answers_list),1), 1) if answers_list else 0
-    overall_clarity = round(sum(a['clarityScore'] for a in answers_list) / max(len(answers_list),1), 1) if answers_list else 0
-    overall_tech = round(sum(a['technicalAccuracy'] for a in answers_list) / max(len(answers_list),1), 1) if answers_list else 0
+    summary = session_summaries.get(session_id)
+    if summary is not None and summary.answers == len(answers_list):
+        overall_conf = round(summary.average('confidence'), 1)
+        overall_clarity = round(summary.average('clarity'), 1)
+        overall_tech = round(summary.average('technical'), 1)
+    else:
+        overall_conf = round(sum(a['confidenceScore'] for a in answers_list) / max(len(answers_list),1), 1) if answers_list else 0
+        overall_clarity = round(sum(a['clarityScore'] for a in answers_list) / max(len(answers_list),1), 1) if answers_list else 0
+        overall_tech = round(sum(a['technicalAccuracy'] for a in answers_list) / max(len(answers_list),1), 1) if answers_list else 0
     overall_comm = round(((overall_conf + overall_clarity)/2),1) if answers_list else 0
 
     return {
@@ -2118,6 +2223,7 @@ def build_completion_payload(session_id: str, interview_data: dict | None = None
 
 if __name__ == '__main__':
     logger.info("🚀 Starting Interview IQ Server v2.0 (Clean Audio Processing)")
-    logger.info(f"🎤 Whisper model: {'✅ Available' if whisper_model else '❌ Not available'}")
+    logger.info(f"🎤 ASR engine: {ASR_ENGINE} ({'loaded' if backend_registry.is_loaded('whisper') else 'loading in background'})")
     logger.info(f"🤖 AI system: {'✅ Available' if AI_AVAILABLE else '❌ Not available'}")
+    log_startup_report(backend_registry)
     socketio.run(app, debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -1,6 +1,6 @@
 
 from __future__ import annotations
-import os, time, uuid, base64, threading, queue, logging, tempfile, math, re, json
+import os, sys, time, uuid, base64, threading, queue, logging, tempfile, math, re, json, atexit
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 
@@ -9,11 +9,6 @@ from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 import sqlite3
 
-try:
-    from faster_whisper import WhisperModel  # type: ignore
-except Exception as e:  # pragma: no cover
-    raise RuntimeError("faster-whisper not installed. Install via: pip install faster-whisper") from e
-
 try:
     import webrtcvad  # type: ignore
     HAVE_VAD = True
@@ -35,6 +30,25 @@ try:
 except Exception:
     HAVE_AV = False
 
+from speech_timeline import SpeechTimeline, speech_metric_values, aggregate_speech_metrics
+from question_prefetch import question_prefetcher, question_text_of, QUESTION_STREAMING, NEXT_QUESTION_DEADLINE_SEC, STREAM_QUESTION_DEADLINE_SEC
+from question_cache import QuestionStore, question_key, prewarm_keys_from_env
+from llm_gateway import llm_gateway
+from interview_plan import interview_planner
+from question_bank import forget_session as forget_bank_session, preload as preload_question_banks
+from question_dedup import question_deduper
+from db_writer import SQLiteWriter, DB_WRITE_WAIT_SEC
+from db_reader import ReadPool
+from db_schema import migrate, tune_connection
+from session_summary import SessionSummary, SessionSummaryStore, answer_entry, SELECT_SUMMARY_SQL
+from analytics_cache import AnalyticsCache, body_etag
+from session_export import SessionExporter, ExportFilters
+from session_archive import SessionArchiver, fetch_fallthrough, SESSION_ROW_SQL
+from session_registry import SessionRegistry
+from singleflight import question_singleflight
+from timer_scheduler import timer_scheduler
+from backends import backend_registry, timed_import, log_startup_report
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("app_faster")
 
@@ -69,9 +83,10 @@ def _emit_filler_warning(client_id: str, st: "InterviewState", detected_terms: L
             new_terms.append(t)
             wt.last_filler_terms[t] = now
     should_emit = bool(new_terms)
+    cooldown_key = (st.session_id, 'filler_cooldown')
     if not should_emit:
         strong = any(t in STRONG_FILLERS for t in norm_terms)
-        if strong and (now - wt.last_filler_warning) > FILLER_WARNING_COOLDOWN:
+        if strong and not timer_scheduler.pending(cooldown_key):
             should_emit = True
     if should_emit:
         payload = {
@@ -86,6 +101,7 @@ def _emit_filler_warning(client_id: str, st: "InterviewState", detected_terms: L
         socketio.emit('live-warning', payload, to=client_id)
         socketio.emit('filler-detected', payload, to=client_id)
         wt.last_filler_warning = now
+        timer_scheduler.arm(cooldown_key, FILLER_WARNING_COOLDOWN)
         log_event('warning.emit', kind='filler_words', source=source, words=norm_terms, newWords=new_terms)
         return True
     return False
@@ -120,6 +136,8 @@ PARTIAL_MIN_DUR = float(os.getenv('IQ_PARTIAL_MIN_DUR','0.35'))
 PARTIAL_EMIT_INTERVAL = float(os.getenv('IQ_PARTIAL_EMIT_INTERVAL','0.5'))  
 
 FILLER_DEDUP_SEC = float(os.getenv('IQ_FILLER_DEDUP_SEC','2.5'))
+# How long answer-complete waits for the session's own queued segments
+ANSWER_WAIT_SEC = float(os.getenv('IQ_ANSWER_WAIT_SEC','2.0'))
 MIN_SPEECH_ENERGY = float(os.getenv('IQ_MIN_SPEECH_ENERGY','180'))
 
 app = Flask(__name__)
@@ -128,84 +146,63 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 CORS(app)
 
 
-logger.info("Loading faster-whisper streaming model (tiny.en) ...")
-fw_model_fast = WhisperModel("tiny.en", device="cpu", compute_type="int8")
-logger.info("Loaded tiny.en model")
+def _load_faster_whisper(model_name: str):
+    try:
+        faster_whisper = timed_import('faster_whisper')
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("faster-whisper not installed. Install via: pip install faster-whisper") from e
+    logger.info(f"Loading faster-whisper model ({model_name}) ...")
+    return faster_whisper.WhisperModel(model_name, device="cpu", compute_type="int8")
+
+# Models load in the background; the first transcription waits only if warm-up has not finished
+backend_registry.register('fw_fast', lambda: _load_faster_whisper("tiny.en"))
+backend_registry.register('fw_final', lambda: _load_faster_whisper("base.en"))
+backend_registry.warm('fw_fast')
+
+def fast_model():
+    model = backend_registry.get('fw_fast')
+    if model is None:
+        raise RuntimeError("faster-whisper streaming model unavailable")
+    return model
 
 
 FINAL_PASS = False
-fw_model_final = None
 if FINAL_PASS:
-    logger.info("Loading final-pass model (base.en)...")
-    fw_model_final = WhisperModel("base.en", device="cpu", compute_type="int8")
+    backend_registry.warm('fw_final')
 
 
 def get_db_connection(timeout=10.0):
     conn = sqlite3.connect(DB_PATH, timeout=timeout, check_same_thread=False)
-    conn.execute('PRAGMA journal_mode=WAL')
-    return conn
+    return tune_connection(conn)
+
+# All writes go through one writer thread; reads check out a connection from the bounded ReadPool (db_reader)
+db_writer = SQLiteWriter(get_db_connection)
+atexit.register(db_writer.close)
+db_reader = ReadPool(DB_PATH)
+
+def _load_session_summary_row(session_id: str):
+    db_writer.flush()
+    with db_reader.timed('session_summary') as conn:
+        return fetch_fallthrough(conn, SELECT_SUMMARY_SQL, (session_id,))[1]
+
+session_summaries = SessionSummaryStore(db_writer, _load_session_summary_row)
+analytics_cache = AnalyticsCache()
+session_exporter = SessionExporter(DB_PATH)
+session_archiver = SessionArchiver(db_writer)
+atexit.register(session_archiver.stop)
 
 def init_database():
     conn = get_db_connection()
     try:
-        cur = conn.cursor()
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS interview_sessions (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                difficulty TEXT NOT NULL,
-                llm TEXT NOT NULL,
-                interview_type TEXT NOT NULL,
-                persona TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                module_id TEXT NOT NULL,
-                path_id TEXT NOT NULL,
-                start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                end_time TIMESTAMP,
-                total_questions INTEGER DEFAULT 0,
-                completed_questions INTEGER DEFAULT 0,
-                overall_score REAL,
-                status TEXT DEFAULT 'active'
-            )
-        ''')
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS interview_questions (
-                id TEXT PRIMARY KEY,
-                session_id TEXT NOT NULL,
-                question_number INTEGER NOT NULL,
-                question_text TEXT NOT NULL,
-                answer_text TEXT,
-                transcription_result TEXT,
-                analysis_result TEXT,
-                quality_score REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                question_category TEXT DEFAULT 'general',
-                difficulty_level TEXT DEFAULT 'Medium',
-                expected_duration INTEGER DEFAULT 120,
-                FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
-            )
-        ''')
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS interview_answers (
-                id TEXT PRIMARY KEY,
-                session_id TEXT NOT NULL,
-                question_id TEXT,
-                audio_transcript TEXT,
-                answer_duration REAL,
-                filler_words_count INTEGER,
-                confidence_score REAL,
-                clarity_score REAL,
-                technical_accuracy REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
-            )
-        ''')
-        conn.commit()
-        logger.info("✅ Database initialized (streaming)")
+        version = migrate(conn)
+        logger.info(f"✅ Database initialized (streaming, schema v{version})")
     finally:
         conn.close()
 
 init_database()
+session_archiver.start()
+# Built before a forking server starts workers, so they share one copy
+preload_question_banks()
 
 # Optional AI system (reusing simplified agent if present)
 try:
@@ -250,6 +247,7 @@ class AudioSegmentTask:
     segment_id: str
     pcm: bytes  
     started_at: float = field(default_factory=time.time)
+    state: Optional['InterviewState'] = None
 
 @dataclass
 class InterviewState:
@@ -270,14 +268,21 @@ class InterviewState:
     current_pcm_buffer: bytearray = field(default_factory=bytearray)
     last_silence_start: Optional[float] = None
     prefetch: Dict[int, str] = field(default_factory=dict)
+    questions: Dict[int, str] = field(default_factory=dict)
     transcripts: List[str] = field(default_factory=list)
     analyses: List[Dict[str, Any]] = field(default_factory=list)
     last_saved_question_id: Optional[str] = None
    
     raw_answer_pcm: bytearray = field(default_factory=bytearray)
+    # Speech/silence intervals of the current answer, clocked in seconds of audio received
+    speech_timeline: SpeechTimeline = field(default_factory=SpeechTimeline)
+    audio_clock: float = 0.0
     last_partial_emit: float = field(default_factory=lambda: 0.0)
     partial_sequence: int = 0
     finished: bool = False
+    # Segments queued for this session and not yet through the transcription worker
+    pending_segments: int = 0
+    segments_done: threading.Condition = field(default_factory=threading.Condition, repr=False)
 
 
 def analyze_speech_basic(transcript: str) -> Dict[str, Any]:
@@ -298,19 +303,30 @@ def analyze_speech_basic(transcript: str) -> Dict[str, Any]:
         'quality': quality
     }
 
+def _word_count(text: str) -> int:
+    return len(re.findall(r"[a-zA-Z']+", (text or '').lower()))
+
+def _filler_terms(text: str) -> Dict[str, int]:
+    terms: Dict[str,int] = {}
+    for f in FILLER_REGEX.findall((text or '').lower()):
+        k = str(f).lower().strip()
+        terms[k] = terms.get(k,0)+1
+    return terms
+
 def _extended_analytics(answers: List[Dict[str, Any]]) -> Dict[str, Any]:
     total_words = 0
     total_fillers = 0
     filler_breakdown: Dict[str,int] = {}
     for a in answers:
-        tr = (a.get('transcript') or '').lower()
-        words = re.findall(r"[a-zA-Z']+", tr)
-        total_words += len(words)
-        seg_fillers = FILLER_REGEX.findall(tr)
-        total_fillers += len(seg_fillers)
-        for f in seg_fillers:
-            k = f.lower().strip()
-            filler_breakdown[k] = filler_breakdown.get(k,0)+1
+        tr = a.get('transcript') or ''
+        total_words += _word_count(tr)
+        for k, v in _filler_terms(tr).items():
+            total_fillers += v
+            filler_breakdown[k] = filler_breakdown.get(k,0)+v
+    avg_conf = round(sum(a.get('confidenceScore',0) for a in answers)/max(len(answers),1),1) if answers else 0
+    return _extended_feedback(total_words, total_fillers, filler_breakdown, avg_conf)
+
+def _extended_feedback(total_words: int, total_fillers: int, filler_breakdown: Dict[str,int], avg_conf: float) -> Dict[str, Any]:
     ratio = (total_fillers/total_words) if total_words else 0.0
     strengths = []
     improvements = []
@@ -320,7 +336,6 @@ def _extended_analytics(answers: List[Dict[str, Any]]) -> Dict[str, Any]:
     elif ratio > 0.12:
         improvements.append('High filler density — practice concise answers.')
         recommendations.append('Record short mock answers focusing on reducing fillers like um/uh.')
-    avg_conf = round(sum(a.get('confidenceScore',0) for a in answers)/max(len(answers),1),1) if answers else 0
     if avg_conf >= 70:
         strengths.append('Good confidence level across responses.')
     elif avg_conf and avg_conf < 55:
@@ -343,48 +358,104 @@ def _extended_analytics(answers: List[Dict[str, Any]]) -> Dict[str, Any]:
         'overallFeedback': overall_feedback
     }
 
-def build_completion_payload(session_id: str) -> Dict[str, Any]:
-    try:
-        conn = get_db_connection()
+def _completion_rows(session_id: str, with_metrics: bool = True):
+    """Session row, question rows, answer rows and total answer duration, read on one pooled connection.
+    Without metrics only (answer_seq, question_id, transcript) is read per answer."""
+    db_writer.flush()
+    with db_reader.timed('completion_payload') as conn:
         cur = conn.cursor()
-        cur.execute('SELECT * FROM interview_sessions WHERE id=?', (session_id,))
-        session_row = cur.fetchone()
+        # Old completed sessions may have moved to the archive database
+        schema, session_row = fetch_fallthrough(conn, SESSION_ROW_SQL, (session_id,))
         if not session_row:
-            return {'sessionId': session_id, 'message': 'Session not found'}
-        cur.execute('SELECT question_number, question_text FROM interview_questions WHERE session_id=? ORDER BY question_number',(session_id,))
-        questions = [{'questionNumber': r[0], 'questionText': r[1]} for r in cur.fetchall()]
-        cur.execute('''SELECT question_id, audio_transcript, filler_words_count, confidence_score, clarity_score, technical_accuracy
-                       FROM interview_answers WHERE session_id=? ORDER BY id''', (session_id,))
+            return None
+        cur.execute(f'SELECT question_number, question_text FROM {schema}.interview_questions WHERE session_id=? ORDER BY question_number',(session_id,))
+        question_rows = cur.fetchall()
+        if not with_metrics:
+            cur.execute(f'SELECT answer_seq, question_id, audio_transcript FROM {schema}.interview_answers WHERE session_id=? ORDER BY answer_seq, rowid', (session_id,))
+            return session_row, question_rows, cur.fetchall(), 0.0
+        cur.execute(f'''SELECT question_id, audio_transcript, filler_words_count, confidence_score, clarity_score, technical_accuracy,
+                              answer_duration, speaking_time, pause_count, pause_duration, longest_pause
+                       FROM {schema}.interview_answers WHERE session_id=? ORDER BY answer_seq, rowid''', (session_id,))
         answers_rows = cur.fetchall()
-        answers = []
-        total_duration_sec = 0.0
-        for qid, tr, fw, conf, clar, tech in answers_rows:
-            tr_l = (tr or '')
-            per_fillers = FILLER_REGEX.findall(tr_l)
-            per_breakdown: Dict[str,int] = {}
-            for f in per_fillers:
-                k = str(f).lower().strip()
-                per_breakdown[k] = per_breakdown.get(k,0)+1
-            answers.append({
-                'questionId': qid,
-                'transcript': tr_l,
-                'fillerWordsCount': fw or len(per_fillers),
-                'fillerWords': sorted([{ 'word': k, 'count': v } for k,v in per_breakdown.items()], key=lambda x: x['count'], reverse=True),
-                'confidenceScore': conf or 0,
-                'clarityScore': clar or 0,
-                'technicalAccuracy': tech or 0
-            })
-       
         try:
-            cur.execute('SELECT COALESCE(SUM(answer_duration),0) FROM interview_answers WHERE session_id=?', (session_id,))
+            cur.execute(f'SELECT COALESCE(SUM(answer_duration),0) FROM {schema}.interview_answers WHERE session_id=?', (session_id,))
             total_duration_sec = float(cur.fetchone()[0] or 0.0)
         except Exception:
             total_duration_sec = 0.0
-        overall_conf = round(sum(a['confidenceScore'] for a in answers)/max(len(answers),1),1) if answers else 0
-        overall_clarity = round(sum(a['clarityScore'] for a in answers)/max(len(answers),1),1) if answers else 0
-        overall_tech = round(sum(a['technicalAccuracy'] for a in answers)/max(len(answers),1),1) if answers else 0
+    return session_row, question_rows, answers_rows, total_duration_sec
+
+def _answer_payload(qid: str, transcript: str, filler_terms: Dict[str,int], filler_count: int, conf, clar, tech,
+                    dur, spk, pc, pd, lp) -> Dict[str, Any]:
+    return {
+        'questionId': qid,
+        'transcript': transcript,
+        'fillerWordsCount': filler_count or sum(filler_terms.values()),
+        'fillerWords': sorted([{ 'word': k, 'count': v } for k,v in filler_terms.items()], key=lambda x: x['count'], reverse=True),
+        'confidenceScore': conf or 0,
+        'clarityScore': clar or 0,
+        'technicalAccuracy': tech or 0,
+        'duration': round(dur or 0.0, 1),
+        'speakingTime': spk or 0.0,
+        'pauseCount': pc or 0,
+        'pauseDuration': pd or 0.0,
+        'longestPause': lp or 0.0
+    }
+
+def _scanned_answer_metrics(answers_rows) -> Dict[str, Any]:
+    """Per-answer entries and aggregates recomputed from full answer rows (sessions without a summary)"""
+    answers = []
+    speech_rows = []
+    for qid, tr, fw, conf, clar, tech, dur, spk, pc, pd, lp in answers_rows:
+        tr_l = (tr or '')
+        answers.append(_answer_payload(qid, tr_l, _filler_terms(tr_l), fw, conf, clar, tech, dur, spk, pc, pd, lp))
+        speech_rows.append({'speaking_time': spk, 'pause_count': pc, 'pause_duration': pd, 'longest_pause': lp})
+    return {
+        'answers': answers,
+        'confidence': round(sum(a['confidenceScore'] for a in answers)/max(len(answers),1),1) if answers else 0,
+        'clarity': round(sum(a['clarityScore'] for a in answers)/max(len(answers),1),1) if answers else 0,
+        'technical': round(sum(a['technicalAccuracy'] for a in answers)/max(len(answers),1),1) if answers else 0,
+        'extended': _extended_analytics(answers),
+        'speech': aggregate_speech_metrics(speech_rows)
+    }
+
+def _summary_answer_metrics(summary: SessionSummary, transcript_rows) -> Dict[str, Any]:
+    """Same as _scanned_answer_metrics from the session's running sums; only transcripts are read per answer"""
+    answers = []
+    for seq, qid, tr in transcript_rows:
+        e = summary.per_question.get(seq) or {}
+        answers.append(_answer_payload(
+            qid, tr or '', e.get('filler_terms') or {}, e.get('filler_count'), e.get('confidence'), e.get('clarity'), e.get('technical'),
+            e.get('duration'), e.get('speaking_time'), e.get('pause_count'), e.get('pause_duration'), e.get('longest_pause')
+        ))
+    avg_conf = round(summary.average('confidence'), 1)
+    return {
+        'answers': answers,
+        'confidence': avg_conf,
+        'clarity': round(summary.average('clarity'), 1),
+        'technical': round(summary.average('technical'), 1),
+        'extended': _extended_feedback(int(summary.totals['words']), int(summary.totals['fillers']), dict(summary.filler_terms), avg_conf),
+        'speech': summary.speech_metrics()
+    }
+
+def build_completion_payload(session_id: str) -> Dict[str, Any]:
+    try:
+        summary = session_summaries.get(session_id)
+        rows = _completion_rows(session_id, with_metrics=summary is None)
+        if rows is None:
+            return {'sessionId': session_id, 'message': 'Session not found'}
+        session_row, question_rows, answers_rows, total_duration_sec = rows
+        questions = [{'questionNumber': r[0], 'questionText': r[1]} for r in question_rows]
+        if summary is not None:
+            metrics = _summary_answer_metrics(summary, answers_rows)
+            total_duration_sec = summary.totals['duration']
+        else:
+            metrics = _scanned_answer_metrics(answers_rows)
+        answers = metrics['answers']
+        overall_conf = metrics['confidence']
+        overall_clarity = metrics['clarity']
+        overall_tech = metrics['technical']
         overall_comm = round((overall_conf+overall_clarity)/2,1) if answers else 0
-        agg = _extended_analytics(answers)
+        agg = metrics['extended']
         filler_total = agg['aggregate']['fillerWords']
         filler_breakdown = [{ 'word': x['filler'], 'count': x['count'] } for x in agg['aggregate']['fillerBreakdown']]
         def _fmt(sec: float) -> str:
@@ -395,6 +466,7 @@ def build_completion_payload(session_id: str) -> Dict[str, Any]:
         base = {
             'sessionId': session_id,
             'message': 'Interview completed successfully!',
+            'status': session_row[14] or 'active',
             'totalQuestions': session_row[11] or len(questions) or 10,
             'answeredQuestions': len(answers),
             'completedQuestions': len(answers),
@@ -411,6 +483,7 @@ def build_completion_payload(session_id: str) -> Dict[str, Any]:
                 'breakdown': filler_breakdown,
                 'realtime_count': 0
             },
+            'speakingMetrics': metrics['speech'],
             'questions': questions,
             'answers': answers
         }
@@ -419,17 +492,59 @@ def build_completion_payload(session_id: str) -> Dict[str, Any]:
     except Exception as e:  
         logger.error(f"Completion payload failed: {e}")
         return {'sessionId': session_id, 'message': 'Error building completion payload'}
-    finally:
-        try: conn.close()
-        except Exception: pass
+
+def complete_session_row(session_id: str):
+    """Mark the session completed and block until it (and every write queued before it) is committed"""
+    future = db_writer.execute("UPDATE interview_sessions SET end_time=CURRENT_TIMESTAMP, status='completed' WHERE id=?",
+                               (session_id,), label='session.complete')
+    try:
+        future.result(DB_WRITE_WAIT_SEC)
+    except Exception as e:
+        logger.error(f"Completing session {session_id} failed: {e}")
+
+def _state_bytes(st: InterviewState) -> int:
+    """Approximate resident size of a session: buffered PCM plus transcripts, answers and analyses"""
+    size = sys.getsizeof(st) + len(st.current_pcm_buffer) + len(st.raw_answer_pcm) + sys.getsizeof(st.cumulative_transcript)
+    size += sum(sys.getsizeof(t) for t in list(st.transcripts)) + sum(sys.getsizeof(q) for q in list(st.questions.values()))
+    for items in (st.segments, st.answers, st.analyses):
+        size += sys.getsizeof(items) + sum(sys.getsizeof(item) for item in list(items))
+    return size
+
+def _release_session(session_id: str, st: Optional[InterviewState]):
+    question_prefetcher.discard_session(session_id)
+    interview_planner.discard_session(session_id)
+    forget_bank_session(session_id)
+    question_deduper.forget(session_id)
+    session_summaries.forget(session_id)
 
 active_interviews: Dict[str, InterviewState] = {}
-sessions_by_id: Dict[str, InterviewState] = {}
+sessions_by_id = SessionRegistry(_state_bytes, on_evict=_release_session)
 
 
 segment_queue: "queue.Queue[AudioSegmentTask]" = queue.Queue(maxsize=64)
 
 
+def queue_segment(state: InterviewState, client_id: str, segment_id: str, pcm: bytes):
+    """Queue a segment for transcription, counted against its session until the worker is done (raises queue.Full)"""
+    with state.segments_done:
+        state.pending_segments += 1
+    try:
+        segment_queue.put_nowait(AudioSegmentTask(session_id=state.session_id, client_id=client_id, segment_id=segment_id, pcm=pcm, state=state))
+    except queue.Full:
+        segment_finished(state)
+        raise
+
+def segment_finished(state: InterviewState):
+    with state.segments_done:
+        state.pending_segments -= 1
+        state.segments_done.notify_all()
+
+def wait_for_segments(state: InterviewState, timeout: float) -> bool:
+    """Block until this session's queued segments are transcribed (other sessions' work is not waited on)"""
+    with state.segments_done:
+        return state.segments_done.wait_for(lambda: state.pending_segments <= 0, timeout)
+
+
 def transcription_worker():
     while True:
         task: AudioSegmentTask = segment_queue.get()
@@ -439,7 +554,7 @@ def transcription_worker():
             pcm16 = np.frombuffer(task.pcm, dtype=np.int16)
             audio = pcm16.astype('float32') / 32768.0
             # faster-whisper expects either file path or numpy array
-            segments, _info = fw_model_fast.transcribe(audio, language='en', beam_size=1, vad_filter=False)
+            segments, _info = fast_model().transcribe(audio, language='en', beam_size=1, vad_filter=False)
             text_parts = []
             word_list = []
             for seg in segments:
@@ -492,6 +607,8 @@ def transcription_worker():
         except Exception as e:
             logger.error(f"Segment transcription failed: {e}")
         finally:
+            if task.state is not None:
+                segment_finished(task.state)
             segment_queue.task_done()
 
 threading.Thread(target=transcription_worker, daemon=True).start()
@@ -502,7 +619,7 @@ def transcribe_pcm_bytes(pcm: bytes) -> str:
 
     try:
         pcm16 = np.frombuffer(pcm, dtype=np.int16).astype('float32')/32768.0
-        segs, _ = fw_model_fast.transcribe(pcm16, language='en', beam_size=1, vad_filter=False)
+        segs, _ = fast_model().transcribe(pcm16, language='en', beam_size=1, vad_filter=False)
         return ' '.join(s.text.strip() for s in segs if getattr(s, 'text', None)).strip()
     except Exception as e1:
         log_event('transcribe.numpy_error', error=str(e1))
@@ -515,7 +632,7 @@ def transcribe_pcm_bytes(pcm: bytes) -> str:
                 wav_path = wf.name
             sf.write(wav_path, float_audio, SAMPLE_RATE, subtype='PCM_16')
             try:
-                segs, _ = fw_model_fast.transcribe(wav_path, language='en', beam_size=1, vad_filter=False)
+                segs, _ = fast_model().transcribe(wav_path, language='en', beam_size=1, vad_filter=False)
                 return ' '.join(s.text.strip() for s in segs if getattr(s, 'text', None)).strip()
             finally:
                 try:
@@ -605,12 +722,20 @@ def process_incoming_audio(client_id: str, session_id: str, pcm: bytes):
     i = 0
     now = time.time()
     frame_index = 0
+    frame_sec = FRAME_MS / 1000.0
+    timeline = state.speech_timeline
     while i + FRAME_BYTES <= len(pcm):
         frame = pcm[i:i+FRAME_BYTES]
         i += FRAME_BYTES
         is_speech = frame_is_speech(frame)
+        frame_start = state.audio_clock
+        state.audio_clock += frame_sec
         if frame_index % 10 == 0:  
             log_event('vad.frame', idx=frame_index, speech=is_speech, state=state.vad_state, bufMs=round(len(state.current_pcm_buffer)/(2*SAMPLE_RATE)*1000))
+        if is_speech:
+            timeline.speech_start(frame_start)
+        else:
+            timeline.speech_end(frame_start)
         if is_speech:
             state.last_voice_time = time.time()
             wt.last_speech_time = state.last_voice_time
@@ -638,7 +763,7 @@ def process_incoming_audio(client_id: str, session_id: str, pcm: bytes):
                     pcm16_full = np.frombuffer(bytes(state.current_pcm_buffer), dtype=np.int16).astype('float32')/32768.0
                     take_samples = int(min(len(pcm16_full), 1.2 * SAMPLE_RATE))
                     slice_audio = pcm16_full[-take_samples:]
-                    segs, _ = fw_model_fast.transcribe(slice_audio, language='en', beam_size=1, vad_filter=False)
+                    segs, _ = fast_model().transcribe(slice_audio, language='en', beam_size=1, vad_filter=False)
                     partial_text = ' '.join(s.text.strip() for s in segs if s.text).strip()
                     if partial_text:
                         fillers_partial = FILLER_REGEX.findall(partial_text)
@@ -662,6 +787,9 @@ def process_incoming_audio(client_id: str, session_id: str, pcm: bytes):
                 close_current_segment(client_id)
                 state.vad_state = 'silence'
         frame_index += 1
+    if state.is_recording and state.last_voice_time > now:
+        # Heard speech in this chunk: push the silence deadline back (no heap work)
+        arm_silence_timer(client_id, state)
     silence_duration = now - state.last_voice_time
     if state.vad_state == 'silence':
         if silence_duration > PAUSE_HARD_SEC and (now - wt.last_pause_warning_hard) > PAUSE_WARNING_COOLDOWN:
@@ -688,7 +816,7 @@ def close_current_segment(client_id: str):
     segment_id = str(uuid.uuid4())
    
     try:
-        segment_queue.put_nowait(AudioSegmentTask(session_id=state.session_id, client_id=client_id, segment_id=segment_id, pcm=pcm))
+        queue_segment(state, client_id, segment_id, pcm)
     except queue.Full:
         logger.warning("Segment queue full; dropping segment")
 
@@ -697,24 +825,75 @@ def close_current_segment(client_id: str):
 def generate_first_question(module_name: str) -> str:
     return f"Tell me about your experience with {module_name}."
 
-def _pause_monitor_loop():
-    while True:
-        try:
-            now = time.time()
-            for client_id, st in list(active_interviews.items()):
-                if not st.is_recording:
-                    continue
-                wt = st.warning_tracker
-                silence_dur = now - st.last_voice_time
-                if silence_dur >= LONG_PAUSE_THRESHOLD and (now - wt.last_pause_warning_hard) > PAUSE_WARNING_COOLDOWN:
-                    socketio.emit('live-warning', {'type':'long_pause','severity':'hard','message':'You have been silent for a while — continue your answer.'}, to=client_id)
-                    wt.last_pause_warning_hard = now
-                    log_event('pause.monitor.emit', sessionId=st.session_id, silenceSec=round(silence_dur,2))
-        except Exception as e:  
-            log_event('pause.monitor.error', error=str(e))
-        time.sleep(1.0)
-
-threading.Thread(target=_pause_monitor_loop, daemon=True).start()
+def _generate_for_key(key):
+    subject_name, difficulty, _phase, question_number = key
+    return interview_ai.generate_question(difficulty=difficulty, subject=subject_name, persona='professional_man', question_number=question_number, previous_answers=[])
+
+# No pool filling while the LLM circuit is open: generation would only return bank fallbacks
+question_store = QuestionStore(_generate_for_key, paused=lambda: llm_gateway.circuit_open)
+if AI_AVAILABLE:
+    question_store.prewarm(prewarm_keys_from_env(map_subject_id_to_name))
+
+def unique_question(st: InterviewState, question_number: int, text: str) -> str:
+    """Swap a near-duplicate of an earlier question for a pooled or static-bank one (never a new LLM call)."""
+    alternatives = []
+    if AI_AVAILABLE and interview_ai:
+        subject_name = map_subject_id_to_name(st.module_name)
+        if question_store.cacheable(question_number):
+            alternatives.append(lambda: question_text_of(
+                question_store.get(question_key(subject_name, st.difficulty, question_number), list(st.questions.values()))
+            ))
+        # The bank never hands a session the same question twice, so each attempt is a new candidate
+        alternatives.extend([lambda: question_text_of(
+            interview_ai.fallback_question(st.difficulty, subject_name, question_number, st.session_id)
+        )] * 3)
+    chosen = question_deduper.choose(st.session_id, text, alternatives) or text
+    if chosen != text:
+        log_event('question.dedup_replaced', sessionId=st.session_id, questionNumber=question_number)
+    return chosen
+
+def schedule_question(st: InterviewState, question_number: int):
+    """Speculatively generate `question_number` from the answers so far (idempotent per question)."""
+    if not (AI_AVAILABLE and interview_ai) or question_number > st.max_questions:
+        return
+    try:
+        subject_name = map_subject_id_to_name(st.module_name)
+        if question_store.cacheable(question_number):
+            question_prefetcher.schedule(
+                st.session_id, question_number, question_store.get_or_generate,
+                question_key(subject_name, st.difficulty, question_number), list(st.questions.values())
+            )
+        else:
+            # Served from the session plan unless performance has drifted from it
+            latest = st.answers[-1] if st.answers else {}
+            performance = {'confidence_score': latest['confidenceScore']} if latest.get('confidenceScore') is not None else None
+            question_prefetcher.schedule(
+                st.session_id, question_number, interview_planner.next_question,
+                st.session_id, question_number, performance, interview_ai.generate_question,
+                difficulty=st.difficulty, subject=subject_name, persona='professional_man',
+                question_number=question_number, previous_answers=[a.get('transcript', '') for a in st.answers],
+                session_id=st.session_id, streaming=QUESTION_STREAMING
+            )
+        log_event('question.schedule', sessionId=st.session_id, questionNumber=question_number)
+    except Exception as e:
+        logger.warning(f"Could not schedule question {question_number}: {e}")
+
+def arm_silence_timer(client_id: str, st: InterviewState):
+    """Silence deadline for a recording session: pushed back on speech, and by the cooldown after a warning"""
+    deadline = max(st.last_voice_time + LONG_PAUSE_THRESHOLD, st.warning_tracker.last_pause_warning_hard + PAUSE_WARNING_COOLDOWN)
+    timer_scheduler.arm_at((st.session_id, 'silence'), deadline, lambda: _silence_deadline(client_id, st))
+
+def _silence_deadline(client_id: str, st: InterviewState):
+    if active_interviews.get(client_id) is not st or not st.is_recording:
+        return
+    now = time.time()
+    wt = st.warning_tracker
+    silence_dur = now - st.last_voice_time
+    if silence_dur >= LONG_PAUSE_THRESHOLD and (now - wt.last_pause_warning_hard) > PAUSE_WARNING_COOLDOWN:
+        socketio.emit('live-warning', {'type':'long_pause','severity':'hard','message':'You have been silent for a while — continue your answer.'}, to=client_id)
+        wt.last_pause_warning_hard = now
+        log_event('pause.monitor.emit', sessionId=st.session_id, silenceSec=round(silence_dur,2))
+    arm_silence_timer(client_id, st)
 
 
 @socketio.on('connect')
@@ -723,6 +902,20 @@ def on_connect():
     log_event('socket.connect', clientId=client_id)
     emit('connected', {'clientId': client_id})
 
+@socketio.on('disconnect')
+def on_disconnect():
+    client_id = request.sid  # type: ignore[attr-defined]
+    st = active_interviews.pop(client_id, None)
+    log_event('socket.disconnect', clientId=client_id, sessionId=st.session_id if st else None)
+    if st is None:
+        return
+    # Audio of an answer that can no longer be completed; the session itself stays resident until idle eviction
+    st.is_recording = False
+    timer_scheduler.cancel((st.session_id, 'silence'))
+    st.current_pcm_buffer = bytearray()
+    st.raw_answer_pcm = bytearray()
+    sessions_by_id.detach(st.session_id)
+
 @socketio.on('start-interview-session')
 def start_interview_session(data):
     client_id = request.sid  # type: ignore[attr-defined]
@@ -733,23 +926,17 @@ def start_interview_session(data):
     difficulty = config.get('difficulty','Medium')
     log_event('interview.start', clientId=client_id, sessionId=session_id, module=module_name, difficulty=difficulty)
  
-    try:
-        conn = get_db_connection(); cur = conn.cursor()
-        cur.execute('''INSERT INTO interview_sessions (id, difficulty, llm, interview_type, persona, subject, module_id, path_id)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', (
-            session_id,
-            difficulty,
-            config.get('llm','ChatGPT'),
-            config.get('interviewType','general'),
-            config.get('persona','professional_man'),
-            module_name,
-            config.get('moduleId','default'),
-            config.get('pathId','default')
-        ))
-        conn.commit()
-    finally:
-        try: conn.close()
-        except Exception: pass
+    db_writer.execute('''INSERT INTO interview_sessions (id, difficulty, llm, interview_type, persona, subject, module_id, path_id)
+                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', (
+        session_id,
+        difficulty,
+        config.get('llm','ChatGPT'),
+        config.get('interviewType','general'),
+        config.get('persona','professional_man'),
+        module_name,
+        config.get('moduleId','default'),
+        config.get('pathId','default')
+    ), label='session.insert')
     state = InterviewState(session_id=session_id, module_name=module_name, difficulty=difficulty)
     active_interviews[client_id] = state
     sessions_by_id[session_id] = state
@@ -759,7 +946,7 @@ def start_interview_session(data):
     if AI_AVAILABLE and interview_ai:
         try:
             subject_name = map_subject_id_to_name(module_name)
-            qres = interview_ai.generate_question(difficulty=difficulty, subject=subject_name, persona='professional_man', question_number=1, previous_answers=[])
+            qres = question_store.get_or_generate(question_key(subject_name, difficulty, 1))
             if qres and (qres.get('question') or qres.get('question_text')):
                 q1 = qres.get('question') or qres.get('question_text')
         except Exception as e:
@@ -767,20 +954,25 @@ def start_interview_session(data):
     if not q1:
         q1 = generate_first_question(module_name)
     qid = str(uuid.uuid4())
-    try:
-        conn = get_db_connection(); cur = conn.cursor()
-        cur.execute('''INSERT INTO interview_questions (id, session_id, question_number, question_text, question_category, difficulty_level, expected_duration)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)''', (
-            qid, session_id, 1, q1, module_name, difficulty, 120
-        ))
-        conn.commit()
-    finally:
-        try: conn.close()
-        except Exception: pass
+    db_writer.execute('''INSERT INTO interview_questions (id, session_id, question_number, question_text, question_category, difficulty_level, expected_duration)
+                         VALUES (?, ?, ?, ?, ?, ?, ?)''', (
+        qid, session_id, 1, q1, module_name, difficulty, 120
+    ), label='question.insert')
     state.last_saved_question_id = f"q1_{session_id}"
     state.prefetch[1] = q1
+    state.questions[1] = q1
+    question_deduper.add(session_id, q1)
     emit('interview-question', {'questionText': q1, 'questionNumber':1, 'totalQuestions': state.max_questions, 'category': module_name, 'questionId': f"{session_id}_q1"})
     log_event('question.emit', sessionId=session_id, questionNumber=1, chars=len(q1))
+    if AI_AVAILABLE and interview_ai:
+        try:
+            interview_planner.start(
+                session_id, interview_ai.plan_interview, difficulty=difficulty, subject=map_subject_id_to_name(module_name),
+                persona='professional_man', first_question=question_store.max_question_number + 1, total_questions=state.max_questions
+            )
+        except Exception as e:
+            logger.warning(f"Could not start interview plan: {e}")
+    schedule_question(state, 2)
 
 @socketio.on('recording-start')
 def recording_start(data):
@@ -792,13 +984,17 @@ def recording_start(data):
     st.is_recording = True
     st.recording_start_time = time.time()
     now_ts = time.time()
+    st.speech_timeline.reset()
+    st.audio_clock = 0.0
 
     st.warning_tracker.last_speech_time = now_ts
     st.last_voice_time = now_ts
     st.warning_tracker.last_pause_warning_soft = now_ts
     st.warning_tracker.last_pause_warning_hard = now_ts
+    arm_silence_timer(client_id, st)
     emit('recording-started', {'status':'Recording started'})
     log_event('recording.start', sessionId=session_id, clientId=client_id)
+    schedule_question(st, st.current_question + 1)
 
 @socketio.on('recording-stop')
 def recording_stop(data):
@@ -808,6 +1004,8 @@ def recording_stop(data):
         return
     st.is_recording = False
     st.last_recording_stop_time = time.time()
+    timer_scheduler.cancel((st.session_id, 'silence'))
+    st.speech_timeline.close(st.audio_clock)
    
     if st.current_pcm_buffer:
        
@@ -816,7 +1014,7 @@ def recording_stop(data):
             st.current_pcm_buffer.clear()
             segment_id = str(uuid.uuid4())
             try:
-                segment_queue.put_nowait(AudioSegmentTask(session_id=st.session_id, client_id=client_id, segment_id=segment_id, pcm=pcm))
+                queue_segment(st, client_id, segment_id, pcm)
                 log_event('segment.force_flush', segmentId=segment_id, dur=round(len(pcm)/(2*SAMPLE_RATE),3))
             except queue.Full:
                 logger.warning('Segment queue full; dropping forced flush segment')
@@ -852,7 +1050,7 @@ def audio_chunk(data):
     if os.getenv('IQ_DEBUG_DIRECT_TRANSCRIBE','0') == '1':
         try:
             pcm16 = np.frombuffer(pcm, dtype=np.int16).astype('float32')/32768.0
-            segs, _ = fw_model_fast.transcribe(pcm16, language='en', beam_size=1, vad_filter=False)
+            segs, _ = fast_model().transcribe(pcm16, language='en', beam_size=1, vad_filter=False)
             direct_text = ' '.join(s.text.strip() for s in segs if s.text).strip()
             if direct_text:
                 if st.cumulative_transcript:
@@ -915,16 +1113,15 @@ def answer_complete(data):
             st.current_pcm_buffer.clear()
             sid = str(uuid.uuid4())
             try:
-                segment_queue.put_nowait(AudioSegmentTask(session_id=st.session_id, client_id=client_id, segment_id=sid, pcm=pcm))
+                queue_segment(st, client_id, sid, pcm)
                 log_event('segment.force_flush', segmentId=sid, dur=round(len(pcm)/(2*SAMPLE_RATE),3), context='answer_complete')
             except queue.Full:
                 logger.warning('Segment queue full; dropping forced flush (answer_complete)')
         else:
             close_current_segment(client_id)
      
-    deadline = time.time() + 2.0
-    while time.time() < deadline and not segment_queue.empty():
-        time.sleep(0.05)
+    if not wait_for_segments(st, ANSWER_WAIT_SEC):
+        log_event('answer.segments_timeout', sessionId=st.session_id, pending=st.pending_segments)
     transcript = st.cumulative_transcript.strip()
     if not transcript and len(st.raw_answer_pcm) > 0:
         try:
@@ -945,30 +1142,43 @@ def answer_complete(data):
     duration = 0.0
     if st.recording_start_time and st.last_recording_stop_time:
         duration = st.last_recording_stop_time - st.recording_start_time
-    wpm = (len(words)/(duration/60.0)) if duration > 1 else 0
+    st.speech_timeline.close(st.audio_clock)
+    speech_metrics = st.speech_timeline.metrics(len(words))
+    if speech_metrics['words_per_minute']:
+        wpm = speech_metrics['words_per_minute']
+    else:
+        wpm = (len(words)/(duration/60.0)) if duration > 1 else 0
     confidence_score = 70 if words else 40
     clarity_score = 70 - min(20, filler_count*2)
     technical_accuracy = 70
   
     question_id = f"q{st.current_question}_{st.session_id}"
-    try:
-        conn = get_db_connection(); cur = conn.cursor()
-        cur.execute('''INSERT INTO interview_answers (id, session_id, question_id, audio_transcript, answer_duration, filler_words_count, confidence_score, clarity_score, technical_accuracy)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', (
-            str(uuid.uuid4()), st.session_id, question_id, transcript, float(round(duration,2)), filler_count, confidence_score, clarity_score, technical_accuracy
-        ))
-       
-        cur.execute("UPDATE interview_sessions SET completed_questions = COALESCE(completed_questions,0) + 1 WHERE id=?", (st.session_id,))
-        conn.commit()
-    finally:
-        try: conn.close()
-        except Exception: pass
+    entry = answer_entry(
+        confidence=confidence_score, clarity=clarity_score, technical=technical_accuracy,
+        words=_word_count(transcript), filler_terms=_filler_terms(transcript), filler_count=filler_count,
+        duration=round(duration,2), speech=speech_metrics
+    )
+    # Answer row, progress counter and the session's running analytics commit together
+    session_summaries.record(st.session_id, st.current_question, entry, [
+        ('''INSERT INTO interview_answers (id, session_id, question_id, audio_transcript, answer_duration, filler_words_count, confidence_score, clarity_score, technical_accuracy,
+                                           speaking_time, pause_count, pause_duration, longest_pause, answer_seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', (
+            str(uuid.uuid4()), st.session_id, question_id, transcript, float(round(duration,2)), filler_count, confidence_score, clarity_score, technical_accuracy,
+            *speech_metric_values(speech_metrics), st.current_question
+        )),
+        ("UPDATE interview_sessions SET completed_questions = COALESCE(completed_questions,0) + 1 WHERE id=?", (st.session_id,))
+    ])
     st.last_saved_question_id = question_id
+    st.answers.append({'questionNumber': st.current_question, 'transcript': transcript, 'confidenceScore': confidence_score})
     feedback = {
         'scores': {
             'filler_words_count': filler_count,
             'answer_duration': round(duration,1),
             'words_per_minute': round(wpm,1),
+            'speaking_time': speech_metrics['speaking_time'],
+            'pause_count': speech_metrics['pause_count'],
+            'pause_duration': speech_metrics['pause_duration'],
+            'longest_pause': speech_metrics['longest_pause'],
             'filler_density': round(filler_count/max(len(words),1),3),
             'confidence_score': confidence_score,
             'clarity_score': clarity_score,
@@ -981,29 +1191,28 @@ def answer_complete(data):
     log_event('feedback.emit', sessionId=st.session_id, question=st.current_question, fillerWords=filler_count)
     if st.current_question < st.max_questions:
         next_q_number = st.current_question + 1
-        next_q = None
-        if AI_AVAILABLE and interview_ai:
-            try:
-                subject_name = map_subject_id_to_name(st.module_name)
-                qres = interview_ai.generate_question(difficulty=st.difficulty, subject=subject_name, persona='professional_man', question_number=next_q_number, previous_answers=[transcript])
-                if qres and (qres.get('question') or qres.get('question_text')):
-                    next_q = qres.get('question') or qres.get('question_text')
-            except Exception as e:
-                logger.warning(f"AI next question failed: {e}")
+        # Normally generated speculatively at recording-start; waits at most the deadline
+        schedule_question(st, next_q_number)
+        timeout = NEXT_QUESTION_DEADLINE_SEC
+        stream = question_prefetcher.stream(st.session_id, next_q_number)
+        if stream is not None:
+            def _emit_delta(delta, text_so_far, _q=next_q_number):
+                socketio.emit('interview-question-delta', {'delta': delta, 'questionText': text_so_far, 'questionNumber': _q, 'totalQuestions': st.max_questions, 'category': st.module_name, 'questionId': f"{st.session_id}_q{_q}"}, to=client_id)
+            # Still generating: show the words as they arrive and give it longer to finish
+            if stream.attach(_emit_delta):
+                timeout = STREAM_QUESTION_DEADLINE_SEC
+                log_event('question.stream', sessionId=st.session_id, questionNumber=next_q_number)
+        next_q = question_text_of(question_prefetcher.take(st.session_id, next_q_number, timeout))
         if not next_q:
             next_q = f"Describe a challenge related to {st.module_name} (Q{next_q_number})."
+        next_q = unique_question(st, next_q_number, next_q)
         
-        try:
-            conn = get_db_connection(); cur = conn.cursor()
-            cur.execute('''INSERT INTO interview_questions (id, session_id, question_number, question_text, question_category, difficulty_level, expected_duration)
-                           VALUES (?, ?, ?, ?, ?, ?, ?)''', (
-                str(uuid.uuid4()), st.session_id, next_q_number, next_q, st.module_name, st.difficulty, 120
-            ))
-            conn.commit()
-        finally:
-            try: conn.close()
-            except Exception: pass
+        db_writer.execute('''INSERT INTO interview_questions (id, session_id, question_number, question_text, question_category, difficulty_level, expected_duration)
+                             VALUES (?, ?, ?, ?, ?, ?, ?)''', (
+            str(uuid.uuid4()), st.session_id, next_q_number, next_q, st.module_name, st.difficulty, 120
+        ), label='question.insert')
         st.current_question = next_q_number
+        st.questions[next_q_number] = next_q
         emit('interview-question', {
             'questionText': next_q,
             'questionNumber': st.current_question,
@@ -1013,14 +1222,13 @@ def answer_complete(data):
         })
         log_event('question.emit', sessionId=st.session_id, questionNumber=st.current_question, chars=len(next_q))
         st.cumulative_transcript = ""
+        st.speech_timeline.reset()
+        st.audio_clock = 0.0
+        schedule_question(st, next_q_number + 1)
     else:
-        try:
-            conn = get_db_connection(); cur = conn.cursor()
-            cur.execute("UPDATE interview_sessions SET end_time=CURRENT_TIMESTAMP, status='completed' WHERE id=?", (st.session_id,))
-            conn.commit()
-        finally:
-            try: conn.close()
-            except Exception: pass
+        # The completion payload reads everything back, so wait for this (and every earlier write) to commit
+        complete_session_row(st.session_id)
+        sessions_by_id.evict(st.session_id)
         completion = build_completion_payload(st.session_id)
         emit('interview-complete', completion)
         log_event('interview.complete', sessionId=st.session_id, answered=completion.get('answeredQuestions'))
@@ -1035,22 +1243,54 @@ def end_interview(data):
         return
     close_current_segment(client_id)
 
-    try:
-        conn = get_db_connection(); cur = conn.cursor()
-        cur.execute("UPDATE interview_sessions SET end_time=CURRENT_TIMESTAMP, status='completed' WHERE id=?", (st.session_id,))
-        conn.commit()
-    finally:
-        try: conn.close()
-        except Exception: pass
+    complete_session_row(st.session_id)
+    if sessions_by_id.evict(st.session_id) is None:
+        _release_session(st.session_id, st)
     if EMIT_ENDED_EVENT:
         payload = build_completion_payload(st.session_id)
         emit('interview-ended', payload)
         log_event('interview.ended', sessionId=st.session_id, answered=payload.get('answeredQuestions'))
     del active_interviews[client_id]
 
+def etag_response(etag: str, body: bytes):
+    """JSON body with a strong ETag, or a bare 304 when the client already holds this version"""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/api/analytics/<session_id>', methods=['GET'])
 def analytics(session_id: str):
-    return jsonify(build_completion_payload(session_id))
+    cached = analytics_cache.get(session_id)
+    if cached is not None:
+        return etag_response(*cached)
+    generation = analytics_cache.generation(session_id)
+    payload = build_completion_payload(session_id)
+    body = jsonify(payload).get_data()
+    if payload.get('status') == 'completed':
+        etag = analytics_cache.put(session_id, body, generation)
+    else:
+        etag = body_etag(body)
+    return etag_response(etag, body)
+
+@app.route('/api/export/sessions', methods=['GET'])
+def export_sessions():
+    """Bulk NDJSON export, streamed row by row; gzip when asked (?gzip=1) or accepted by the client"""
+    try:
+        filters = ExportFilters.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    use_gzip = request.args.get('gzip') == '1' or 'gzip' in request.accept_encodings
+    db_writer.flush()
+    response = app.response_class(session_exporter.stream(filters, gzip=use_gzip), mimetype='application/x-ndjson')
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/')
 def root():
@@ -1058,10 +1298,11 @@ def root():
 
 @app.route('/health')
 def health():
-    return {'status':'healthy', 'active': len(active_interviews), 'queueSize': segment_queue.qsize()}
+    return {'status':'healthy', 'active': len(active_interviews), 'sessions': sessions_by_id.snapshot(), 'queueSize': segment_queue.qsize(), 'questionPrefetch': question_prefetcher.snapshot(), 'questionCache': question_store.snapshot(), 'interviewPlan': interview_planner.snapshot(), 'questionSingleflight': question_singleflight.snapshot(), 'questionDedup': question_deduper.snapshot(), 'dbWriter': db_writer.snapshot(), 'dbReader': db_reader.snapshot(), 'sessionSummary': session_summaries.snapshot(), 'analyticsCache': analytics_cache.snapshot(), 'sessionExport': session_exporter.snapshot(), 'sessionArchive': session_archiver.snapshot(), 'timers': timer_scheduler.snapshot(), 'llmGateway': llm_gateway.snapshot(), 'llmCircuit': llm_gateway.breaker.state, 'backends': backend_registry.report()}
 
 if __name__ == '__main__':
     port = int(os.getenv('INTERVIEW_IQ_PORT', '5000'))
     logger.info(f'🚀 Starting Streaming Interview Server (faster-whisper + VAD) on port {port}')
     logger.info('➡️  Set INTERVIEW_IQ_PORT=5000 to run on the legacy port expected by your frontend.')
+    log_startup_report(backend_registry)
     socketio.run(app, host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,146 @@
+"""
+Lazy backend registry for heavy optional stacks (ASR models, CrewAI)
+Nothing heavy is imported until the configured engine asks for it; every load is timed
+so startup cost is visible in the logs and on /health
+"""
+
+import os
+import sys
+import time
+import logging
+import importlib
+import threading
+from typing import Dict, List, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+PROCESS_STARTED = time.perf_counter()
+
+# A failed loader is retried by get() after this long (warm() retries right away)
+BACKEND_RETRY_SEC = float(os.getenv('IQ_BACKEND_RETRY_SEC', '60'))
+
+# Modules that are expensive enough to be worth reporting when they show up in sys.modules
+HEAVY_MODULES = ('torch', 'whisper', 'faster_whisper', 'ctranslate2', 'crewai', 'litellm', 'groq', 'numpy')
+
+_import_timings: List[Dict[str, Any]] = []
+_import_lock = threading.Lock()
+
+
+def timed_import(module_name: str):
+    """importlib.import_module that records how long a first import took"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _import_lock:
+        _import_timings.append({'module': module_name, 'ms': round(elapsed_ms, 1), 'thread': threading.current_thread().name})
+    logger.info(f"📦 Imported {module_name} in {elapsed_ms:.0f}ms")
+    return module
+
+
+class BackendRegistry:
+    """Named loaders that succeed at most once, on first use or when warmed in the background;
+    a failed load is retried after a backoff"""
+
+    def __init__(self, retry_sec: float = BACKEND_RETRY_SEC):
+        self.retry_sec = retry_sec
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._load_ms: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str, retry: bool = False) -> Optional[Any]:
+        """Loaded backend, loading it now if needed; None if the loader failed (the error is kept for report()).
+        A failed loader runs again once the backoff has passed, or right away with `retry`."""
+        if name in self._instances:
+            return self._instances[name]
+        with self._lock:
+            loader = self._loaders.get(name)
+            lock = self._locks.get(name)
+        if loader is None or lock is None:
+            raise KeyError(f"Unknown backend: {name}")
+        with lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name in self._errors and not retry and time.monotonic() - self._failed_at[name] < self.retry_sec:
+                return None
+            started = time.perf_counter()
+            try:
+                instance = loader()
+            except Exception as e:
+                self._errors[name] = str(e)
+                self._failed_at[name] = time.monotonic()
+                logger.error(f"❌ Backend {name} failed to load (retry in {self.retry_sec:.0f}s): {e}")
+                return None
+            self._load_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+            self._instances[name] = instance
+            self._errors.pop(name, None)
+            self._failed_at.pop(name, None)
+            logger.info(f"✅ Backend {name} loaded in {self._load_ms[name]:.0f}ms")
+            return instance
+
+    def warm(self, name: str) -> threading.Thread:
+        """Load in the background so startup does not wait; get() blocks only if called before it finishes.
+        Warming a backend that failed earlier retries it without waiting for the backoff."""
+        thread = threading.Thread(target=self.get, args=(name, True), name=f'backend-warm-{name}', daemon=True)
+        thread.start()
+        return thread
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            names = list(self._loaders)
+        backends = {}
+        for name in names:
+            if name in self._instances:
+                state = 'loaded'
+            elif name in self._errors:
+                state = 'failed'
+            elif self._locks[name].locked():
+                state = 'loading'
+            else:
+                state = 'not_loaded'
+            backends[name] = {'state': state, 'load_ms': self._load_ms.get(name), 'error': self._errors.get(name)}
+            if state == 'failed':
+                failed_at = self._failed_at.get(name, 0.0)
+                backends[name]['retry_in'] = round(max(0.0, self.retry_sec - (time.monotonic() - failed_at)), 1)
+        with _import_lock:
+            imports = list(_import_timings)
+        return {
+            'backends': backends,
+            'imports': imports,
+            'heavy_modules_loaded': [m for m in HEAVY_MODULES if m in sys.modules]
+        }
+
+
+def log_startup_report(registry: "BackendRegistry"):
+    """One log block listing what was imported/loaded so far and how long it took"""
+    report = registry.report()
+    logger.info(f"⏱️ Startup in {(time.perf_counter() - PROCESS_STARTED) * 1000:.0f}ms")
+    for entry in sorted(report['imports'], key=lambda e: e['ms'], reverse=True):
+        logger.info(f"   import {entry['module']:<20} {entry['ms']:>8.1f}ms")
+    for name, info in report['backends'].items():
+        timing = f"{info['load_ms']:.1f}ms" if info['load_ms'] is not None else '-'
+        logger.info(f"   backend {name:<19} {info['state']:<10} {timing}")
+    logger.info(f"   heavy modules in memory: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+
+
+backend_registry = BackendRegistry()
+
+
+def _load_interview_crew():
+    return timed_import('ai_agents').get_interview_crew()
+
+
+backend_registry.register('crew', _load_interview_crew)
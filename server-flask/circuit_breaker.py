@@ -0,0 +1,152 @@
+"""
+Circuit breaker for remote dependencies (LLM provider)
+Opens on repeated failures or slow calls so callers fall back instantly, then probes to recover
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Set
+
+CIRCUIT_WINDOW = int(os.getenv('IQ_CIRCUIT_WINDOW', '20'))
+CIRCUIT_MIN_CALLS = int(os.getenv('IQ_CIRCUIT_MIN_CALLS', '5'))
+CIRCUIT_FAILURE_RATE = float(os.getenv('IQ_CIRCUIT_FAILURE_RATE', '0.5'))
+CIRCUIT_CONSECUTIVE_FAILURES = int(os.getenv('IQ_CIRCUIT_CONSECUTIVE_FAILURES', '3'))
+CIRCUIT_SLOW_CALL_SEC = float(os.getenv('IQ_CIRCUIT_SLOW_CALL_SEC', '5.0'))
+CIRCUIT_OPEN_SEC = float(os.getenv('IQ_CIRCUIT_OPEN_SEC', '30'))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv('IQ_CIRCUIT_HALF_OPEN_PROBES', '1'))
+
+# Ticket for calls admitted while closed (probes get positive ones)
+NO_PROBE = 0
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Rolling-window breaker: closed -> open on failures/slow calls -> half-open probes -> closed"""
+
+    def __init__(self, name: str, window: int = CIRCUIT_WINDOW, min_calls: int = CIRCUIT_MIN_CALLS,
+                 failure_rate: float = CIRCUIT_FAILURE_RATE, consecutive_failures: int = CIRCUIT_CONSECUTIVE_FAILURES,
+                 slow_call_sec: float = CIRCUIT_SLOW_CALL_SEC, open_sec: float = CIRCUIT_OPEN_SEC,
+                 half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.consecutive_failures = consecutive_failures
+        self.slow_call_sec = slow_call_sec
+        self.open_sec = open_sec
+        self.half_open_probes = half_open_probes
+        # True = bad outcome (error or slow call)
+        self._outcomes: "deque[bool]" = deque(maxlen=window)
+        self._latencies: "deque[float]" = deque(maxlen=window)
+        self._consecutive = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # Tickets of the half-open probes admitted by allow(); only these decide recovery
+        self._probes: Set[int] = set()
+        self._next_ticket = 0
+        self._lock = threading.Lock()
+        self.stats = {'rejected': 0, 'opened': 0, 'successes': 0, 'failures': 0}
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_sec:
+            self._state = HALF_OPEN
+            self._probes.clear()
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def is_open(self) -> bool:
+        """Cheap pre-check for callers that want to skip straight to their fallback"""
+        return self.state == OPEN
+
+    def allow(self) -> Optional[int]:
+        """Reserve a call and return its ticket (None when rejected); in half-open only a limited
+        number of probes get through. Pass the ticket back to release()/record_*()."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return NO_PROBE
+            if state == HALF_OPEN and len(self._probes) < self.half_open_probes:
+                self._next_ticket += 1
+                self._probes.add(self._next_ticket)
+                return self._next_ticket
+            self.stats['rejected'] += 1
+            return None
+
+    def release(self, ticket: int = NO_PROBE):
+        """Give back a reservation that never reached the dependency"""
+        with self._lock:
+            self._probes.discard(ticket)
+
+    def record_success(self, latency: float, ticket: int = NO_PROBE):
+        slow = latency >= self.slow_call_sec
+        with self._lock:
+            self._latencies.append(latency)
+            if ticket in self._probes:
+                self._probes.discard(ticket)
+                if slow:
+                    self._trip(time.monotonic())
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    self._consecutive = 0
+                self.stats['successes'] += 1
+                return
+            self.stats['successes'] += 1
+            self._record(slow)
+
+    def record_failure(self, latency: Optional[float] = None, ticket: int = NO_PROBE):
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            self.stats['failures'] += 1
+            if ticket in self._probes:
+                self._probes.discard(ticket)
+                self._trip(time.monotonic())
+                return
+            self._record(True)
+
+    def _record(self, bad: bool):
+        self._outcomes.append(bad)
+        self._consecutive = self._consecutive + 1 if bad else 0
+        if self._state != CLOSED:
+            return
+        failures = sum(self._outcomes)
+        if self._consecutive >= self.consecutive_failures or (
+            len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._trip(time.monotonic())
+
+    def _trip(self, now: float):
+        self._state = OPEN
+        self._opened_at = now
+        self._probes.clear()
+        self._consecutive = 0
+        self._outcomes.clear()
+        self.stats['opened'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            latencies = sorted(self._latencies)
+            outcomes = list(self._outcomes)
+            probes = len(self._probes)
+            snap: Dict[str, Any] = dict(self.stats)
+        snap.update({
+            'name': self.name,
+            'state': state,
+            'probes_in_flight': probes,
+            'error_rate': round(sum(outcomes) / len(outcomes), 3) if outcomes else 0.0,
+            'p50_latency': round(latencies[len(latencies) // 2], 3) if latencies else None,
+            'max_latency': round(latencies[-1], 3) if latencies else None,
+            'retry_in': round(max(0.0, self.open_sec - (now - self._opened_at)), 1) if state == OPEN else 0.0
+        })
+        return snap
@@ -0,0 +1,163 @@
+"""
+Bounded pool of read-only SQLite connections
+A fixed set of long-lived `query_only` connections is checked out per group of reads and returned
+afterwards, so hot reads skip connection setup and hit a warm prepared-statement cache, even though
+socket events and HTTP requests each run on a short-lived thread of their own.
+Writes never go through here (see db_writer).
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator, Sequence, Tuple
+
+from db_schema import tune_connection
+
+logger = logging.getLogger(__name__)
+
+DB_READ_TIMEOUT_SEC = float(os.getenv('IQ_DB_READ_TIMEOUT_SEC', '10'))
+DB_READ_CACHED_STATEMENTS = int(os.getenv('IQ_DB_READ_CACHED_STATEMENTS', '256'))
+DB_READ_POOL_SIZE = int(os.getenv('IQ_DB_READ_POOL_SIZE', '8'))
+
+
+class _Timing:
+    __slots__ = ('count', 'total_us', 'max_us')
+
+    def __init__(self):
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def add(self, us: int):
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'avg_us': round(self.total_us / self.count, 1) if self.count else 0.0, 'max_us': self.max_us}
+
+
+class ReadPool:
+    """Up to `size` read-only connections, opened on demand and reused by whichever thread checks one out.
+    Nested `timed()` blocks on one thread share that thread's checked-out connection."""
+
+    def __init__(self, path: str, size: int = DB_READ_POOL_SIZE, timeout: float = DB_READ_TIMEOUT_SEC,
+                 cached_statements: int = DB_READ_CACHED_STATEMENTS):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        # LIFO: the most recently used connection (warmest caches) goes out first
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._open_count = 0
+        self._held = threading.local()
+        self._lock = threading.Lock()
+        self._acquire = _Timing()
+        self._queries: Dict[str, _Timing] = {}
+        self.stats = {'connections_opened': 0, 'connections_closed': 0, 'errors': 0, 'waits': 0, 'timeouts': 0}
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, cached_statements=self.cached_statements,
+                               check_same_thread=False)
+        tune_connection(conn, read_only=True)
+        conn.execute('PRAGMA query_only = ON')
+        with self._lock:
+            self.stats['connections_opened'] += 1
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                grow = self._open_count < self.size
+                if grow:
+                    self._open_count += 1
+                else:
+                    self.stats['waits'] += 1
+            if grow:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._lock:
+                        self._open_count -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.stats['timeouts'] += 1
+                    raise sqlite3.OperationalError(f'read pool exhausted ({self.size} connections busy for {self.timeout:g}s)')
+        elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+        with self._lock:
+            self._acquire.add(elapsed_us)
+        return conn
+
+    def _checkin(self, conn: sqlite3.Connection, broken: bool):
+        if not broken:
+            try:
+                # Never return a connection holding a read transaction: it would pin an old WAL snapshot
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                broken = True
+        if not broken:
+            self._idle.put(conn)
+            return
+        # A failed connection is closed; the next checkout opens a fresh one in its place
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._open_count -= 1
+            self.stats['connections_closed'] += 1
+
+    @contextmanager
+    def timed(self, label: str) -> Iterator[sqlite3.Connection]:
+        """Connection for a group of reads, recorded as one query under `label`"""
+        outer = getattr(self._held, 'conn', None)
+        conn = outer if outer is not None else self._checkout()
+        self._held.conn = conn
+        broken = False
+        started = time.perf_counter()
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            broken = True
+            with self._lock:
+                self.stats['errors'] += 1
+            raise
+        finally:
+            elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+            with self._lock:
+                timing = self._queries.get(label)
+                if timing is None:
+                    timing = self._queries[label] = _Timing()
+                timing.add(elapsed_us)
+            if outer is None:
+                self._held.conn = None
+                self._checkin(conn, broken)
+
+    def fetchone(self, sql: str, params: Sequence[Any] = (), label: Optional[str] = None) -> Optional[Tuple]:
+        with self.timed(label or sql.split(None, 1)[0].lower()) as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = (), label: Optional[str] = None) -> List[Tuple]:
+        with self.timed(label or sql.split(None, 1)[0].lower()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats, size=self.size, open=self._open_count, idle=self._idle.qsize())
+            stats['acquire'] = self._acquire.as_dict()
+            stats['queries'] = {label: t.as_dict() for label, t in self._queries.items()}
+        return stats
@@ -0,0 +1,197 @@
+"""
+Versioned SQLite schema shared by both servers
+Migrations run once per database, in order, each in its own transaction, and are recorded in
+`schema_version`; connection tuning PRAGMAs live here too so every connection gets the same ones.
+"""
+
+import os
+import sqlite3
+import logging
+from typing import List, Callable, Tuple
+
+from speech_timeline import SPEECH_METRIC_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DB_SYNCHRONOUS = os.getenv('IQ_DB_SYNCHRONOUS', 'NORMAL')
+DB_MMAP_BYTES = int(os.getenv('IQ_DB_MMAP_BYTES', str(256 * 1024 * 1024)))
+DB_CACHE_KB = int(os.getenv('IQ_DB_CACHE_KB', '16384'))
+
+
+def tune_connection(conn: sqlite3.Connection, read_only: bool = False) -> sqlite3.Connection:
+    """Per-connection PRAGMAs: WAL with synchronous=NORMAL (no fsync per commit, still crash-safe),
+    memory-mapped reads and a larger page cache"""
+    if not read_only:
+        # Persistent in the file; a query_only connection cannot (and need not) set it
+        conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(f'PRAGMA synchronous={DB_SYNCHRONOUS}')
+    conn.execute(f'PRAGMA mmap_size={DB_MMAP_BYTES}')
+    # Negative cache_size is in KiB rather than pages
+    conn.execute(f'PRAGMA cache_size=-{DB_CACHE_KB}')
+    return conn
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info('{table}')")}
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns):
+    existing = _columns(conn, table)
+    for name, sql_type in columns:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+
+
+def _v1_base_tables(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS interview_sessions (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            difficulty TEXT NOT NULL,
+            llm TEXT NOT NULL,
+            interview_type TEXT NOT NULL,
+            persona TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            module_id TEXT NOT NULL,
+            path_id TEXT NOT NULL,
+            start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            end_time TIMESTAMP,
+            total_questions INTEGER DEFAULT 0,
+            completed_questions INTEGER DEFAULT 0,
+            overall_score REAL,
+            status TEXT DEFAULT 'active'
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS interview_questions (
+            id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            question_number INTEGER NOT NULL,
+            question_text TEXT NOT NULL,
+            answer_text TEXT,
+            transcription_result TEXT,
+            analysis_result TEXT,
+            quality_score REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS interview_answers (
+            id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            question_id TEXT,
+            audio_transcript TEXT,
+            answer_duration REAL,
+            filler_words_count INTEGER,
+            confidence_score REAL,
+            clarity_score REAL,
+            technical_accuracy REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
+        )
+    ''')
+    # Databases created before versioning may be missing the later ad-hoc columns
+    _add_missing_columns(conn, 'interview_questions', (
+        ('question_category', "TEXT DEFAULT 'general'"),
+        ('difficulty_level', "TEXT DEFAULT 'Medium'"),
+        ('expected_duration', 'INTEGER DEFAULT 120'),
+    ))
+    _add_missing_columns(conn, 'interview_answers', SPEECH_METRIC_COLUMNS)
+
+
+def _v2_answer_order(conn: sqlite3.Connection):
+    # Answer ids are random UUIDs, so ORDER BY id never was answer order: use the question number,
+    # parsed from 'q<n>_<session>' for existing rows (insertion order as the fallback)
+    _add_missing_columns(conn, 'interview_answers', (('answer_seq', 'INTEGER'),))
+    conn.execute('''
+        UPDATE interview_answers
+        SET answer_seq = CASE
+            WHEN question_id GLOB 'q[0-9]*_*' THEN CAST(substr(question_id, 2, instr(question_id, '_') - 2) AS INTEGER)
+            ELSE rowid
+        END
+        WHERE answer_seq IS NULL
+    ''')
+
+
+def _v3_session_indexes(conn: sqlite3.Connection):
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_questions_session_number ON interview_questions (session_id, question_number)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_answers_session_seq ON interview_answers (session_id, answer_seq)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_answers_session_question ON interview_answers (session_id, question_id)')
+    conn.execute('ANALYZE')
+
+
+def _v4_session_summary(conn: sqlite3.Connection):
+    # Per-answer analytics entries maintained at answer time; sums are rebuilt in memory (see session_summary.py)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS session_summary (
+            session_id TEXT PRIMARY KEY,
+            answer_count INTEGER NOT NULL DEFAULT 0,
+            per_question TEXT NOT NULL DEFAULT '{}',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
+        )
+    ''')
+
+
+def _v5_export_indexes(conn: sqlite3.Connection):
+    # Keyset pagination for bulk export walks (start_time, id), optionally within one user or status
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_start ON interview_sessions (start_time, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user_start ON interview_sessions (user_id, start_time, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_status_start ON interview_sessions (status, start_time, id)')
+    conn.execute('ANALYZE interview_sessions')
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, 'base tables', _v1_base_tables),
+    (2, 'answer ordering column', _v2_answer_order),
+    (3, 'session lookup indexes', _v3_session_indexes),
+    (4, 'session summary table', _v4_session_summary),
+    (5, 'session export indexes', _v5_export_indexes),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    row = conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()
+    return int(row[0] or 0)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations; safe to call from several processes at once. Returns the schema version."""
+    previous = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        if not conn.execute('SELECT 1 FROM sqlite_master LIMIT 1').fetchone():
+            # auto_vacuum can only be switched for free while the file holds no tables (the archive job relies on it);
+            # existing databases are converted offline: `python session_archive.py enable-incremental-vacuum`
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+        current = schema_version(conn)
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            # IMMEDIATE takes the write lock up front, so a concurrent starter waits and then skips
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,)).fetchone():
+                    conn.execute('ROLLBACK')
+                    current = version
+                    continue
+                apply(conn)
+                conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)', (version, description))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            current = version
+            logger.info(f"🗃️ Applied schema migration {version}: {description}")
+        return current
+    finally:
+        conn.isolation_level = previous
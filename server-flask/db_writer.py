@@ -0,0 +1,319 @@
+"""
+Write-behind SQLite persistence
+One writer thread owns the only writing connection; handlers enqueue write operations and
+the writer applies them in shared transactions (every few ms or N ops), so concurrent
+handlers no longer fight over the database lock or pay an fsync per statement.
+Each operation returns a Future that resolves after its transaction commits, for callers
+that need to read their own writes. Maintenance work that cannot run inside a transaction
+(ATTACH, VACUUM) is queued too and runs on the same connection between batches.
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DB_BATCH_MS = float(os.getenv('IQ_DB_BATCH_MS', '5'))
+DB_BATCH_MAX_OPS = int(os.getenv('IQ_DB_BATCH_MAX_OPS', '64'))
+DB_COMMIT_RETRIES = int(os.getenv('IQ_DB_COMMIT_RETRIES', '3'))
+# How long handlers wait on a write they need to read back before giving up
+DB_WRITE_WAIT_SEC = float(os.getenv('IQ_DB_WRITE_WAIT_SEC', '5'))
+
+Statement = Tuple[str, Sequence[Any]]
+
+
+@dataclass
+class WriteOp:
+    """One atomic unit of work: a list of statements, or a callable given the writer's connection.
+    A barrier op carries neither and just forces the current batch to commit.
+    A standalone op's callable runs alone, outside any transaction, after the batch before it commits."""
+    statements: Tuple[Statement, ...] = ()
+    fn: Optional[Callable[[sqlite3.Connection], Any]] = None
+    label: str = 'write'
+    standalone: bool = False
+    future: Future = field(default_factory=Future)
+    enqueued: float = field(default_factory=time.perf_counter)
+
+    @property
+    def is_barrier(self) -> bool:
+        return not self.statements and self.fn is None
+
+
+class SQLiteWriter:
+    """Single-writer queue in front of a SQLite database"""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], batch_ms: float = DB_BATCH_MS,
+                 batch_max_ops: int = DB_BATCH_MAX_OPS, commit_retries: int = DB_COMMIT_RETRIES):
+        self._connect = connect
+        self.batch_sec = batch_ms / 1000.0
+        self.batch_max_ops = batch_max_ops
+        self.commit_retries = commit_retries
+        self._queue: "queue.Queue[Optional[WriteOp]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'ops': 0, 'failed_ops': 0, 'batches': 0, 'max_batch': 0, 'commit_retries': 0,
+                      'failed_batches': 0, 'reconnects': 0, 'thread_restarts': 0,
+                      'maintenance_ops': 0, 'maintenance_ms_total': 0.0,
+                      'commit_ms_total': 0.0, 'queue_wait_ms_total': 0.0}
+
+    # ---- producer side -------------------------------------------------
+
+    def _submit(self, op: WriteOp) -> Future:
+        if self._closed:
+            # Fail fast: nothing would ever read the queue
+            op.future.set_exception(RuntimeError('SQLite writer is closed'))
+            return op.future
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+        self._queue.put(op)
+        return op.future
+
+    def execute(self, sql: str, params: Sequence[Any] = (), label: str = 'write') -> Future:
+        """Queue one statement; the future resolves to its rowcount once committed"""
+        return self._submit(WriteOp(statements=((sql, tuple(params)),), label=label))
+
+    def execute_group(self, statements: Sequence[Statement], label: str = 'write') -> Future:
+        """Queue statements that must commit together (all or none); resolves to the total rowcount"""
+        return self._submit(WriteOp(statements=tuple((sql, tuple(params)) for sql, params in statements), label=label))
+
+    def call(self, fn: Callable[[sqlite3.Connection], Any], label: str = 'write') -> Future:
+        """Queue a function run on the writer connection inside the batch; resolves to its return value.
+        It must not commit or roll back itself."""
+        return self._submit(WriteOp(fn=fn, label=label))
+
+    def maintenance(self, fn: Callable[[sqlite3.Connection], Any], label: str = 'maintenance') -> Future:
+        """Queue a function run on the writer connection in autocommit mode, outside any batch
+        (for ATTACH, VACUUM, incremental_vacuum). Other writes wait while it runs, so keep it short."""
+        return self._submit(WriteOp(fn=fn, label=label, standalone=True))
+
+    def flush(self, timeout: Optional[float] = DB_WRITE_WAIT_SEC) -> bool:
+        """Wait until everything queued so far is committed. Returns immediately when idle."""
+        if self._thread is None or (self._queue.unfinished_tasks == 0):
+            return True
+        try:
+            self._submit(WriteOp(label='flush')).result(timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"DB flush did not complete: {e}")
+            return False
+
+    def close(self, timeout: float = DB_WRITE_WAIT_SEC):
+        """Commit what is queued and stop the writer thread"""
+        self._closed = True
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    # ---- writer thread -------------------------------------------------
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._thread is not None:
+                logger.error("❌ SQLite writer thread had died; restarting it")
+                with self._stats_lock:
+                    self.stats['thread_restarts'] += 1
+            thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+            thread.start()
+            self._thread = thread
+
+    def _collect(self, first: WriteOp) -> Tuple[List[WriteOp], bool]:
+        """Gather ops until the batch window closes, the batch is full, a barrier or shutdown arrives"""
+        batch = [first]
+        if first.is_barrier or first.standalone:
+            return batch, False
+        deadline = time.perf_counter() + self.batch_sec
+        while len(batch) < self.batch_max_ops:
+            remaining = deadline - time.perf_counter()
+            try:
+                op = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if op is None:
+                self._queue.task_done()
+                return batch, True
+            batch.append(op)
+            if op.is_barrier or op.standalone:
+                break
+        return batch, False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = self._connect()
+        # Explicit transactions only: the writer decides when to BEGIN and COMMIT
+        conn.isolation_level = None
+        return conn
+
+    @staticmethod
+    def _close_quietly(conn: Optional[sqlite3.Connection]):
+        if conn is None:
+            return
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _rollback(conn: sqlite3.Connection):
+        try:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+        except Exception as e:
+            logger.warning(f"DB rollback failed: {e}")
+
+    def _run(self):
+        conn: Optional[sqlite3.Connection] = None
+        stopping = False
+        try:
+            while not stopping:
+                first = self._queue.get()
+                if first is None:
+                    self._queue.task_done()
+                    break
+                batch, stopping = self._collect(first)
+                try:
+                    if conn is None:
+                        conn = self._open()
+                    # A standalone op can only be the last one collected, so order is kept
+                    self._apply(conn, [op for op in batch if not op.standalone])
+                    for op in batch:
+                        if op.standalone:
+                            self._run_standalone(conn, op)
+                except Exception as e:
+                    # Connect, BEGIN or COMMIT failed outside the per-op handling (e.g. a malformed database):
+                    # fail this batch and reconnect for the next one instead of letting the thread die
+                    logger.error(f"❌ DB batch of {len(batch)} ops failed, reconnecting: {e}")
+                    for op in batch:
+                        if not op.future.done():
+                            op.future.set_exception(e)
+                    if conn is not None:
+                        self._rollback(conn)
+                        self._close_quietly(conn)
+                        conn = None
+                        with self._stats_lock:
+                            self.stats['reconnects'] += 1
+                    with self._stats_lock:
+                        self.stats['failed_batches'] += 1
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            self._close_quietly(conn)
+            # Anything still queued after shutdown fails instead of hanging its waiters
+            while True:
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is not None and not op.future.done():
+                    op.future.set_exception(RuntimeError('SQLite writer stopped'))
+                self._queue.task_done()
+
+    def _run_op(self, conn: sqlite3.Connection, op: WriteOp) -> Any:
+        if op.fn is not None:
+            return op.fn(conn)
+        rowcount = 0
+        for sql, params in op.statements:
+            rowcount += max(conn.execute(sql, params).rowcount, 0)
+        return rowcount
+
+    def _run_standalone(self, conn: sqlite3.Connection, op: WriteOp):
+        started = time.perf_counter()
+        try:
+            result = op.fn(conn)
+        except Exception as e:
+            self._rollback(conn)
+            logger.warning(f"DB maintenance '{op.label}' failed: {e}")
+            op.future.set_exception(e)
+        else:
+            op.future.set_result(result)
+        with self._stats_lock:
+            self.stats['maintenance_ops'] += 1
+            self.stats['maintenance_ms_total'] += (time.perf_counter() - started) * 1000
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[WriteOp]):
+        writes = [op for op in batch if not op.is_barrier]
+        outcomes: List[Tuple[WriteOp, bool, Any]] = []
+        started = time.perf_counter()
+        for attempt in range(self.commit_retries + 1):
+            outcomes = []
+            try:
+                if writes:
+                    conn.execute('BEGIN IMMEDIATE')
+                    for op in writes:
+                        # A savepoint per op so one bad statement does not roll back its batch-mates
+                        conn.execute('SAVEPOINT op')
+                        try:
+                            result = self._run_op(conn, op)
+                        except sqlite3.OperationalError as e:
+                            if 'locked' in str(e) or 'busy' in str(e):
+                                raise
+                            conn.execute('ROLLBACK TO op')
+                            outcomes.append((op, False, e))
+                        except Exception as e:
+                            conn.execute('ROLLBACK TO op')
+                            outcomes.append((op, False, e))
+                        else:
+                            outcomes.append((op, True, result))
+                        conn.execute('RELEASE op')
+                    conn.execute('COMMIT')
+                break
+            except sqlite3.OperationalError as e:
+                self._rollback(conn)
+                if attempt >= self.commit_retries:
+                    logger.error(f"❌ DB batch of {len(writes)} ops failed: {e}")
+                    outcomes = [(op, False, e) for op in writes]
+                    break
+                with self._stats_lock:
+                    self.stats['commit_retries'] += 1
+                time.sleep(0.05 * (attempt + 1))
+        finished = time.perf_counter()
+
+        failed = 0
+        queue_wait = 0.0
+        for op, ok, value in outcomes:
+            queue_wait += started - op.enqueued
+            if ok:
+                op.future.set_result(value)
+            else:
+                failed += 1
+                logger.warning(f"DB write '{op.label}' failed: {value}")
+                op.future.set_exception(value)
+        for op in batch:
+            if op.is_barrier:
+                op.future.set_result(None)
+        if writes:
+            with self._stats_lock:
+                self.stats['ops'] += len(writes)
+                self.stats['failed_ops'] += failed
+                self.stats['batches'] += 1
+                self.stats['max_batch'] = max(self.stats['max_batch'], len(writes))
+                self.stats['commit_ms_total'] += (finished - started) * 1000
+                self.stats['queue_wait_ms_total'] += queue_wait * 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        batches = stats['batches']
+        commit_ms = stats.pop('commit_ms_total')
+        queue_wait_ms = stats.pop('queue_wait_ms_total')
+        stats['maintenance_ms'] = round(stats.pop('maintenance_ms_total'), 2)
+        stats.update({
+            'queued': self._queue.qsize(),
+            'running': bool(self._thread and self._thread.is_alive()),
+            'avg_batch': round(stats['ops'] / batches, 2) if batches else 0.0,
+            'avg_commit_ms': round(commit_ms / batches, 2) if batches else 0.0,
+            'avg_queue_wait_ms': round(queue_wait_ms / stats['ops'], 2) if stats['ops'] else 0.0
+        })
+        return stats
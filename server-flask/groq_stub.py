@@ -0,0 +1,246 @@
+"""
+Local Groq-compatible stub for latency and load benchmarking
+Speaks the chat-completions shape the Groq SDK uses (plain and streaming) with configurable
+latency, token throughput, 429 storms and server errors, so gateway pooling, caching and
+fallback behaviour can be measured offline.
+
+Run:     python groq_stub.py --port 8089 --latency lognormal:400:0.5 --tps 250 --rate-limit-prob 0.05
+Point:   GROQ_BASE_URL=http://127.0.0.1:8089 GROQ_API_KEY=stub python app.py
+Stats:   curl http://127.0.0.1:8089/stats
+"""
+
+import os
+import re
+import json
+import math
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any, Iterator
+
+from flask import Flask, Response, request, jsonify
+
+STUB_QUESTIONS = [
+    "Can you explain how you would design {subject} components so they stay easy to test?",
+    "What trade-offs do you consider when choosing between approaches in {subject}?",
+    "Describe a difficult bug you tracked down while working with {subject}.",
+    "How do you keep performance predictable as a {subject} codebase grows?",
+    "What are the most common mistakes you see people make with {subject}?",
+    "How would you explain a core {subject} concept to a new team member?",
+]
+
+
+class LatencyModel:
+    """Time to first token, parsed from 'fixed:MS', 'uniform:LO:HI', 'normal:MEAN:SD' or 'lognormal:MEDIAN:SIGMA'"""
+
+    def __init__(self, spec: str):
+        parts = spec.split(':')
+        self.kind = parts[0]
+        self.args = [float(p) for p in parts[1:]]
+        if self.kind not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'fixed':
+            ms = self.args[0]
+        elif self.kind == 'uniform':
+            ms = rng.uniform(self.args[0], self.args[1])
+        elif self.kind == 'normal':
+            ms = rng.gauss(self.args[0], self.args[1])
+        else:
+            ms = self.args[0] * math.exp(rng.gauss(0.0, self.args[1]))
+        return max(0.0, ms) / 1000.0
+
+
+class StubState:
+    """Fault injection decisions and counters shared by all request threads"""
+
+    def __init__(self, args):
+        self.latency = LatencyModel(args.latency)
+        self.tps = args.tps
+        self.rate_limit_prob = args.rate_limit_prob
+        self.error_prob = args.error_prob
+        self.rpm = args.rpm
+        self.retry_after = args.retry_after
+        # Storms: every `period` seconds, reject everything for `duration` seconds
+        self.storm_period, self.storm_duration = (float(x) for x in args.storm.split(':')) if args.storm else (0.0, 0.0)
+        self.started = time.monotonic()
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.recent: "deque[float]" = deque()
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'ok': 0, 'streamed': 0, 'rate_limited': 0, 'errors': 0,
+                      'max_in_flight': 0, 'completion_tokens': 0}
+
+    def admit(self) -> Optional[str]:
+        """None to serve the request, 'rate_limit' or 'error' to fail it"""
+        now = time.monotonic()
+        with self.lock:
+            self.stats['requests'] += 1
+            while self.recent and now - self.recent[0] > 60.0:
+                self.recent.popleft()
+            in_storm = self.storm_period > 0 and (now - self.started) % self.storm_period < self.storm_duration
+            over_rpm = self.rpm > 0 and len(self.recent) >= self.rpm
+            if in_storm or over_rpm or self.rng.random() < self.rate_limit_prob:
+                self.stats['rate_limited'] += 1
+                return 'rate_limit'
+            if self.rng.random() < self.error_prob:
+                self.stats['errors'] += 1
+                return 'error'
+            self.recent.append(now)
+            self.in_flight += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.in_flight)
+            return None
+
+    def release(self, tokens: int, streamed: bool):
+        with self.lock:
+            self.in_flight -= 1
+            self.stats['ok'] += 1
+            self.stats['completion_tokens'] += tokens
+            if streamed:
+                self.stats['streamed'] += 1
+
+    def first_token_delay(self) -> float:
+        with self.lock:
+            return self.latency.sample(self.rng)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.stats, in_flight=self.in_flight, uptime=round(time.monotonic() - self.started, 1))
+
+
+def _subject_of(messages: List[Dict[str, str]]) -> str:
+    text = ' '.join(m.get('content') or '' for m in messages)
+    match = re.search(r'specializing in ([^.]+)\.', text) or re.search(r'level (.+?) interview', text)
+    return match.group(1).strip() if match else 'software engineering'
+
+
+def _reply_text(messages: List[Dict[str, str]], rng: random.Random) -> str:
+    """Canned but shape-correct content: a JSON plan when one is requested, otherwise a single question"""
+    subject = _subject_of(messages)
+    prompt = (messages[-1].get('content') or '') if messages else ''
+    plan = re.search(r'questions (\d+) to (\d+)', prompt)
+    if 'JSON array' in prompt and plan:
+        first, last = int(plan.group(1)), int(plan.group(2))
+        return json.dumps([
+            {'number': n, 'question': STUB_QUESTIONS[(n + rng.randrange(len(STUB_QUESTIONS))) % len(STUB_QUESTIONS)].format(subject=subject)}
+            for n in range(first, last + 1)
+        ])
+    return rng.choice(STUB_QUESTIONS).format(subject=subject)
+
+
+def _tokens(text: str) -> List[str]:
+    # Word-ish fragments, roughly what a streaming tokenizer sends
+    return re.findall(r'\S+\s*', text) or [text]
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    return {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens}
+
+
+def create_app(state: StubState) -> Flask:
+    app = Flask(__name__)
+
+    def _rate_limited(model: str):
+        body = {'error': {
+            'message': f"Rate limit reached for model `{model}`. Please try again in {state.retry_after}s.",
+            'type': 'tokens', 'code': 'rate_limit_exceeded'
+        }}
+        return jsonify(body), 429, {'retry-after': str(state.retry_after)}
+
+    @app.route('/openai/v1/chat/completions', methods=['POST'])
+    @app.route('/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        payload = request.get_json(force=True, silent=True) or {}
+        model = payload.get('model', 'llama-3.1-8b-instant')
+        messages = payload.get('messages') or []
+        verdict = state.admit()
+        if verdict == 'rate_limit':
+            return _rate_limited(model)
+        if verdict == 'error':
+            return jsonify({'error': {'message': 'Injected upstream failure', 'type': 'internal_server_error'}}), 503
+
+        with state.lock:
+            text = _reply_text(messages, state.rng)
+        max_tokens = int(payload.get('max_tokens') or 1024)
+        fragments = _tokens(text)[:max_tokens]
+        prompt_tokens = sum(len(m.get('content') or '') for m in messages) // 4
+        per_token = 1.0 / state.tps if state.tps > 0 else 0.0
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        delay = state.first_token_delay()
+
+        if payload.get('stream'):
+            sent = [0]
+
+            def generate() -> Iterator[str]:
+                time.sleep(delay)
+                for i, fragment in enumerate(fragments):
+                    if i:
+                        time.sleep(per_token)
+                    chunk = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                             'choices': [{'index': 0, 'delta': {'content': fragment}, 'finish_reason': None}]}
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    sent[0] += 1
+                final = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                         'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                         'x_groq': {'id': completion_id, 'usage': _usage(prompt_tokens, len(fragments))}}
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            # Released when the server closes the response, even if the client left before the
+            # generator ever started (its finally would never run)
+            response = Response(generate(), mimetype='text/event-stream')
+            response.call_on_close(lambda: state.release(sent[0], streamed=True))
+            return response
+
+        try:
+            time.sleep(delay + per_token * max(0, len(fragments) - 1))
+        finally:
+            state.release(len(fragments), streamed=False)
+        return jsonify({
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ''.join(fragments)}, 'finish_reason': 'stop'}],
+            'usage': _usage(prompt_tokens, len(fragments))
+        })
+
+    @app.route('/stats')
+    def stats():
+        return state.snapshot()
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Groq-compatible chat-completions stub')
+    parser.add_argument('--host', default=os.getenv('GROQ_STUB_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('GROQ_STUB_PORT', '8089')))
+    parser.add_argument('--latency', default=os.getenv('GROQ_STUB_LATENCY', 'lognormal:300:0.4'),
+                        help="time to first token: fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument('--tps', type=float, default=float(os.getenv('GROQ_STUB_TPS', '300')),
+                        help='completion tokens per second (0 = instant)')
+    parser.add_argument('--rate-limit-prob', type=float, default=float(os.getenv('GROQ_STUB_RATE_LIMIT_PROB', '0')))
+    parser.add_argument('--error-prob', type=float, default=float(os.getenv('GROQ_STUB_ERROR_PROB', '0')),
+                        help='probability of an injected 503')
+    parser.add_argument('--rpm', type=int, default=int(os.getenv('GROQ_STUB_RPM', '0')),
+                        help='enforce a real requests-per-minute limit (0 = off)')
+    parser.add_argument('--storm', default=os.getenv('GROQ_STUB_STORM', ''),
+                        help='PERIOD:DURATION seconds, e.g. 60:10 rejects everything for 10s of every minute')
+    parser.add_argument('--retry-after', type=float, default=float(os.getenv('GROQ_STUB_RETRY_AFTER', '2')))
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(StubState(args))
+    print(f"Groq stub listening on http://{args.host}:{args.port} (set GROQ_BASE_URL to this address)")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
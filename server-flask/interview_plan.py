@@ -0,0 +1,138 @@
+"""
+Per-session interview plans
+The phased question plan (introduction -> core -> practical -> advanced) is generated in one
+LLM call at session start; individual questions are only regenerated when the candidate's
+performance drifts away from what the plan assumed
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from typing import Dict, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+INTERVIEW_PLAN_ENABLED = os.getenv('IQ_INTERVIEW_PLAN', '1') == '1'
+PLAN_WORKERS = int(os.getenv('IQ_PLAN_WORKERS', '2'))
+# How long a question worker waits for a plan that is still being generated
+PLAN_WAIT_SEC = float(os.getenv('IQ_PLAN_WAIT_SEC', '3.0'))
+# Same confidence bands the single-question prompt uses for its performance note
+PLAN_LOW_CONFIDENCE = float(os.getenv('IQ_PLAN_LOW_CONFIDENCE', '60'))
+PLAN_HIGH_CONFIDENCE = float(os.getenv('IQ_PLAN_HIGH_CONFIDENCE', '85'))
+
+
+def performance_band(performance_metrics: Optional[Dict[str, float]]) -> str:
+    if not performance_metrics or performance_metrics.get('confidence_score') is None:
+        return 'steady'
+    confidence = float(performance_metrics['confidence_score'])
+    if confidence < PLAN_LOW_CONFIDENCE:
+        return 'struggling'
+    if confidence > PLAN_HIGH_CONFIDENCE:
+        return 'strong'
+    return 'steady'
+
+
+def parse_plan(text: str, first_question: int, total_questions: int) -> Dict[int, str]:
+    """Question number -> text from the model's JSON reply (tolerates code fences and surrounding prose)"""
+    if not text:
+        return {}
+    match = re.search(r'\[.*\]', text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        items = json.loads(match.group(0))
+    except (TypeError, ValueError):
+        return {}
+    plan: Dict[int, str] = {}
+    expected = first_question
+    for item in items:
+        if isinstance(item, dict):
+            number = item.get('number', expected)
+            question = item.get('question')
+        else:
+            number, question = expected, item
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            number = expected
+        if isinstance(question, str) and len(question.strip()) > 10 and first_question <= number <= total_questions:
+            plan.setdefault(number, question.strip())
+        expected = number + 1
+    return plan
+
+
+class InterviewPlanner:
+    """One plan future per session; question workers consult it before calling the LLM"""
+
+    def __init__(self, max_workers: int = PLAN_WORKERS, wait: float = PLAN_WAIT_SEC):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='interview-plan')
+        self._plans: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.wait = wait
+        self.stats = {'plans': 0, 'failed': 0, 'planned': 0, 'adapted': 0, 'unplanned': 0}
+
+    def start(self, session_id: str, fn: Callable[..., Optional[Dict[int, Dict[str, Any]]]], *args, **kwargs) -> Optional[Future]:
+        if not INTERVIEW_PLAN_ENABLED:
+            return None
+        with self._lock:
+            existing = self._plans.get(session_id)
+            if existing is not None:
+                return existing
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._plans[session_id] = future
+            self.stats['plans'] += 1
+        return future
+
+    def planned(self, session_id: str, question_number: int,
+                performance_metrics: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+        """The planned question, or None when there is no plan or the candidate has diverged from it"""
+        with self._lock:
+            future = self._plans.get(session_id)
+        if future is None:
+            return None
+        try:
+            plan = future.result(timeout=self.wait) or {}
+        except FutureTimeout:
+            logger.warning(f"⏱️ Interview plan for {session_id} not ready, generating Q{question_number} directly")
+            return None
+        except Exception as e:
+            logger.warning(f"Interview plan failed for {session_id}: {e}")
+            self.stats['failed'] += 1
+            with self._lock:
+                self._plans.pop(session_id, None)
+            return None
+        question = plan.get(question_number)
+        if question is None:
+            self.stats['unplanned'] += 1
+            return None
+        if performance_band(performance_metrics) != 'steady':
+            self.stats['adapted'] += 1
+            return None
+        self.stats['planned'] += 1
+        return dict(question)
+
+    def next_question(self, session_id: str, question_number: int,
+                      performance_metrics: Optional[Dict[str, float]],
+                      generate: Callable[..., Optional[Dict[str, Any]]], **kwargs) -> Optional[Dict[str, Any]]:
+        """Planned question when on track, otherwise `generate(**kwargs, performance_metrics=...)`"""
+        question = self.planned(session_id, question_number, performance_metrics)
+        if question is not None:
+            return question
+        return generate(performance_metrics=performance_metrics, **kwargs)
+
+    def discard_session(self, session_id: str):
+        with self._lock:
+            future = self._plans.pop(session_id, None)
+        if future is not None:
+            future.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            active = len(self._plans)
+        return dict(self.stats, active=active)
+
+
+interview_planner = InterviewPlanner()
@@ -0,0 +1,201 @@
+"""
+Precompiled keyword matching for technical evaluation
+Aho-Corasick automata built once per subject vocabulary, with atomic hot-reload
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+VOCAB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vocab')
+VOCAB_RELOAD_CHECK_SEC = float(os.getenv('IQ_VOCAB_RELOAD_SEC', '5.0'))
+
+
+class KeywordHit(NamedTuple):
+    term: str
+    tier: str
+    start: int
+    end: int
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a tiered keyword vocabulary (case-insensitive substring match)"""
+
+    def __init__(self, tiers: Dict[str, List[str]]):
+        self.tiers = list(tiers.keys())
+        # term_id -> (original term, tier, vocabulary order)
+        self._terms: List[tuple] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        seen = set()
+        for tier, terms in tiers.items():
+            for term in terms:
+                key = term.lower()
+                if not key or (tier, key) in seen:
+                    continue
+                seen.add((tier, key))
+                self._add(key, len(self._terms))
+                self._terms.append((term, tier, len(self._terms)))
+        self._build_failure_links()
+
+    def _add(self, key: str, term_id: int):
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(term_id)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def scan(self, text: str) -> List[KeywordHit]:
+        """Return every keyword occurrence in a single pass over the text"""
+        hits: List[KeywordHit] = []
+        if not text or not self._terms:
+            return hits
+        goto, fail, out, terms = self._goto, self._fail, self._out, self._terms
+        node = 0
+        for i, ch in enumerate(text.lower()):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for term_id in out[node]:
+                term, tier, _ = terms[term_id]
+                hits.append(KeywordHit(term, tier, i - len(term) + 1, i + 1))
+        return hits
+
+    def find_terms(self, text: str) -> Dict[str, List[str]]:
+        """Distinct matched terms grouped by tier, in vocabulary order"""
+        found: Dict[str, Dict[int, str]] = {tier: {} for tier in self.tiers}
+        if not text or not self._terms:
+            return {tier: [] for tier in self.tiers}
+        goto, fail, out, terms = self._goto, self._fail, self._out, self._terms
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for term_id in out[node]:
+                term, tier, order = terms[term_id]
+                found[tier][order] = term
+        return {tier: [hits[k] for k in sorted(hits)] for tier, hits in found.items()}
+
+    def tier_counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct terms matched per tier"""
+        return {tier: len(terms) for tier, terms in self.find_terms(text).items()}
+
+
+class VocabularyMatcher:
+    """Per-subject automata compiled from a vocabulary file, rebuilt atomically when the file changes"""
+
+    def __init__(self, filename: str, default_subject: str = "general"):
+        self.path = filename if os.path.isabs(filename) else os.path.join(VOCAB_DIR, filename)
+        self.default_subject = default_subject
+        self._automata: Dict[str, KeywordAutomaton] = {}
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _load(self) -> Dict[str, Dict[str, List[str]]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        vocab: Dict[str, Dict[str, List[str]]] = {}
+        for subject, tiers in data.items():
+            # A flat list is a single-tier vocabulary
+            if isinstance(tiers, list):
+                tiers = {"default": tiers}
+            vocab[subject] = {tier: [str(t) for t in terms] for tier, terms in tiers.items()}
+        return vocab
+
+    def reload(self) -> bool:
+        """Recompile every subject automaton and swap them in; keeps the old set if the file is invalid"""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+                vocab = self._load()
+                started = time.perf_counter()
+                automata = {subject: KeywordAutomaton(tiers) for subject, tiers in vocab.items()}
+            except Exception as e:
+                logger.warning(f"⚠️ Could not load vocabulary {self.path}: {e}")
+                return False
+            self._automata = automata
+            self._mtime = mtime
+            terms = sum(len(a) for a in automata.values())
+            logger.info(f"✅ Compiled {terms} keywords for {len(automata)} subjects from {os.path.basename(self.path)} "
+                        f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+            return True
+
+    def _maybe_reload(self):
+        now = time.time()
+        if now - self._last_check < VOCAB_RELOAD_CHECK_SEC:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def get(self, subject: str) -> KeywordAutomaton:
+        self._maybe_reload()
+        automata = self._automata
+        automaton = automata.get(subject) or automata.get(self.default_subject)
+        if automaton is None:
+            return KeywordAutomaton({})
+        return automaton
+
+    def subjects(self) -> List[str]:
+        return list(self._automata.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'subjects': {subject: len(a) for subject, a in self._automata.items()},
+            'mtime': self._mtime
+        }
+
+
+_matchers: Dict[str, VocabularyMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_vocabulary_matcher(filename: str) -> VocabularyMatcher:
+    """Shared matcher per vocabulary file so every evaluator instance reuses the compiled automata"""
+    matcher = _matchers.get(filename)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(filename)
+            if matcher is None:
+                matcher = VocabularyMatcher(filename)
+                _matchers[filename] = matcher
+    return matcher
@@ -0,0 +1,314 @@
+"""
+Shared LLM gateway for Groq chat completions
+One pooled client per process, a global requests/tokens-per-minute limiter and a bounded
+number of in-flight calls. Callers get futures with deadlines instead of sleeping on 429s.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional, Any, Callable
+
+from circuit_breaker import CircuitBreaker, NO_PROBE
+
+logger = logging.getLogger(__name__)
+
+GROQ_MODEL = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
+GROQ_RPM = float(os.getenv('GROQ_RPM', '30'))
+GROQ_TPM = float(os.getenv('GROQ_TPM', '6000'))
+GROQ_MAX_IN_FLIGHT = int(os.getenv('GROQ_MAX_IN_FLIGHT', '4'))
+GROQ_TIMEOUT_SEC = float(os.getenv('GROQ_TIMEOUT_SEC', '10'))
+GROQ_DEFAULT_DEADLINE_SEC = float(os.getenv('GROQ_DEADLINE_SEC', '8'))
+GROQ_MAX_ATTEMPTS = int(os.getenv('GROQ_MAX_ATTEMPTS', '3'))
+# Alternative endpoint, e.g. the local stub (python groq_stub.py) for offline benchmarking
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL') or None
+
+
+class LLMError(Exception):
+    """Base class for gateway failures"""
+
+
+class LLMUnavailable(LLMError):
+    """No client configured (missing SDK or API key)"""
+
+
+class LLMCircuitOpen(LLMUnavailable):
+    """Provider circuit is open; callers should use their fallback right away"""
+
+
+class LLMDeadlineExceeded(LLMError):
+    """The call could not be completed before its deadline"""
+
+
+class LLMRateLimited(LLMError):
+    """Provider kept returning 429 until the deadline"""
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Rough prompt size (~4 chars per token) plus the completion budget"""
+    chars = sum(len(m.get('content') or '') for m in messages)
+    return chars // 4 + max_tokens
+
+
+class RateLimiter:
+    """Token buckets for requests/minute and tokens/minute shared by every caller in the process"""
+
+    def __init__(self, rpm: float = GROQ_RPM, tpm: float = GROQ_TPM):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = rpm
+        self._tokens = tpm
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens: int, deadline: float) -> bool:
+        """Block the calling (gateway worker) thread until both buckets allow the call, or the deadline passes"""
+        tokens = min(tokens, int(self.tpm))
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60.0 / self.rpm)
+                if self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60.0 / self.tpm)
+                if wait <= 0:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return True
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def settle(self, estimated: int, actual: Optional[int]):
+        """Correct the token bucket with the usage the provider reported"""
+        if actual is None:
+            return
+        with self._lock:
+            self._tokens = min(self.tpm, self._tokens + estimated - actual)
+
+    def penalize(self, seconds: float):
+        """Provider said back off: hold every caller, not just the one that got the 429"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'requests_available': round(self._requests, 2),
+                'tokens_available': int(self._tokens),
+                'blocked_for': round(max(0.0, self._blocked_until - time.monotonic()), 2)
+            }
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    text = str(error)
+    match = re.search(r'try again in (\d+\.?\d*)s', text)
+    if match:
+        return float(match.group(1))
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    text = str(error)
+    return 'rate_limit_exceeded' in text or '429' in text
+
+
+class LLMGateway:
+    """Process-wide entry point for chat completions"""
+
+    def __init__(self, max_in_flight: int = GROQ_MAX_IN_FLIGHT, limiter: Optional[RateLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.max_in_flight = max_in_flight
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker('groq')
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='llm-gateway')
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'calls': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0, 'deadline_exceeded': 0, 'queued': 0,
+                      'short_circuited': 0}
+
+    @property
+    def available(self) -> bool:
+        return bool(os.getenv('GROQ_API_KEY')) and self._get_client() is not None
+
+    @property
+    def circuit_open(self) -> bool:
+        return self.breaker.is_open()
+
+    def _get_client(self):
+        if self._client is not None:
+            return self._client
+        with self._client_lock:
+            if self._client is not None:
+                return self._client
+            if not os.getenv('GROQ_API_KEY'):
+                return None
+            try:
+                from groq import Groq
+            except ImportError:
+                logger.warning("Groq SDK not installed, LLM gateway disabled")
+                return None
+            kwargs: Dict[str, Any] = {
+                'api_key': os.getenv('GROQ_API_KEY'),
+                # Retries and backoff are handled here, against the shared limiter
+                'max_retries': 0,
+                'timeout': GROQ_TIMEOUT_SEC
+            }
+            if GROQ_BASE_URL:
+                kwargs['base_url'] = GROQ_BASE_URL
+                logger.info(f"LLM gateway using Groq endpoint {GROQ_BASE_URL}")
+            try:
+                import httpx
+                kwargs['http_client'] = httpx.Client(
+                    limits=httpx.Limits(max_connections=self.max_in_flight,
+                                        max_keepalive_connections=self.max_in_flight),
+                    timeout=GROQ_TIMEOUT_SEC
+                )
+            except ImportError:
+                pass
+            self._client = Groq(**kwargs)
+            return self._client
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def submit(self, messages: List[Dict[str, str]], model: str = GROQ_MODEL, max_tokens: int = 256,
+               temperature: float = 0.7, deadline: Optional[float] = None,
+               on_delta: Optional[Callable[[str], None]] = None) -> Future:
+        """Queue a chat completion; the future resolves to the completion text or raises an LLMError.
+        With `on_delta` the provider's streaming API is used and each text fragment is passed on as it arrives."""
+        timeout = GROQ_DEFAULT_DEADLINE_SEC if deadline is None else deadline
+        expires = time.monotonic() + timeout
+        ticket = self.breaker.allow()
+        if ticket is None:
+            self._count('short_circuited')
+            future: Future = Future()
+            future.set_exception(LLMCircuitOpen("Groq circuit open"))
+            return future
+        self._count('queued')
+        try:
+            future = self._executor.submit(self._guarded_call, messages, model, max_tokens, temperature, expires,
+                                           on_delta, ticket)
+        except Exception:
+            self.breaker.release(ticket)
+            raise
+        # Cancelled while still queued: _guarded_call never runs, so give the reservation back here
+        future.add_done_callback(lambda f: f.cancelled() and self.breaker.release(ticket))
+        return future
+
+    def _guarded_call(self, messages, model, max_tokens, temperature, expires: float, on_delta=None,
+                      ticket: int = NO_PROBE) -> str:
+        """Feed provider outcomes (errors, 429 exhaustion, latency) into the circuit breaker"""
+        started = time.monotonic()
+        try:
+            result = self._call(messages, model, max_tokens, temperature, expires, on_delta)
+        except (LLMUnavailable, LLMDeadlineExceeded):
+            # Local conditions (no client, limiter budget), not evidence about the provider
+            self.breaker.release(ticket)
+            raise
+        except Exception:
+            self.breaker.record_failure(time.monotonic() - started, ticket)
+            raise
+        self.breaker.record_success(time.monotonic() - started, ticket)
+        return result
+
+    def chat(self, messages: List[Dict[str, str]], model: str = GROQ_MODEL, max_tokens: int = 256,
+             temperature: float = 0.7, deadline: Optional[float] = None,
+             on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Blocking convenience wrapper around submit() that never waits past the deadline"""
+        timeout = GROQ_DEFAULT_DEADLINE_SEC if deadline is None else deadline
+        future = self.submit(messages, model, max_tokens, temperature, timeout, on_delta)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            self._count('deadline_exceeded')
+            raise LLMDeadlineExceeded(f"LLM call exceeded {timeout}s deadline")
+
+    def _call(self, messages, model, max_tokens, temperature, expires: float, on_delta=None) -> str:
+        client = self._get_client()
+        if client is None:
+            raise LLMUnavailable("Groq client not configured")
+        estimated = estimate_tokens(messages, max_tokens)
+        last_error: Optional[Exception] = None
+        for attempt in range(GROQ_MAX_ATTEMPTS):
+            if not self.limiter.acquire(estimated, expires):
+                self._count('deadline_exceeded')
+                raise LLMDeadlineExceeded("Rate limit budget not available before deadline")
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                self._count('deadline_exceeded')
+                raise LLMDeadlineExceeded("Deadline passed while queued")
+            self._count('calls')
+            streamed: List[str] = []
+            try:
+                response = client.with_options(timeout=min(GROQ_TIMEOUT_SEC, remaining)).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **({'stream': True} if on_delta else {})
+                )
+                if on_delta:
+                    usage = None
+                    for chunk in response:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            streamed.append(delta)
+                            on_delta(delta)
+                        # Groq reports usage on the final chunk
+                        x_groq = getattr(chunk, 'x_groq', None)
+                        usage = getattr(x_groq, 'usage', None) or usage
+                    self.limiter.settle(estimated, getattr(usage, 'total_tokens', None))
+                    self._count('ok')
+                    return ''.join(streamed).strip()
+            except Exception as e:
+                last_error = e
+                # Text already sent to the listener cannot be retracted, so only retry before the first fragment
+                if _is_rate_limit(e) and not streamed:
+                    self._count('rate_limited')
+                    wait = _retry_after(e) or float(2 ** attempt)
+                    logger.warning(f"Groq rate limited (attempt {attempt + 1}/{GROQ_MAX_ATTEMPTS}), backing off {wait}s")
+                    self.limiter.penalize(wait)
+                    continue
+                self._count('errors')
+                raise
+            usage = getattr(response, 'usage', None)
+            self.limiter.settle(estimated, getattr(usage, 'total_tokens', None))
+            self._count('ok')
+            return (response.choices[0].message.content or '').strip()
+        raise LLMRateLimited(str(last_error))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['max_in_flight'] = self.max_in_flight
+        stats['base_url'] = GROQ_BASE_URL or 'default'
+        stats['limiter'] = self.limiter.snapshot()
+        stats['circuit'] = self.breaker.snapshot()
+        return stats
+
+
+llm_gateway = LLMGateway()
@@ -0,0 +1,175 @@
+"""
+Static question banks loaded once from data/question_banks.json
+Each bank is indexed by (subject, difficulty, category) into one flat tuple of questions, so a
+bucket is just a (start, count) slice and a session's asked questions fit in an int bitset.
+Never mutated after construction. The apps call preload() at import time, so a server that
+forks workers after importing the app builds the banks once in the parent and the workers start
+from those copy-on-write pages instead of each parsing the JSON; without a preload they are built
+lazily on first use.
+"""
+
+import os
+import json
+import random
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUESTION_BANK_PATH = os.getenv(
+    'IQ_QUESTION_BANK_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'question_banks.json')
+)
+# Sessions whose asked-question bitsets are remembered per bank
+QUESTION_BANK_MAX_SESSIONS = int(os.getenv('IQ_QUESTION_BANK_MAX_SESSIONS', '1024'))
+
+BankKey = Tuple[str, str, str]
+
+
+class QuestionBank:
+    """Read-only (subject, difficulty, category) index with per-session no-repeat sampling"""
+
+    def __init__(self, name: str, tree: Dict[str, Dict[str, Dict[str, List[str]]]],
+                 max_sessions: int = QUESTION_BANK_MAX_SESSIONS):
+        self.name = name
+        texts: List[str] = []
+        self._buckets: Dict[BankKey, Tuple[int, int]] = {}
+        self._categories: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self._difficulties: Dict[str, Tuple[str, ...]] = {}
+        for subject, difficulties in tree.items():
+            self._difficulties[subject] = tuple(difficulties)
+            for difficulty, categories in difficulties.items():
+                self._categories[(subject, difficulty)] = tuple(categories)
+                for category, questions in categories.items():
+                    self._buckets[(subject, difficulty, category)] = (len(texts), len(questions))
+                    texts.extend(questions)
+        self._texts: Tuple[str, ...] = tuple(texts)
+        # session_id -> bitset of question ids already served, least recently used first
+        self._seen: "OrderedDict[str, int]" = OrderedDict()
+        self._max_sessions = max_sessions
+        # question text -> bitset of its ids, for mark_seen()
+        self._ids_by_text: Dict[str, int] = {}
+        for i, text in enumerate(self._texts):
+            self._ids_by_text[text] = self._ids_by_text.get(text, 0) | (1 << i)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def has(self, subject: str, difficulty: Optional[str] = None, category: Optional[str] = None) -> bool:
+        if difficulty is None:
+            return subject in self._difficulties
+        if category is None:
+            return (subject, difficulty) in self._categories
+        return (subject, difficulty, category) in self._buckets
+
+    def difficulties(self, subject: str) -> Tuple[str, ...]:
+        return self._difficulties.get(subject, ())
+
+    def categories(self, subject: str, difficulty: str) -> Tuple[str, ...]:
+        return self._categories.get((subject, difficulty), ())
+
+    def questions(self, subject: str, difficulty: str, category: str) -> Tuple[str, ...]:
+        start, count = self._buckets.get((subject, difficulty, category), (0, 0))
+        return self._texts[start:start + count]
+
+    def pick(self, keys: Iterable[BankKey], session_id: Optional[str] = None,
+             start: Optional[int] = None, rng: Optional[random.Random] = None) -> Optional[str]:
+        """One question from the union of `keys`, skipping ones this session was already served.
+        `start` picks deterministically (first unseen at or after that position, wrapping),
+        otherwise uniformly at random. Once every candidate was served the session starts over."""
+        ids: List[int] = []
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket:
+                ids.extend(range(bucket[0], bucket[0] + bucket[1]))
+        if not ids:
+            return None
+
+        with self._lock:
+            seen = self._seen.get(session_id, 0) if session_id else 0
+        candidates = [i for i in ids if not (seen >> i) & 1] or ids
+
+        if start is not None:
+            offset = start % len(ids)
+            ordered = ids[offset:] + ids[:offset]
+            unseen = set(candidates)
+            chosen = next(i for i in ordered if i in unseen)
+        else:
+            chosen = (rng or random).choice(candidates)
+
+        if session_id:
+            with self._lock:
+                mask = self._seen.pop(session_id, 0)
+                if len(candidates) == len(ids):
+                    # Nothing left unseen in these buckets before this pick: start a fresh round
+                    mask &= ~sum(1 << i for i in ids)
+                self._seen[session_id] = mask | (1 << chosen)
+                while len(self._seen) > self._max_sessions:
+                    self._seen.popitem(last=False)
+        return self._texts[chosen]
+
+    def mark_seen(self, session_id: str, texts: Iterable[str]) -> int:
+        """Record questions a session was already asked (e.g. rebuilt from the DB); returns how many are in this bank"""
+        with self._lock:
+            mask, found = 0, 0
+            for text in texts:
+                ids = self._ids_by_text.get((text or '').strip(), 0)
+                if ids:
+                    mask |= ids
+                    found += 1
+            if mask:
+                self._seen[session_id] = self._seen.pop(session_id, 0) | mask
+                while len(self._seen) > self._max_sessions:
+                    self._seen.popitem(last=False)
+            return found
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._seen.pop(session_id, None)
+
+
+_banks: Optional[Dict[str, QuestionBank]] = None
+_banks_lock = threading.Lock()
+
+
+def _load_banks() -> Dict[str, QuestionBank]:
+    global _banks
+    if _banks is None:
+        with _banks_lock:
+            if _banks is None:
+                with open(QUESTION_BANK_PATH, 'r', encoding='utf-8') as f:
+                    raw: Dict[str, Any] = json.load(f)
+                _banks = {name: QuestionBank(name, tree) for name, tree in raw.items()}
+                logger.info("📚 Loaded question banks: " + ", ".join(f"{n} ({len(b)})" for n, b in _banks.items()))
+    return _banks
+
+
+def preload():
+    """Build every bank now (call before a server forks workers)"""
+    try:
+        _load_banks()
+    except Exception as e:
+        logger.warning(f"⚠️ Question banks not preloaded, loading on first use: {e}")
+
+
+def get_question_bank(name: str) -> QuestionBank:
+    """Shared, lazily loaded bank by name ('interview', 'standard', 'contextual')"""
+    return _load_banks()[name]
+
+
+def remember_session(session_id: str, texts: Iterable[str]):
+    """Restore a session's no-repeat state in every bank from the questions it was already asked"""
+    texts = list(texts)
+    for bank in _load_banks().values():
+        bank.mark_seen(session_id, texts)
+
+
+def forget_session(session_id: str):
+    """Drop a finished session's no-repeat state from every loaded bank"""
+    if _banks is None:
+        return
+    for bank in _banks.values():
+        bank.forget(session_id)
@@ -0,0 +1,210 @@
+"""
+Question store with LRU/TTL eviction and pre-warmed pools
+Context-free questions (the opening ones) are interchangeable across candidates, so they are
+generated ahead of time per (subject, difficulty, phase, question number) and served from memory
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Any, Callable, Iterable, Set, Tuple
+
+from question_prefetch import question_text_of
+
+logger = logging.getLogger(__name__)
+
+QUESTION_CACHE_TTL_SEC = float(os.getenv('IQ_QUESTION_CACHE_TTL_SEC', '3600'))
+QUESTION_CACHE_MAX_KEYS = int(os.getenv('IQ_QUESTION_CACHE_MAX_KEYS', '256'))
+QUESTION_POOL_SIZE = int(os.getenv('IQ_QUESTION_POOL_SIZE', '5'))
+# Only questions generated without previous answers are shareable between sessions
+QUESTION_CACHE_MAX_NUMBER = int(os.getenv('IQ_QUESTION_CACHE_MAX_NUMBER', '2'))
+# Filler back-off while generation is degraded (e.g. the LLM circuit is open)
+QUESTION_FILL_BACKOFF_SEC = float(os.getenv('IQ_QUESTION_FILL_BACKOFF_SEC', '30'))
+
+QuestionKey = Tuple[str, str, str, int]
+
+
+def question_phase(question_number: int) -> str:
+    """Interview phase for a question number (same bands as the Groq prompt)"""
+    if question_number <= 2:
+        return "introduction"
+    if question_number <= 5:
+        return "core"
+    if question_number <= 7:
+        return "practical"
+    return "advanced"
+
+
+def question_key(subject: str, difficulty: str, question_number: int) -> QuestionKey:
+    return (subject, difficulty, question_phase(question_number), question_number)
+
+
+def normalize_question(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', (text or '').lower()).strip()
+
+
+def shareable(question: Optional[Dict[str, Any]]) -> bool:
+    """Only LLM output is pooled: static-bank fallbacks (served during an outage) would outlive it by the TTL"""
+    return bool(question) and question.get('source', 'llm') == 'llm'
+
+
+class QuestionStore:
+    """LRU of per-key question pools, topped up by a background filler.
+    `paused()` true (the LLM is unavailable) makes the filler back off instead of pooling fallbacks."""
+
+    def __init__(self, generator: Callable[[QuestionKey], Optional[Dict[str, Any]]],
+                 pool_size: int = QUESTION_POOL_SIZE, ttl: float = QUESTION_CACHE_TTL_SEC,
+                 max_keys: int = QUESTION_CACHE_MAX_KEYS, max_question_number: int = QUESTION_CACHE_MAX_NUMBER,
+                 paused: Optional[Callable[[], bool]] = None, backoff_sec: float = QUESTION_FILL_BACKOFF_SEC):
+        self.generator = generator
+        self.paused = paused
+        self.backoff_sec = backoff_sec
+        self.pool_size = pool_size
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.max_question_number = max_question_number
+        # key -> deque of (created_at, question dict); OrderedDict order is recency of use
+        self._pools: "OrderedDict[QuestionKey, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: "deque[QuestionKey]" = deque()
+        self._pending_set: Set[QuestionKey] = set()
+        self._wakeup = threading.Condition(self._lock)
+        self._filler: Optional[threading.Thread] = None
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'generated': 0, 'duplicates': 0,
+                      'rejected': 0, 'deferred': 0}
+
+    def cacheable(self, question_number: int) -> bool:
+        return question_number <= self.max_question_number
+
+    def _touch(self, key: QuestionKey) -> deque:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = deque()
+            self._pools[key] = pool
+            while len(self._pools) > self.max_keys:
+                self._pools.popitem(last=False)
+                self.stats['evicted'] += 1
+        else:
+            self._pools.move_to_end(key)
+        return pool
+
+    def _drop_expired(self, pool: deque, now: float):
+        while pool and now - pool[0][0] > self.ttl:
+            pool.popleft()
+            self.stats['expired'] += 1
+
+    def get(self, key: QuestionKey, seen: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Pop a ready question the session has not seen yet; schedules a refill either way"""
+        seen_norm = {normalize_question(s) for s in (seen or [])}
+        now = time.time()
+        with self._lock:
+            pool = self._touch(key)
+            self._drop_expired(pool, now)
+            found = None
+            for i, (_, question) in enumerate(pool):
+                if normalize_question(question_text_of(question) or '') not in seen_norm:
+                    found = question
+                    del pool[i]
+                    break
+            self.stats['hits' if found else 'misses'] += 1
+            self._request_fill(key)
+        return dict(found) if found else None
+
+    def get_or_generate(self, key: QuestionKey, seen: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Cache hit when possible, otherwise generate inline (the filler warms the key for next time)"""
+        question = self.get(key, seen)
+        if question is not None:
+            return question
+        return self.generator(key)
+
+    def put(self, key: QuestionKey, question: Dict[str, Any]) -> bool:
+        text = normalize_question(question_text_of(question) or '')
+        if not text:
+            return False
+        with self._lock:
+            if not shareable(question):
+                self.stats['rejected'] += 1
+                return False
+            pool = self._touch(key)
+            if any(normalize_question(question_text_of(q) or '') == text for _, q in pool):
+                self.stats['duplicates'] += 1
+                return False
+            pool.append((time.time(), question))
+        return True
+
+    def prewarm(self, keys: Iterable[QuestionKey]):
+        with self._lock:
+            for key in keys:
+                self._touch(key)
+                self._request_fill(key)
+
+    def _request_fill(self, key: QuestionKey):
+        # Caller holds self._lock
+        if key in self._pending_set:
+            return
+        pool = self._pools.get(key)
+        if pool is not None and len(pool) >= self.pool_size:
+            return
+        self._pending.append(key)
+        self._pending_set.add(key)
+        if self._filler is None or not self._filler.is_alive():
+            self._filler = threading.Thread(target=self._fill_loop, name='question-pool-filler', daemon=True)
+            self._filler.start()
+        self._wakeup.notify()
+
+    def _fill_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+                key = self._pending.popleft()
+                self._pending_set.discard(key)
+                pool = self._pools.get(key)
+                if pool is None:
+                    continue  # evicted while queued
+                missing = self.pool_size - len(pool)
+                if self.paused is not None and self.paused():
+                    # Generation would only return bank fallbacks: requeue and back off
+                    self.stats['deferred'] += 1
+                    self._request_fill(key)
+                    self._wakeup.wait(self.backoff_sec)
+                    continue
+            # Bounded attempts so duplicates from the generator cannot spin forever
+            for _ in range(max(0, missing) * 2):
+                try:
+                    question = self.generator(key)
+                except Exception as e:
+                    logger.warning(f"Question pool fill failed for {key}: {e}")
+                    break
+                if not question:
+                    break
+                self.stats['generated'] += 1
+                if not self.put(key, question) and not shareable(question):
+                    # The LLM failed mid-fill and the generator fell back to the bank
+                    break
+                with self._lock:
+                    pool = self._pools.get(key)
+                    if pool is None or len(pool) >= self.pool_size:
+                        break
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = len(self._pools)
+            ready = sum(len(p) for p in self._pools.values())
+            pending = len(self._pending)
+        return dict(self.stats, keys=keys, ready=ready, pending=pending)
+
+
+def prewarm_keys_from_env(map_subject: Callable[[str], str]) -> List[QuestionKey]:
+    """Keys named by IQ_PREWARM_SUBJECTS / IQ_PREWARM_DIFFICULTIES (comma separated), for startup warming"""
+    subjects = [s.strip() for s in os.getenv('IQ_PREWARM_SUBJECTS', '').split(',') if s.strip()]
+    difficulties = [d.strip() for d in os.getenv('IQ_PREWARM_DIFFICULTIES', 'Easy,Medium,Hard').split(',') if d.strip()]
+    keys = []
+    for subject in subjects:
+        for difficulty in difficulties:
+            for qn in range(1, QUESTION_CACHE_MAX_NUMBER + 1):
+                keys.append(question_key(map_subject(subject), difficulty, qn))
+    return keys
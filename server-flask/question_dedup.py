@@ -0,0 +1,165 @@
+"""
+Near-duplicate question suppression per session
+Each asked question is reduced to a MinHash signature over its content words; a new
+candidate whose estimated Jaccard similarity to any earlier question crosses the threshold is
+treated as a repeat/paraphrase and replaced from cheap sources (pools, static bank) instead of
+another LLM call
+"""
+
+import os
+import re
+import time
+import zlib
+import random
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_SIMILARITY = float(os.getenv('IQ_DUPLICATE_SIMILARITY', '0.5'))
+MINHASH_PERMUTATIONS = int(os.getenv('IQ_MINHASH_PERMUTATIONS', '64'))
+DEDUP_MAX_SESSIONS = int(os.getenv('IQ_DEDUP_MAX_SESSIONS', '2048'))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_STOPWORDS = frozenset("""
+a an the and or but if of to in on for with about from by at as is are was were be been being do does did
+you your yours we our i me my it its this that these those what which who whom how why when where can could
+would should will shall may might must have has had tell describe explain walk through give example some any
+""".split())
+
+
+def _stem(word: str) -> str:
+    # Just enough folding for paraphrases ("closures"/"closure", "handling"/"handle")
+    if len(word) > 5 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    for suffix in ('ing', 'ed'):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def shingles(text: str) -> List[int]:
+    """Stemmed content words, hashed to stable 32-bit ints (questions are too short for n-gram shingles)"""
+    words = {_stem(w) for w in re.findall(r"[a-z0-9+#']+", (text or '').lower()) if w not in _STOPWORDS}
+    return [zlib.crc32(w.encode('utf-8')) for w in words]
+
+
+class MinHasher:
+    """Fixed family of universal hash permutations (a*x + b mod p)"""
+
+    def __init__(self, permutations: int = MINHASH_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.params: Tuple[Tuple[int, int], ...] = tuple(
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(permutations)
+        )
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = shingles(text)
+        if not hashes:
+            return ()
+        p = _MERSENNE_PRIME
+        return tuple(min((a * h + b) % p for h in hashes) for a, b in self.params)
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity (fraction of matching minimums)"""
+        if not left or not right:
+            return 0.0
+        return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+class SessionQuestionDeduper:
+    """Signatures of the questions each session has been asked, with LRU eviction of idle sessions"""
+
+    def __init__(self, threshold: float = DUPLICATE_SIMILARITY, max_sessions: int = DEDUP_MAX_SESSIONS,
+                 hasher: Optional[MinHasher] = None):
+        self.threshold = threshold
+        self.max_sessions = max_sessions
+        self.hasher = hasher or MinHasher()
+        self._sessions: "OrderedDict[str, List[Tuple[int, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'checked': 0, 'duplicates': 0, 'replaced': 0, 'unresolved': 0, 'check_us_total': 0}
+
+    def _signatures(self, session_id: str) -> List[Tuple[int, ...]]:
+        with self._lock:
+            signatures = self._sessions.get(session_id)
+            if signatures is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            return list(signatures)
+
+    def similarity(self, session_id: str, text: str) -> float:
+        """Highest estimated similarity between `text` and anything this session was already asked"""
+        started = time.perf_counter()
+        signature = self.hasher.signature(text)
+        best = max((MinHasher.similarity(signature, s) for s in self._signatures(session_id)), default=0.0)
+        with self._lock:
+            self.stats['checked'] += 1
+            self.stats['check_us_total'] += int((time.perf_counter() - started) * 1_000_000)
+        return best
+
+    def is_duplicate(self, session_id: str, text: str) -> bool:
+        return self.similarity(session_id, text) >= self.threshold
+
+    def add(self, session_id: str, text: str):
+        signature = self.hasher.signature(text)
+        if not signature:
+            return
+        with self._lock:
+            signatures = self._sessions.get(session_id)
+            if signatures is None:
+                signatures = []
+                self._sessions[session_id] = signatures
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            signatures.append(signature)
+
+    def choose(self, session_id: str, candidate: Optional[str],
+               alternatives: Iterable[Callable[[], Optional[str]]] = ()) -> Optional[str]:
+        """First of `candidate` and the (lazily evaluated) alternatives that is not a near-duplicate.
+        Records and returns it; if every option repeats, the original candidate is kept."""
+        chosen = candidate
+        if candidate and self.is_duplicate(session_id, candidate):
+            with self._lock:
+                self.stats['duplicates'] += 1
+            chosen = None
+            for alternative in alternatives:
+                try:
+                    text = alternative()
+                except Exception as e:
+                    logger.warning(f"Duplicate replacement source failed: {e}")
+                    continue
+                if text and not self.is_duplicate(session_id, text):
+                    chosen = text
+                    break
+            with self._lock:
+                self.stats['replaced' if chosen else 'unresolved'] += 1
+            if chosen:
+                logger.info(f"🔁 Replaced near-duplicate question for {session_id}")
+            else:
+                chosen = candidate
+        if chosen:
+            self.add(session_id, chosen)
+        return chosen
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            sessions = len(self._sessions)
+        checked = stats.pop('check_us_total')
+        stats['avg_check_us'] = round(checked / stats['checked'], 1) if stats['checked'] else 0.0
+        stats['sessions'] = sessions
+        return stats
+
+
+question_deduper = SessionQuestionDeduper()
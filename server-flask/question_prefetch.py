@@ -0,0 +1,153 @@
+"""
+Speculative next-question generation
+Runs question generation on a bounded worker pool so socket handlers never block on the LLM
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUESTION_WORKERS = int(os.getenv('IQ_QUESTION_WORKERS', '4'))
+QUESTION_MAX_PENDING = int(os.getenv('IQ_QUESTION_MAX_PENDING', '64'))
+NEXT_QUESTION_DEADLINE_SEC = float(os.getenv('IQ_NEXT_QUESTION_DEADLINE_SEC', '1.5'))
+QUESTION_STREAMING = os.getenv('IQ_STREAM_QUESTIONS', '1') == '1'
+# Once the candidate is watching a question stream in, allow it this long to finish
+STREAM_QUESTION_DEADLINE_SEC = float(os.getenv('IQ_STREAM_QUESTION_DEADLINE_SEC', '8'))
+
+
+def question_text_of(result: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not result:
+        return None
+    return result.get('question') or result.get('question_text')
+
+
+class QuestionStream:
+    """Text fragments of a question still being generated; a listener attached late gets the backlog first"""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._listener: Optional[Callable[[str, str], None]] = None
+        self._lock = threading.Lock()
+        self.finished = False
+
+    def feed(self, delta: str):
+        with self._lock:
+            self._parts.append(delta)
+            listener = self._listener
+            # Called under the lock so fragments reach the listener in order
+            if listener is not None:
+                listener(delta, ''.join(self._parts))
+
+    def finish(self):
+        with self._lock:
+            self.finished = True
+            self._listener = None
+
+    def attach(self, listener: Callable[[str, str], None]) -> bool:
+        """Forward fragments to `listener(delta, text_so_far)`; False if generation already finished"""
+        with self._lock:
+            if self.finished:
+                return False
+            self._listener = listener
+            if self._parts:
+                text = ''.join(self._parts)
+                listener(text, text)
+            return True
+
+
+class QuestionPrefetcher:
+    """Per-(session, question number) futures on a bounded executor"""
+
+    def __init__(self, max_workers: int = QUESTION_WORKERS, max_pending: int = QUESTION_MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='question-gen')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures: Dict[Tuple[str, int], Future] = {}
+        self._streams: Dict[Tuple[str, int], QuestionStream] = {}
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'rejected': 0, 'hits': 0, 'late': 0}
+
+    def schedule(self, session_id: str, question_number: int,
+                 fn: Callable[..., Optional[Dict[str, Any]]], *args, streaming: bool = False, **kwargs) -> Optional[Future]:
+        """Start generating a question unless one is already in flight; returns None when the pool is saturated.
+        With `streaming`, fn receives `on_delta` and its fragments are kept for stream()"""
+        key = (session_id, question_number)
+        with self._lock:
+            existing = self._futures.get(key)
+            if existing is not None:
+                return existing
+            if not self._slots.acquire(blocking=False):
+                self.stats['rejected'] += 1
+                logger.warning(f"⚠️ Question pool saturated, not prefetching Q{question_number} for {session_id}")
+                return None
+            stream = None
+            if streaming:
+                stream = QuestionStream()
+                kwargs['on_delta'] = stream.feed
+            try:
+                future = self._executor.submit(self._run, fn, args, kwargs)
+            except Exception:
+                self._slots.release()
+                raise
+            # Released on completion or cancellation so dropped sessions never leak slots
+            future.add_done_callback(lambda _f: self._slots.release())
+            if stream is not None:
+                future.add_done_callback(lambda _f: stream.finish())
+                self._streams[key] = stream
+            self._futures[key] = future
+            self.stats['submitted'] += 1
+        return future
+
+    def stream(self, session_id: str, question_number: int) -> Optional[QuestionStream]:
+        with self._lock:
+            return self._streams.get((session_id, question_number))
+
+    def _run(self, fn, args, kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            logger.info(f"⚡ Question generated in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def take(self, session_id: str, question_number: int,
+             timeout: float = NEXT_QUESTION_DEADLINE_SEC) -> Optional[Dict[str, Any]]:
+        """Wait up to `timeout` for the prefetched question; None if missing, failed or late"""
+        with self._lock:
+            future = self._futures.pop((session_id, question_number), None)
+            stream = self._streams.pop((session_id, question_number), None)
+        if future is None:
+            return None
+        try:
+            result = future.result(timeout=max(0.0, timeout))
+        except FutureTimeout:
+            with self._lock:
+                self.stats['late'] += 1
+            logger.warning(f"⏱️ Q{question_number} for {session_id} not ready within {timeout}s, using fallback")
+            return None
+        except Exception as e:
+            logger.warning(f"Question prefetch failed: {e}")
+            return None
+        finally:
+            if stream is not None:
+                stream.finish()
+        with self._lock:
+            self.stats['hits'] += 1
+        return result
+
+    def discard_session(self, session_id: str):
+        with self._lock:
+            for key in [k for k in self._futures if k[0] == session_id]:
+                self._futures.pop(key).cancel()
+            for key in [k for k in self._streams if k[0] == session_id]:
+                self._streams.pop(key).finish()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._futures))
+
+
+question_prefetcher = QuestionPrefetcher()
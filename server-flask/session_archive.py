@@ -0,0 +1,260 @@
+"""
+Cold storage for old completed sessions
+Completed sessions older than IQ_ARCHIVE_AFTER_DAYS are moved, with their questions, answers and
+summary, into a separate archive database attached to the writer connection. Each batch is two
+queued writes, so live writes interleave with the job: a copy into the archive, committed on its
+own, then a delete of only the sessions the archive confirms it holds. (A commit spanning two WAL
+databases is not atomic, so copy and delete never share one.) Freed pages are then returned with
+incremental VACUUM, which keeps the hot file small and cache-resident.
+Readers use `fetch_fallthrough`: a session is looked up in the hot database first, then in the archive.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DB_PATH = os.getenv('IQ_ARCHIVE_DB_PATH', 'interview_iq_archive.db')
+# 0 disables the archival job (reads still fall through to an existing archive)
+ARCHIVE_AFTER_DAYS = float(os.getenv('IQ_ARCHIVE_AFTER_DAYS', '90'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('IQ_ARCHIVE_BATCH_SIZE', '200'))
+ARCHIVE_INTERVAL_SEC = float(os.getenv('IQ_ARCHIVE_INTERVAL_SEC', '3600'))
+ARCHIVE_VACUUM_PAGES = int(os.getenv('IQ_ARCHIVE_VACUUM_PAGES', '1024'))
+# Pause between batches so queued live writes get the writer first
+ARCHIVE_PAUSE_SEC = float(os.getenv('IQ_ARCHIVE_PAUSE_SEC', '0.05'))
+ARCHIVE_SCHEMA = 'archive'
+
+# Tables moved with a session, and the column holding the session id
+ARCHIVED_TABLES = (
+    ('interview_sessions', 'id'),
+    ('interview_questions', 'session_id'),
+    ('interview_answers', 'session_id'),
+    ('session_summary', 'session_id'),
+)
+ARCHIVE_INDEXES = (
+    ('idx_archive_sessions_start', 'interview_sessions', 'start_time, id'),
+    ('idx_archive_sessions_user_start', 'interview_sessions', 'user_id, start_time, id'),
+    ('idx_archive_questions_session_number', 'interview_questions', 'session_id, question_number'),
+    ('idx_archive_answers_session_seq', 'interview_answers', 'session_id, answer_seq'),
+)
+
+SESSION_ROW_SQL = 'SELECT * FROM {schema}.interview_sessions WHERE id = ?'
+
+
+def _attached(conn: sqlite3.Connection) -> bool:
+    return any(row[1] == ARCHIVE_SCHEMA for row in conn.execute('PRAGMA database_list'))
+
+
+def attach_archive(conn: sqlite3.Connection, path: str = ARCHIVE_DB_PATH, read_only: bool = False) -> bool:
+    """Attach the archive as `archive` (idempotent). Read-only callers never create the file."""
+    if _attached(conn):
+        return True
+    if read_only and not os.path.exists(path):
+        return False
+    conn.execute(f'ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}', (path,))
+    if not read_only:
+        # Only takes effect on a new, empty file
+        conn.execute(f'PRAGMA {ARCHIVE_SCHEMA}.auto_vacuum = INCREMENTAL')
+        conn.execute(f'PRAGMA {ARCHIVE_SCHEMA}.journal_mode = WAL')
+    return True
+
+
+def _table_info(conn: sqlite3.Connection, schema: str, table: str) -> List[Tuple]:
+    return conn.execute(f"PRAGMA {schema}.table_info('{table}')").fetchall()
+
+
+def ensure_archive_schema(conn: sqlite3.Connection):
+    """Mirror the hot tables into the archive with the same column order, so `SELECT *` rows line up"""
+    for table, _ in ARCHIVED_TABLES:
+        columns = _table_info(conn, 'main', table)
+        existing = {row[1] for row in _table_info(conn, ARCHIVE_SCHEMA, table)}
+        if not existing:
+            defs = ', '.join(f"{row[1]} {row[2]}{' PRIMARY KEY' if row[5] else ''}" for row in columns)
+            conn.execute(f'CREATE TABLE {ARCHIVE_SCHEMA}.{table} ({defs})')
+            continue
+        # Hot-table columns are only ever appended, so appending here keeps the order identical
+        for row in columns:
+            if row[1] not in existing:
+                conn.execute(f'ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {row[1]} {row[2]}')
+    for name, table, columns in ARCHIVE_INDEXES:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.{name} ON {table} ({columns})')
+
+
+def fetch_fallthrough(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+                      archive_path: str = ARCHIVE_DB_PATH) -> Tuple[Optional[str], Optional[Tuple]]:
+    """Run `sql` (with a `{schema}` placeholder) against the hot database, then the archive.
+    Returns (schema, row) so follow-up reads can target the same schema, or (None, None)."""
+    row = conn.execute(sql.format(schema='main'), params).fetchone()
+    if row is not None:
+        return 'main', row
+    try:
+        if attach_archive(conn, archive_path, read_only=True):
+            row = conn.execute(sql.format(schema=ARCHIVE_SCHEMA), params).fetchone()
+            if row is not None:
+                return ARCHIVE_SCHEMA, row
+    except sqlite3.OperationalError as e:
+        # Archive file present but not initialised yet
+        logger.debug(f"Archive lookup skipped: {e}")
+    return None, None
+
+
+class SessionArchiver:
+    """Background job moving old completed sessions to the archive through the DB writer"""
+
+    def __init__(self, writer, path: str = ARCHIVE_DB_PATH, after_days: float = ARCHIVE_AFTER_DAYS,
+                 batch_size: int = ARCHIVE_BATCH_SIZE, interval_sec: float = ARCHIVE_INTERVAL_SEC,
+                 vacuum_pages: int = ARCHIVE_VACUUM_PAGES):
+        self.writer = writer
+        self.path = path
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval_sec = interval_sec
+        self.vacuum_pages = vacuum_pages
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._incremental_warned = False
+        self.stats = {'runs': 0, 'failed_runs': 0, 'archived_sessions': 0, 'batches': 0,
+                      'pages_freed': 0, 'last_run': None, 'last_run_ms': 0.0}
+
+    def start(self):
+        if self.after_days <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='session-archiver', daemon=True)
+        self._thread.start()
+        logger.info(f"🗄️ Session archiver on: completed sessions older than {self.after_days:g} days -> {self.path}")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                with self._lock:
+                    self.stats['failed_runs'] += 1
+                logger.error(f"❌ Session archival run failed: {e}")
+            self._stop.wait(self.interval_sec)
+
+    # ---- writer-side operations -----------------------------------------
+
+    def _prepare(self, conn: sqlite3.Connection):
+        attach_archive(conn, self.path)
+        ensure_archive_schema(conn)
+
+    @staticmethod
+    def _load_batch(conn: sqlite3.Connection, ids: Sequence[str]):
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS archive_batch (id TEXT PRIMARY KEY)')
+        conn.execute('DELETE FROM temp.archive_batch')
+        conn.executemany('INSERT INTO temp.archive_batch (id) VALUES (?)', [(session_id,) for session_id in ids])
+
+    def _copy_batch(self, conn: sqlite3.Connection) -> List[str]:
+        """Copy one batch of eligible sessions into the archive; returns their ids. Runs in a writer
+        transaction that only writes the archive; INSERT OR REPLACE keeps a retried batch idempotent."""
+        ids = [row[0] for row in conn.execute('''
+            SELECT id FROM main.interview_sessions
+            WHERE status = 'completed' AND start_time < datetime('now', ?)
+              AND COALESCE(end_time, start_time) < datetime('now', ?)
+            ORDER BY start_time, id LIMIT ?
+        ''', (f'-{self.after_days:g} days', f'-{self.after_days:g} days', self.batch_size))]
+        if not ids:
+            return ids
+        self._load_batch(conn, ids)
+        for table, key in ARCHIVED_TABLES:
+            columns = ', '.join(row[1] for row in _table_info(conn, 'main', table))
+            conn.execute(f'''INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.{table} ({columns})
+                             SELECT {columns} FROM main.{table} WHERE {key} IN (SELECT id FROM temp.archive_batch)''')
+        return ids
+
+    def _delete_archived(self, conn: sqlite3.Connection, ids: Sequence[str]) -> int:
+        """Delete from the hot tables the sessions of a copied batch that the archive confirms it holds.
+        Runs in its own writer transaction, after the copy committed."""
+        self._load_batch(conn, ids)
+        conn.execute(f'DELETE FROM temp.archive_batch WHERE id NOT IN (SELECT id FROM {ARCHIVE_SCHEMA}.interview_sessions)')
+        confirmed = conn.execute('SELECT COUNT(*) FROM temp.archive_batch').fetchone()[0]
+        # Children first, sessions last
+        for table, key in reversed(ARCHIVED_TABLES):
+            conn.execute(f'DELETE FROM main.{table} WHERE {key} IN (SELECT id FROM temp.archive_batch)')
+        return confirmed
+
+    def _vacuum_step(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """(pages freed, pages still free). Only incremental: a file not in incremental auto-vacuum mode is
+        left alone, since converting it takes a full VACUUM that would stall every live write."""
+        before = conn.execute('PRAGMA main.freelist_count').fetchone()[0]
+        if conn.execute('PRAGMA main.auto_vacuum').fetchone()[0] != 2:
+            return 0, before
+        conn.execute(f'PRAGMA main.incremental_vacuum({self.vacuum_pages})').fetchall()
+        after = conn.execute('PRAGMA main.freelist_count').fetchone()[0]
+        return max(before - after, 0), after
+
+    # ---- job -----------------------------------------------------------
+
+    def run_once(self) -> int:
+        """Archive everything currently eligible, then compact. Returns the number of sessions moved."""
+        started = time.perf_counter()
+        self.writer.maintenance(self._prepare, label='archive.prepare').result()
+        total = 0
+        while not self._stop.is_set():
+            # Two separate writer ops, so the copy is committed before anything is deleted
+            ids = self.writer.call(self._copy_batch, label='archive.copy').result()
+            if not ids:
+                break
+            moved = self.writer.call(lambda conn, ids=ids: self._delete_archived(conn, ids), label='archive.delete').result()
+            total += moved
+            with self._lock:
+                self.stats['batches'] += 1
+                self.stats['archived_sessions'] += moved
+            if len(ids) < self.batch_size or moved < len(ids):
+                break
+            time.sleep(ARCHIVE_PAUSE_SEC)
+        if total:
+            # Small incremental steps so live writes can run between them
+            while not self._stop.is_set():
+                freed, remaining = self.writer.maintenance(self._vacuum_step, label='archive.vacuum').result()
+                if not freed and remaining and not self._incremental_warned:
+                    self._incremental_warned = True
+                    logger.warning("🗄️ Hot database is not in incremental auto-vacuum mode; freed pages stay in the file "
+                                   "until it is converted offline: python session_archive.py enable-incremental-vacuum")
+                with self._lock:
+                    self.stats['pages_freed'] += freed
+                if not remaining or not freed:
+                    break
+                time.sleep(ARCHIVE_PAUSE_SEC)
+            logger.info(f"🗄️ Archived {total} completed sessions in {time.perf_counter() - started:.2f}s")
+        with self._lock:
+            self.stats['runs'] += 1
+            self.stats['last_run'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self.stats['last_run_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return total
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, enabled=self.after_days > 0, after_days=self.after_days)
+
+
+def enable_incremental_vacuum(path: str) -> bool:
+    """Offline, one-time: switch an existing database to incremental auto-vacuum (a full VACUUM rewrite).
+    Run with both servers stopped. Returns False when it already was."""
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+            return False
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+        return True
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'enable-incremental-vacuum':
+        print('usage: python session_archive.py enable-incremental-vacuum [database path]')
+        sys.exit(2)
+    target = sys.argv[2] if len(sys.argv) > 2 else 'interview_iq.db'
+    print('converted' if enable_incremental_vacuum(target) else 'already incremental', target)
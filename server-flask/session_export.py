@@ -0,0 +1,225 @@
+"""
+Streaming bulk export of sessions, questions and answers as NDJSON
+Sessions are walked in (start_time, id) order with keyset pagination: every page is a fresh,
+index-backed query resuming after the last key, so no read transaction stays open between pages,
+no OFFSET scan grows with the export, and memory is bounded by one page regardless of size.
+Each session line carries a `cursor` that resumes the export right after it.
+"""
+
+import os
+import json
+import time
+import zlib
+import base64
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Iterator, Mapping, Tuple
+
+from db_schema import tune_connection
+from session_archive import attach_archive, ARCHIVE_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PAGE_SIZE = int(os.getenv('IQ_EXPORT_PAGE_SIZE', '200'))
+EXPORT_GZIP_LEVEL = int(os.getenv('IQ_EXPORT_GZIP_LEVEL', '6'))
+EXPORT_STATUSES = ('active', 'completed')
+EXPORT_SOURCES = ('main', ARCHIVE_SCHEMA)
+
+
+def encode_cursor(start_time: str, session_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([start_time, session_id]).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[str, str]:
+    try:
+        start_time, session_id = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        return str(start_time), str(session_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def _timestamp(value: str, end_of_day: bool = False) -> str:
+    """ISO date/datetime -> the 'YYYY-MM-DD HH:MM:SS' text SQLite's CURRENT_TIMESTAMP stores"""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid date: {value}')
+    if end_of_day and len(value) <= 10:
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+@dataclass
+class ExportFilters:
+    user_id: Optional[str] = None
+    status: Optional[str] = None
+    start_from: Optional[str] = None
+    start_to: Optional[str] = None
+    after: Optional[Tuple[str, str]] = None
+    limit: Optional[int] = None
+    include_questions: bool = True
+    include_answers: bool = True
+    source: str = 'main'
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> 'ExportFilters':
+        """Query-string filters: user, status, from, to (inclusive dates), cursor, limit, include=questions,answers,
+        source=main|archive"""
+        status = args.get('status') or None
+        if status and status not in EXPORT_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(EXPORT_STATUSES)}")
+        source = args.get('source') or 'main'
+        if source not in EXPORT_SOURCES:
+            raise ValueError(f"source must be one of {', '.join(EXPORT_SOURCES)}")
+        limit = args.get('limit')
+        if limit is not None:
+            if not limit.isdigit() or int(limit) <= 0:
+                raise ValueError('limit must be a positive integer')
+        include = args.get('include')
+        parts = set(include.split(',')) if include is not None else {'questions', 'answers'}
+        return cls(
+            user_id=args.get('user') or args.get('user_id') or None,
+            status=status,
+            start_from=_timestamp(args['from']) if args.get('from') else None,
+            start_to=_timestamp(args['to'], end_of_day=True) if args.get('to') else None,
+            after=decode_cursor(args['cursor']) if args.get('cursor') else None,
+            limit=int(limit) if limit else None,
+            include_questions='questions' in parts,
+            include_answers='answers' in parts,
+            source=source
+        )
+
+
+class SessionExporter:
+    """Keyset-paginated reader over a dedicated read-only connection per export"""
+
+    def __init__(self, path: str, page_size: int = EXPORT_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self.stats = {'exports': 0, 'active': 0, 'sessions': 0, 'rows': 0, 'bytes': 0, 'failed': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+        tune_connection(conn, read_only=True)
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def _page_query(self, filters: ExportFilters, after: Optional[Tuple[str, str]], page_size: int) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if after is not None:
+            clauses.append('(start_time, id) > (?, ?)')
+            params.extend(after)
+        if filters.user_id:
+            clauses.append('user_id = ?')
+            params.append(filters.user_id)
+        if filters.status:
+            clauses.append('status = ?')
+            params.append(filters.status)
+        if filters.start_from:
+            clauses.append('start_time >= ?')
+            params.append(filters.start_from)
+        if filters.start_to:
+            clauses.append('start_time <= ?')
+            params.append(filters.start_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        params.append(page_size)
+        return f'SELECT * FROM {filters.source}.interview_sessions {where} ORDER BY start_time, id LIMIT ?', params
+
+    @staticmethod
+    def _dicts(cursor: sqlite3.Cursor) -> Iterator[Dict[str, Any]]:
+        # Iterate the cursor instead of fetchall(): rows are stepped out of SQLite one at a time
+        names = [d[0] for d in cursor.description]
+        for row in cursor:
+            yield dict(zip(names, row))
+
+    def rows(self, filters: ExportFilters) -> Iterator[Dict[str, Any]]:
+        """NDJSON records: one 'session' line (with its resume cursor) followed by its 'question' and
+        'answer' lines, then a closing 'end' line with the count and, when `limit` stopped early, next_cursor"""
+        conn = self._connect()
+        exported = 0
+        after = filters.after
+        next_cursor = None
+        schema = filters.source
+        try:
+            if schema == ARCHIVE_SCHEMA and not attach_archive(conn, read_only=True):
+                # Nothing archived yet
+                yield {'type': 'end', 'sessions': 0, 'next_cursor': None}
+                return
+            while True:
+                page_size = self.page_size if filters.limit is None else min(self.page_size, filters.limit - exported)
+                if page_size <= 0:
+                    break
+                sql, params = self._page_query(filters, after, page_size)
+                page = list(self._dicts(conn.execute(sql, params)))
+                for session in page:
+                    after = (session['start_time'], session['id'])
+                    exported += 1
+                    yield dict(session, type='session', cursor=encode_cursor(*after))
+                    if filters.include_questions:
+                        for question in self._dicts(conn.execute(
+                                f'SELECT * FROM {schema}.interview_questions WHERE session_id = ? ORDER BY question_number', (session['id'],))):
+                            yield dict(question, type='question')
+                    if filters.include_answers:
+                        for answer in self._dicts(conn.execute(
+                                f'SELECT * FROM {schema}.interview_answers WHERE session_id = ? ORDER BY answer_seq, rowid', (session['id'],))):
+                            yield dict(answer, type='answer')
+                if len(page) < page_size:
+                    break
+                if filters.limit is not None and exported >= filters.limit:
+                    next_cursor = encode_cursor(*after)
+                    break
+            yield {'type': 'end', 'sessions': exported, 'next_cursor': next_cursor}
+        finally:
+            conn.close()
+
+    def stream(self, filters: ExportFilters, gzip: bool = False) -> Iterator[bytes]:
+        """Encoded response body: NDJSON lines, gzip-compressed and flushed once per session when asked"""
+        with self._lock:
+            self.stats['exports'] += 1
+            self.stats['active'] += 1
+        started = time.perf_counter()
+        compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if gzip else None
+        sessions = rows = sent = 0
+        buffered: List[bytes] = []
+        records = self.rows(filters)
+        try:
+            for record in records:
+                line = (json.dumps(record, default=str, separators=(',', ':')) + '\n').encode('utf-8')
+                rows += 1
+                if record['type'] == 'session':
+                    sessions += 1
+                if compressor is None:
+                    sent += len(line)
+                    yield line
+                    continue
+                buffered.append(compressor.compress(line))
+                if record['type'] in ('session', 'end'):
+                    buffered.append(compressor.flush(zlib.Z_SYNC_FLUSH) if record['type'] == 'session' else compressor.flush())
+                    chunk = b''.join(buffered)
+                    buffered.clear()
+                    if chunk:
+                        sent += len(chunk)
+                        yield chunk
+        except Exception as e:
+            with self._lock:
+                self.stats['failed'] += 1
+            logger.error(f"❌ Session export failed after {sessions} sessions: {e}")
+            raise
+        finally:
+            # Also runs when the client disconnects mid-export: release the read connection now
+            records.close()
+            with self._lock:
+                self.stats['active'] -= 1
+                self.stats['sessions'] += sessions
+                self.stats['rows'] += rows
+                self.stats['bytes'] += sent
+            logger.info(f"📤 Exported {sessions} sessions ({rows} rows, {sent} bytes) in {time.perf_counter() - started:.2f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
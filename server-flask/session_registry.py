@@ -0,0 +1,170 @@
+"""
+Bounded in-memory session registry (session_id -> state)
+Sessions attached to a connected client are never evicted. Once detached (disconnect, end of
+interview) a session stays resident for IQ_SESSION_IDLE_TTL_SEC of inactivity so a reconnecting
+client resumes from memory; past that, or when more than IQ_SESSION_MAX_RESIDENT sessions are
+resident, idle sessions are evicted least-recently-used first and rebuilt from the DB on resume.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_IDLE_TTL_SEC = float(os.getenv('IQ_SESSION_IDLE_TTL_SEC', '1800'))
+SESSION_MAX_RESIDENT = int(os.getenv('IQ_SESSION_MAX_RESIDENT', '2000'))
+# Sessions listed by size on /health
+SESSION_REPORT_LARGEST = int(os.getenv('IQ_SESSION_REPORT_LARGEST', '5'))
+
+
+class SessionRegistry:
+    """Dict-like map of session states with idle-TTL and LRU eviction of detached sessions.
+    `sizeof(state)` estimates a session's resident bytes; `on_evict(session_id, state)` releases
+    whatever else is held per session (prefetches, plans, summaries)."""
+
+    def __init__(self, sizeof: Callable[[Any], int], on_evict: Optional[Callable[[str, Any], None]] = None,
+                 idle_ttl_sec: float = SESSION_IDLE_TTL_SEC, max_resident: int = SESSION_MAX_RESIDENT):
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.idle_ttl_sec = idle_ttl_sec
+        self.max_resident = max_resident
+        self._states: Dict[str, Any] = {}
+        # Detached sessions, least recently used first, with their last-use time
+        self._idle: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'rehydrated': 0, 'evicted_ttl': 0, 'evicted_lru': 0, 'evicted_ended': 0}
+
+    # ---- dict-like access -------------------------------------------------
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._states
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._states)
+
+    def __getitem__(self, session_id: str) -> Any:
+        state = self.get(session_id)
+        if state is None:
+            raise KeyError(session_id)
+        return state
+
+    def get(self, session_id: Optional[str], default: Any = None) -> Any:
+        """State for a resident session; refreshes an idle session's TTL and LRU position"""
+        if not session_id:
+            return default
+        evicted = []
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None and session_id in self._idle:
+                self._idle[session_id] = time.time()
+                self._idle.move_to_end(session_id)
+            evicted = self._sweep_locked(time.time())
+        self._release(evicted)
+        return default if state is None else state
+
+    def __setitem__(self, session_id: str, state: Any):
+        self.attach(session_id, state)
+
+    # ---- lifecycle --------------------------------------------------------
+
+    def attach(self, session_id: str, state: Any = None, rehydrated: bool = False):
+        """Register (or re-register) a session as in use by a connected client"""
+        evicted = []
+        with self._lock:
+            if state is not None:
+                if session_id not in self._states:
+                    self.stats['rehydrated' if rehydrated else 'created'] += 1
+                self._states[session_id] = state
+            self._idle.pop(session_id, None)
+            evicted = self._sweep_locked(time.time())
+        self._release(evicted)
+
+    def detach(self, session_id: str, state: Any = None):
+        """No client is using the session any more: it becomes eligible for eviction
+        (`state` registers a session that was never attached, so it can still be resumed)"""
+        evicted = []
+        with self._lock:
+            if state is not None and session_id not in self._states:
+                self._states[session_id] = state
+                self.stats['created'] += 1
+            if session_id in self._states:
+                self._idle[session_id] = time.time()
+                self._idle.move_to_end(session_id)
+            evicted = self._sweep_locked(time.time())
+        self._release(evicted)
+
+    def evict(self, session_id: str) -> Any:
+        """Drop a session that is over (ended/completed) right away"""
+        with self._lock:
+            state = self._states.pop(session_id, None)
+            self._idle.pop(session_id, None)
+            if state is not None:
+                self.stats['evicted_ended'] += 1
+        if state is not None:
+            self._release([(session_id, state)])
+        return state
+
+    def sweep(self) -> int:
+        with self._lock:
+            evicted = self._sweep_locked(time.time())
+        self._release(evicted)
+        return len(evicted)
+
+    def _sweep_locked(self, now: float) -> List[Tuple[str, Any]]:
+        evicted = []
+        # Idle order is LRU order, so expired sessions are all at the front
+        while self._idle:
+            session_id, last_used = next(iter(self._idle.items()))
+            if now - last_used < self.idle_ttl_sec:
+                break
+            self._idle.popitem(last=False)
+            evicted.append((session_id, self._states.pop(session_id, None)))
+            self.stats['evicted_ttl'] += 1
+        while len(self._states) > self.max_resident and self._idle:
+            session_id, _ = self._idle.popitem(last=False)
+            evicted.append((session_id, self._states.pop(session_id, None)))
+            self.stats['evicted_lru'] += 1
+        return evicted
+
+    def _release(self, evicted: List[Tuple[str, Any]]):
+        for session_id, state in evicted:
+            logger.info(f"🧹 Evicted session {session_id} from memory")
+            if self.on_evict is not None and state is not None:
+                try:
+                    self.on_evict(session_id, state)
+                except Exception as e:
+                    logger.warning(f"Session eviction cleanup failed for {session_id}: {e}")
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            return iter(list(self._states.items()))
+
+    def snapshot(self) -> Dict[str, Any]:
+        self.sweep()
+        with self._lock:
+            states = list(self._states.items())
+            idle = set(self._idle)
+            stats = dict(self.stats)
+        sizes = []
+        for session_id, state in states:
+            try:
+                sizes.append((self.sizeof(state), session_id))
+            except Exception:
+                continue
+        sizes.sort(reverse=True)
+        stats.update({
+            'resident': len(states),
+            'attached': len(states) - len(idle),
+            'idle': len(idle),
+            'max_resident': self.max_resident,
+            'idle_ttl_sec': self.idle_ttl_sec,
+            'bytes': sum(size for size, _ in sizes),
+            'largest': [{'session_id': sid, 'bytes': size, 'idle': sid in idle} for size, sid in sizes[:SESSION_REPORT_LARGEST]]
+        })
+        return stats
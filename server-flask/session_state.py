@@ -0,0 +1,208 @@
+"""
+Per-session interview state for app.py
+Slotted classes instead of ad-hoc dicts: no per-instance __dict__, a fixed set of attributes
+instead of lazily setdefault-ed keys, and one lock per session for the state that socket
+handlers, prefetch callbacks and the pause monitor share.
+"""
+
+import sys
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+
+class WarningTracker:
+    """Live-coaching counters and warning timestamps for the answer being recorded"""
+    __slots__ = ('last_filler_warning', 'last_pause_warning', 'last_length_warning', 'last_repeat_warning',
+                 'last_speech_time', 'filler_count_session', 'repetition_count_session', 'consecutive_empty',
+                 'pause_events')
+
+    def __init__(self, now: Optional[float] = None):
+        self.last_filler_warning = 0.0
+        self.last_pause_warning = 0.0
+        self.last_length_warning = 0.0
+        self.last_repeat_warning = 0.0
+        self.last_speech_time = time.time() if now is None else now
+        self.filler_count_session = 0
+        self.repetition_count_session = 0
+        self.consecutive_empty = 0
+        self.pause_events = 0
+
+
+class TranscriptRecord:
+    """One final transcript from process-complete-audio, with its speech metrics and AI analysis"""
+    __slots__ = ('transcript', 'speech', 'analysis', 'insights')
+
+    def __init__(self, transcript: str, speech: Optional[Dict[str, Any]] = None,
+                 analysis: Optional[Dict[str, Any]] = None, insights: Optional[List[str]] = None):
+        self.transcript = transcript
+        self.speech = speech or {}
+        self.analysis = analysis or {}
+        self.insights = insights or []
+
+    @property
+    def analysed(self) -> bool:
+        return bool(self.analysis or self.insights)
+
+
+class AnswerRecord:
+    """Scores stored for one answered question"""
+    __slots__ = ('question_number', 'transcript', 'confidence', 'clarity', 'technical', 'fillers', 'duration', 'timestamp')
+
+    def __init__(self, question_number: int, transcript: str, confidence: float, clarity: float,
+                 technical: float, fillers: int, duration: float):
+        self.question_number = question_number
+        self.transcript = transcript
+        self.confidence = confidence
+        self.clarity = clarity
+        self.technical = technical
+        self.fillers = fillers
+        self.duration = duration
+        self.timestamp = time.time()
+
+
+class SessionState:
+    """One interview session. Attributes read or written from more than one thread are only
+    touched under `lock` (re-entrant, so helpers can be called while holding it)."""
+    __slots__ = ('session_id', 'client_id', 'last_client_id', 'config', 'metadata', 'module_name', 'difficulty',
+                 'status', 'start_time', 'current_question', 'max_questions', 'questions', 'answers', 'records',
+                 'is_recording', 'recording_start_time', 'last_recording_stop_time', 'warning_tracker',
+                 'last_saved_question_id', 'chunk_buffer', 'buffer_start_time', 'audio_pending', 'audio_done',
+                 'audio_consumed', 'lock', 'audio_ready')
+
+    def __init__(self, session_id: str, module_name: str = 'General', difficulty: str = 'Medium', *,
+                 config: Optional[Dict[str, Any]] = None, metadata: Optional[Dict[str, Any]] = None,
+                 current_question: int = 1, max_questions: int = 10, client_id: Optional[str] = None,
+                 questions: Optional[Union[Dict[int, str], List[str]]] = None):
+        self.session_id = session_id
+        self.client_id = client_id
+        self.last_client_id: Optional[str] = None
+        self.config = config or {}
+        self.metadata = metadata or {}
+        self.module_name = module_name
+        self.difficulty = difficulty
+        self.status = 'active'
+        self.start_time = datetime.utcnow()
+        self.current_question = current_question
+        self.max_questions = max_questions
+        # question_number -> text; the legacy start-interview/initialize-interview flow keeps a list
+        self.questions: Union[Dict[int, str], List[str]] = questions if questions is not None else {}
+        self.answers: List[AnswerRecord] = []
+        self.records: List[TranscriptRecord] = []
+        self.is_recording = False
+        self.recording_start_time: Optional[float] = None
+        self.last_recording_stop_time: Optional[float] = None
+        self.warning_tracker = WarningTracker()
+        self.last_saved_question_id: Optional[str] = None
+        self.chunk_buffer: Optional[List[bytes]] = None
+        self.buffer_start_time = 0.0
+        # Complete-audio uploads in flight / finished / already consumed by answer-complete
+        self.audio_pending = 0
+        self.audio_done = 0
+        self.audio_consumed = 0
+        self.lock = threading.RLock()
+        self.audio_ready = threading.Condition(self.lock)
+
+    def nbytes(self) -> int:
+        """Approximate resident size: containers plus transcript, question and buffered audio payloads"""
+        with self.lock:
+            size = sys.getsizeof(self) + sys.getsizeof(self.warning_tracker) + sys.getsizeof(self.config) + sys.getsizeof(self.metadata)
+            size += sys.getsizeof(self.records) + sys.getsizeof(self.answers) + sys.getsizeof(self.questions)
+            for record in self.records:
+                size += sys.getsizeof(record) + sys.getsizeof(record.transcript) + sys.getsizeof(record.speech) + sys.getsizeof(record.analysis)
+            size += sum(sys.getsizeof(answer) for answer in self.answers)
+            questions = self.questions.values() if isinstance(self.questions, dict) else self.questions
+            size += sum(sys.getsizeof(q) for q in questions)
+            if self.chunk_buffer:
+                size += sum(len(chunk) for chunk in self.chunk_buffer)
+            return size
+
+    @property
+    def subject(self) -> str:
+        return self.module_name or self.config.get('subject', 'general')
+
+    def asked_questions(self) -> List[str]:
+        with self.lock:
+            questions = self.questions
+            return list(questions.values()) if isinstance(questions, dict) else list(questions)
+
+    def question_text(self, question_number: int) -> Optional[str]:
+        with self.lock:
+            if isinstance(self.questions, dict):
+                return self.questions.get(question_number)
+            return None
+
+    def set_question(self, question_number: int, text: str):
+        with self.lock:
+            if not isinstance(self.questions, dict):
+                self.questions = {}
+            self.questions[question_number] = text
+
+    # ---- transcripts -----------------------------------------------------
+
+    def add_transcript(self, record: TranscriptRecord) -> int:
+        with self.lock:
+            self.records.append(record)
+            return len(self.records)
+
+    def transcripts(self) -> List[str]:
+        with self.lock:
+            return [r.transcript for r in self.records]
+
+    def latest_record(self) -> Optional[TranscriptRecord]:
+        with self.lock:
+            return self.records[-1] if self.records else None
+
+    def latest_analysis(self) -> Optional[TranscriptRecord]:
+        """Most recent transcript that came with an analysis or insights"""
+        with self.lock:
+            for record in reversed(self.records):
+                if record.analysed:
+                    return record
+            return None
+
+    def begin_audio(self):
+        with self.lock:
+            self.audio_pending += 1
+
+    def end_audio(self):
+        """A complete-audio upload is done (transcript stored, or nothing to store)"""
+        with self.lock:
+            self.audio_pending -= 1
+            self.audio_done += 1
+            self.audio_ready.notify_all()
+
+    def wait_for_audio(self, timeout: float) -> bool:
+        """Block until this session's uploads for the current answer are all processed, at most `timeout`.
+        Returns False on timeout; either way they count as consumed by this answer."""
+        with self.lock:
+            ready = self.audio_ready.wait_for(lambda: self.audio_pending == 0 and self.audio_done > self.audio_consumed, timeout)
+            self.audio_consumed = self.audio_done
+            return ready
+
+    # ---- recording / coaching --------------------------------------------
+
+    def start_recording(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self.lock:
+            self.is_recording = True
+            self.recording_start_time = now
+            self.warning_tracker = WarningTracker(now)
+
+    def stop_recording(self, now: Optional[float] = None):
+        with self.lock:
+            self.is_recording = False
+            self.last_recording_stop_time = time.time() if now is None else now
+
+    def take_answer_counters(self) -> Tuple[int, int, int]:
+        """(fillers, pause events, repetitions) heard live during this answer, reset for the next one"""
+        with self.lock:
+            tracker = self.warning_tracker
+            counters = (int(tracker.filler_count_session or 0), int(tracker.pause_events or 0),
+                        int(tracker.repetition_count_session or 0))
+            tracker.filler_count_session = 0
+            tracker.pause_events = 0
+            tracker.consecutive_empty = 0
+            tracker.repetition_count_session = 0
+            return counters
@@ -0,0 +1,207 @@
+"""
+Incrementally maintained per-session analytics
+Each answer contributes one small entry (scores, word/filler counts, durations, pause metrics);
+the entries are upserted into `session_summary` in the same transaction as the answer row, and
+the running sums over them are kept in memory (rebuilt from the entries when a row is loaded).
+Analytics and completion payloads read the sums instead of rescanning every answer and
+re-running the filler regexes.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Any, Callable, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MAX_SESSIONS = int(os.getenv('IQ_SUMMARY_MAX_SESSIONS', '1024'))
+
+# Stored for a score the analysis did not produce; the fallback answer scan uses the same value
+MISSING_SCORE = 0
+
+# Entry fields that are summed across answers
+SUM_FIELDS = ('confidence', 'clarity', 'technical', 'words', 'fillers', 'filler_count', 'duration',
+              'speaking_time', 'pause_count', 'pause_duration', 'pace_seconds', 'empty')
+
+UPSERT_SUMMARY_SQL = '''
+    INSERT INTO session_summary (session_id, answer_count, per_question, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(session_id) DO UPDATE SET
+        answer_count = excluded.answer_count, per_question = excluded.per_question, updated_at = CURRENT_TIMESTAMP
+'''
+# `{schema}` is 'main' or 'archive' (see session_archive.fetch_fallthrough)
+SELECT_SUMMARY_SQL = 'SELECT per_question FROM {schema}.session_summary WHERE session_id = ?'
+
+
+def answer_entry(*, confidence: float, clarity: float, technical: float, words: int,
+                 filler_terms: Dict[str, int], filler_count: Optional[int] = None, duration: float = 0.0,
+                 speech: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """One answer's contribution. `filler_terms` is counted by the caller's own filler rules;
+    `filler_count` is the value stored on the answer row (defaults to the term total)."""
+    speech = speech or {}
+    speaking_time = float(speech.get('speaking_time') or 0.0)
+    fillers = sum(filler_terms.values())
+    return {
+        'confidence': confidence or MISSING_SCORE,
+        'clarity': clarity or MISSING_SCORE,
+        'technical': technical or MISSING_SCORE,
+        'words': words,
+        'fillers': fillers,
+        'filler_terms': {k: v for k, v in filler_terms.items() if v},
+        'filler_count': fillers if filler_count is None else int(filler_count or 0),
+        'duration': float(duration or 0.0),
+        'speaking_time': speaking_time,
+        'pause_count': int(speech.get('pause_count') or 0) if speaking_time else 0,
+        'pause_duration': float(speech.get('pause_duration') or 0.0) if speaking_time else 0.0,
+        'longest_pause': float(speech.get('longest_pause') or 0.0) if speaking_time else 0.0,
+        # Seconds used for words-per-minute: voiced time, else answer length, else 30s
+        'pace_seconds': (speaking_time or float(duration or 0.0) or 30.0) if words else 0.0,
+        'empty': 0 if words else 1
+    }
+
+
+class SessionSummary:
+    """Running sums over a session's answer entries, keyed by question number"""
+
+    def __init__(self, session_id: str, per_question: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.session_id = session_id
+        self.per_question: Dict[int, Dict[str, Any]] = {}
+        self.totals: Dict[str, float] = {f: 0 for f in SUM_FIELDS}
+        self.speech_answers = 0
+        self.filler_terms: Dict[str, int] = {}
+        for number, entry in (per_question or {}).items():
+            self._apply(entry, 1)
+            self.per_question[int(number)] = entry
+
+    def _apply(self, entry: Dict[str, Any], sign: int):
+        for f in SUM_FIELDS:
+            self.totals[f] += sign * (entry.get(f) or 0)
+        if entry.get('speaking_time'):
+            self.speech_answers += sign
+        for term, count in (entry.get('filler_terms') or {}).items():
+            remaining = self.filler_terms.get(term, 0) + sign * count
+            if remaining > 0:
+                self.filler_terms[term] = remaining
+            else:
+                self.filler_terms.pop(term, None)
+
+    def record(self, question_number: int, entry: Dict[str, Any]):
+        """Add an answer, replacing any earlier entry for the same question"""
+        previous = self.per_question.get(question_number)
+        if previous is not None:
+            self._apply(previous, -1)
+        self._apply(entry, 1)
+        self.per_question[question_number] = entry
+
+    @property
+    def answers(self) -> int:
+        return len(self.per_question)
+
+    def average(self, field: str) -> float:
+        return self.totals[field] / self.answers if self.answers else 0.0
+
+    def ordered(self) -> List[Tuple[int, Dict[str, Any]]]:
+        return sorted(self.per_question.items())
+
+    def filler_breakdown(self) -> List[Tuple[str, int]]:
+        return sorted(self.filler_terms.items(), key=lambda kv: kv[1], reverse=True)
+
+    def longest_pause(self) -> float:
+        return max((e.get('longest_pause') or 0.0 for e in self.per_question.values()), default=0.0)
+
+    def speech_metrics(self) -> Dict[str, Any]:
+        """Same shape as speech_timeline.aggregate_speech_metrics, from the sums"""
+        if not self.speech_answers:
+            return {}
+        pause_count = int(self.totals['pause_count'])
+        return {
+            'speakingTime': round(self.totals['speaking_time'], 1),
+            'pauseCount': pause_count,
+            'averagePause': round(self.totals['pause_duration'] / pause_count, 2) if pause_count else 0.0,
+            'longestPause': round(self.longest_pause(), 2),
+            'averagePauses': round(pause_count / self.speech_answers, 1)
+        }
+
+    def to_row(self) -> Tuple:
+        return self.session_id, self.answers, json.dumps({str(k): v for k, v in self.per_question.items()})
+
+
+class SessionSummaryStore:
+    """In-memory mirror of session_summary; every change is queued on the DB writer together with
+    the caller's own statements, under one lock so queued upserts commit in mutation order"""
+
+    def __init__(self, writer, load_row: Callable[[str], Optional[Tuple]], max_sessions: int = SUMMARY_MAX_SESSIONS):
+        self.writer = writer
+        self.load_row = load_row
+        self.max_sessions = max_sessions
+        self._summaries: "OrderedDict[str, SessionSummary]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loaded': 0, 'missing': 0, 'recorded': 0, 'amended': 0}
+
+    def _get_locked(self, session_id: str) -> Optional[SessionSummary]:
+        summary = self._summaries.get(session_id)
+        if summary is not None:
+            self._summaries.move_to_end(session_id)
+            self.stats['hits'] += 1
+            return summary
+        try:
+            row = self.load_row(session_id)
+        except Exception as e:
+            logger.warning(f"Loading session summary {session_id} failed: {e}")
+            row = None
+        if not row:
+            self.stats['missing'] += 1
+            return None
+        per_question = {int(k): v for k, v in json.loads(row[0] or '{}').items()}
+        summary = SessionSummary(session_id, per_question)
+        self._remember(summary)
+        self.stats['loaded'] += 1
+        return summary
+
+    def _remember(self, summary: SessionSummary):
+        self._summaries[summary.session_id] = summary
+        while len(self._summaries) > self.max_sessions:
+            self._summaries.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[SessionSummary]:
+        """Summary for a session, or None if nothing was ever recorded for it (e.g. pre-summary sessions)"""
+        with self._lock:
+            return self._get_locked(session_id)
+
+    def record(self, session_id: str, question_number: int, entry: Dict[str, Any],
+               statements: Sequence[Tuple[str, Sequence[Any]]] = (), label: str = 'answer.insert') -> Future:
+        """Add an answer entry and queue `statements` plus the summary upsert as one transaction"""
+        with self._lock:
+            summary = self._get_locked(session_id)
+            if summary is None:
+                summary = SessionSummary(session_id)
+                self._remember(summary)
+            summary.record(question_number, entry)
+            self.stats['recorded'] += 1
+            return self.writer.execute_group(list(statements) + [(UPSERT_SUMMARY_SQL, summary.to_row())], label=label)
+
+    def amend(self, session_id: str, question_number: int, update: Callable[[Dict[str, Any]], Dict[str, Any]],
+              statements: Sequence[Tuple[str, Sequence[Any]]] = (), label: str = 'answer.amend') -> Optional[Future]:
+        """Replace an existing entry with `update(previous_entry)` (e.g. after a late final transcript) and
+        queue `statements` with the upsert. Without an entry for that question only `statements` are queued."""
+        with self._lock:
+            summary = self._get_locked(session_id)
+            previous = summary.per_question.get(question_number) if summary else None
+            queued = list(statements)
+            if previous is not None:
+                summary.record(question_number, update(previous))
+                self.stats['amended'] += 1
+                queued.append((UPSERT_SUMMARY_SQL, summary.to_row()))
+            return self.writer.execute_group(queued, label=label) if queued else None
+
+    def forget(self, session_id: str):
+        """Drop the in-memory copy (the table row stays)"""
+        with self._lock:
+            self._summaries.pop(session_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, sessions=len(self._summaries))
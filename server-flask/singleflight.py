@@ -0,0 +1,85 @@
+"""
+Request coalescing for identical in-flight work
+Concurrent callers with the same key share one execution (one LLM round-trip) and each get the result
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Callable, Hashable
+
+SINGLEFLIGHT_MAX_TRACKED_KEYS = 256
+
+
+class SingleFlight:
+    """Go-style singleflight: the first caller for a key runs `fn`, later callers wait on its future"""
+
+    def __init__(self, name: str, max_tracked_keys: int = SINGLEFLIGHT_MAX_TRACKED_KEYS):
+        self.name = name
+        self.max_tracked_keys = max_tracked_keys
+        self._flights: Dict[Hashable, Future] = {}
+        # key -> {'calls': n, 'saved': n}, most recently used last
+        self._key_stats: "OrderedDict[Hashable, Dict[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'executed': 0, 'saved': 0}
+
+    def _count(self, key: Hashable, saved: bool):
+        # Caller holds self._lock
+        entry = self._key_stats.get(key)
+        if entry is None:
+            entry = {'calls': 0, 'saved': 0}
+            self._key_stats[key] = entry
+            while len(self._key_stats) > self.max_tracked_keys:
+                self._key_stats.popitem(last=False)
+        else:
+            self._key_stats.move_to_end(key)
+        entry['calls'] += 1
+        self.stats['calls'] += 1
+        if saved:
+            entry['saved'] += 1
+            self.stats['saved'] += 1
+        else:
+            self.stats['executed'] += 1
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn` once per concurrent burst of `key`; every caller gets its own copy of the result"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+            self._count(key, saved=not leader)
+
+        if not leader:
+            # Deep copy so one session cannot mutate another's question dict
+            return copy.deepcopy(flight.result())
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def snapshot(self, top: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._flights)
+            busiest = sorted(self._key_stats.items(), key=lambda kv: kv[1]['saved'], reverse=True)[:top]
+            stats = dict(self.stats)
+        stats.update({
+            'name': self.name,
+            'in_flight': in_flight,
+            'keys': [dict(v, key='/'.join(str(part) for part in k) if isinstance(k, tuple) else str(k))
+                     for k, v in busiest if v['saved']]
+        })
+        return stats
+
+
+question_singleflight = SingleFlight('question-generation')
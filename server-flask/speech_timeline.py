@@ -0,0 +1,174 @@
+"""
+Compact per-answer speech timeline
+Speech intervals recorded by the VAD state machine (or ASR segment bounds) and
+the pause / pace metrics derived from them without another model pass
+"""
+
+import os
+from array import array
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+PAUSE_MIN_SEC = float(os.getenv('IQ_PAUSE_MIN_SEC', '0.5'))
+LONG_PAUSE_SEC = float(os.getenv('IQ_LONG_PAUSE_METRIC_SEC', '2.0'))
+# Gaps shorter than this (VAD flicker between words) are folded into the previous interval
+SPEECH_MERGE_GAP_SEC = float(os.getenv('IQ_SPEECH_MERGE_GAP_SEC', '0.2'))
+
+# Per-answer metrics persisted on interview_answers (column name, SQL type)
+SPEECH_METRIC_COLUMNS = (
+    ('speaking_time', 'REAL'),
+    ('pause_count', 'INTEGER'),
+    ('pause_duration', 'REAL'),
+    ('longest_pause', 'REAL'),
+)
+
+
+class SpeechTimeline:
+    """Array-backed start/end pairs (seconds from the start of the answer)"""
+
+    __slots__ = ('_starts', '_ends', '_open_start', 'end_time')
+
+    def __init__(self):
+        self._starts = array('d')
+        self._ends = array('d')
+        self._open_start: Optional[float] = None
+        self.end_time = 0.0
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[Tuple[float, float]], end_time: Optional[float] = None) -> "SpeechTimeline":
+        timeline = cls()
+        for start, end in intervals:
+            timeline.add_interval(start, end)
+        if end_time is not None:
+            timeline.end_time = max(timeline.end_time, float(end_time))
+        return timeline
+
+    def reset(self):
+        del self._starts[:]
+        del self._ends[:]
+        self._open_start = None
+        self.end_time = 0.0
+
+    def speech_start(self, t: float):
+        if self._open_start is None:
+            self._open_start = t
+
+    def speech_end(self, t: float):
+        if self._open_start is not None:
+            self.add_interval(self._open_start, t)
+            self._open_start = None
+
+    def close(self, t: float):
+        """Close any open interval and mark the end of the answer audio"""
+        self.speech_end(t)
+        self.end_time = max(self.end_time, t)
+
+    def add_interval(self, start: float, end: float):
+        if end <= start:
+            return
+        # Merge with the previous interval when they overlap or are only split by VAD flicker
+        if self._ends and start - self._ends[-1] <= SPEECH_MERGE_GAP_SEC:
+            self._ends[-1] = max(self._ends[-1], end)
+        else:
+            self._starts.append(start)
+            self._ends.append(end)
+        self.end_time = max(self.end_time, end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def intervals(self) -> List[Tuple[float, float]]:
+        return list(zip(self._starts, self._ends))
+
+    def metrics(self, word_count: int, min_pause: float = PAUSE_MIN_SEC,
+                long_pause: float = LONG_PAUSE_SEC) -> Dict[str, Any]:
+        """Speaking time, pauses between speech runs and words per minute"""
+        starts, ends = self._starts, self._ends
+        n = len(starts)
+        if n == 0:
+            return {
+                'speaking_time': 0.0,
+                'pause_count': 0,
+                'long_pause_count': 0,
+                'pause_duration': 0.0,
+                'average_pause': 0.0,
+                'longest_pause': 0.0,
+                'response_latency': round(self.end_time, 2),
+                'words_per_minute': 0.0,
+                'articulation_rate': 0.0
+            }
+
+        speaking_time = 0.0
+        for i in range(n):
+            speaking_time += ends[i] - starts[i]
+
+        pause_count = 0
+        long_pause_count = 0
+        pause_total = 0.0
+        longest = 0.0
+        for i in range(1, n):
+            gap = starts[i] - ends[i - 1]
+            if gap < min_pause:
+                continue
+            pause_count += 1
+            pause_total += gap
+            if gap >= long_pause:
+                long_pause_count += 1
+            if gap > longest:
+                longest = gap
+
+        # Pace over the span the candidate was actually answering (pauses included),
+        # articulation rate over voiced time only
+        span = ends[-1] - starts[0]
+        wpm = (word_count / (span / 60.0)) if span > 1 else 0.0
+        articulation = (word_count / (speaking_time / 60.0)) if speaking_time > 1 else 0.0
+
+        return {
+            'speaking_time': round(speaking_time, 2),
+            'pause_count': pause_count,
+            'long_pause_count': long_pause_count,
+            'pause_duration': round(pause_total, 2),
+            'average_pause': round(pause_total / pause_count, 2) if pause_count else 0.0,
+            'longest_pause': round(longest, 2),
+            'response_latency': round(starts[0], 2),
+            'words_per_minute': round(wpm, 1),
+            'articulation_rate': round(articulation, 1)
+        }
+
+
+def timeline_from_segments(segments: Optional[List[Dict[str, Any]]], end_time: Optional[float] = None) -> SpeechTimeline:
+    """Build a timeline from ASR segment bounds (e.g. whisper's result['segments'])"""
+    intervals = []
+    for seg in segments or []:
+        try:
+            start = float(seg.get('start', 0.0))
+            end = float(seg.get('end', 0.0))
+        except (TypeError, ValueError, AttributeError):
+            continue
+        if (seg.get('text') or '').strip():
+            intervals.append((start, end))
+    intervals.sort()
+    return SpeechTimeline.from_intervals(intervals, end_time)
+
+
+def speech_metric_values(metrics: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """Row values for SPEECH_METRIC_COLUMNS (NULLs when no timeline was recorded)"""
+    if not metrics or not metrics.get('speaking_time'):
+        return tuple(None for _ in SPEECH_METRIC_COLUMNS)
+    return tuple(metrics.get(name) for name, _ in SPEECH_METRIC_COLUMNS)
+
+
+def aggregate_speech_metrics(per_answer: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Session-level pause / pace summary from per-answer metric rows"""
+    rows = [m for m in per_answer if m and m.get('speaking_time')]
+    if not rows:
+        return {}
+    speaking_time = sum(float(m.get('speaking_time') or 0) for m in rows)
+    pause_count = sum(int(m.get('pause_count') or 0) for m in rows)
+    pause_total = sum(float(m.get('pause_duration') or 0) for m in rows)
+    return {
+        'speakingTime': round(speaking_time, 1),
+        'pauseCount': pause_count,
+        'averagePause': round(pause_total / pause_count, 2) if pause_count else 0.0,
+        'longestPause': round(max(float(m.get('longest_pause') or 0) for m in rows), 2),
+        'averagePauses': round(pause_count / len(rows), 1)
+    }
@@ -0,0 +1,129 @@
+"""
+Single-thread scheduler for per-session deadlines (silence detection, warning cooldowns)
+Timers live in one min-heap keyed by deadline, served by one thread that sleeps until the
+earliest deadline. Timers are named by a key: arming an existing key re-arms it. Pushing a
+deadline later (a candidate kept speaking) only updates the timer; the stale heap entry is
+postponed when it surfaces. So work is proportional to timers that actually expire, not to
+sessions x polling ticks.
+"""
+
+import heapq
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Callable, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Timer:
+    __slots__ = ('deadline', 'fn', 'seq', 'queued_at')
+
+    def __init__(self, deadline: float, fn: Optional[Callable[[], None]], seq: int):
+        self.deadline = deadline
+        self.fn = fn
+        self.seq = seq
+        # Deadline of this timer's entry in the heap (<= deadline)
+        self.queued_at = deadline
+
+
+class TimerScheduler:
+    """Keyed one-shot timers. Callbacks run on the scheduler thread and must not block;
+    a timer without a callback is a pure cooldown, checked with `pending(key)`."""
+
+    def __init__(self, name: str = 'timer-scheduler'):
+        self.name = name
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._seq = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'armed': 0, 'rearmed': 0, 'postponed': 0, 'cancelled': 0, 'fired': 0, 'expired': 0, 'failed': 0}
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def arm(self, key: Hashable, delay: float, fn: Optional[Callable[[], None]] = None):
+        """(Re)arm `key` to fire `delay` seconds from now, replacing its previous deadline and callback"""
+        self.arm_at(key, time.time() + max(delay, 0.0), fn)
+
+    def arm_at(self, key: Hashable, deadline: float, fn: Optional[Callable[[], None]] = None):
+        with self._cond:
+            timer = self._timers.get(key)
+            if timer is not None and deadline >= timer.queued_at:
+                # Later than the queued entry: no heap work, it is postponed when popped
+                timer.deadline = deadline
+                timer.fn = fn
+                self.stats['rearmed'] += 1
+                return
+            self._seq += 1
+            if timer is None:
+                self.stats['armed'] += 1
+            else:
+                self.stats['rearmed'] += 1
+            self._timers[key] = _Timer(deadline, fn, self._seq)
+            heapq.heappush(self._heap, (deadline, self._seq, key))
+            self._ensure_thread()
+            if self._heap[0][1] == self._seq:
+                # New earliest deadline: wake the thread to sleep less
+                self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._cond:
+            # The heap entry is dropped lazily (its seq no longer matches)
+            if self._timers.pop(key, None) is None:
+                return False
+            self.stats['cancelled'] += 1
+            return True
+
+    def pending(self, key: Hashable) -> bool:
+        with self._cond:
+            timer = self._timers.get(key)
+            return timer is not None and timer.deadline > time.time()
+
+    def _due(self) -> List[Tuple[Hashable, Callable[[], None]]]:
+        """Pop every expired timer (called with the lock held, waits until one is due)"""
+        while True:
+            now = time.time()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, key = heapq.heappop(self._heap)
+                timer = self._timers.get(key)
+                if timer is None or timer.seq != seq:
+                    continue
+                if timer.deadline > now:
+                    timer.queued_at = timer.deadline
+                    heapq.heappush(self._heap, (timer.deadline, seq, key))
+                    self.stats['postponed'] += 1
+                    continue
+                del self._timers[key]
+                if timer.fn is None:
+                    self.stats['expired'] += 1
+                else:
+                    due.append((key, timer.fn))
+            if due:
+                return due
+            self._cond.wait(self._heap[0][0] - now if self._heap else None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._due()
+            for key, fn in due:
+                try:
+                    fn()
+                    with self._cond:
+                        self.stats['fired'] += 1
+                except Exception as e:
+                    with self._cond:
+                        self.stats['failed'] += 1
+                    logger.warning(f"Timer {key!r} failed: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(self.stats, timers=len(self._timers), heap=len(self._heap))
+
+
+timer_scheduler = TimerScheduler()